@@ -0,0 +1,276 @@
+# ApiServer.py
+"""
+Servicio HTTP/JSON local sobre el DataManager (solo biblioteca estándar).
+
+    python src/cli.py servir --puerto 8765
+
+Rutas:
+    GET    /health
+    GET    /tasks | /events | /lessons          lista ordenada por prioridad
+                                                (?limit=N&offset=M para paginar)
+    POST   /tasks | /events | /lessons          agrega un item (cuerpo JSON)
+    DELETE /tasks/<id> | /events/<id> | /lessons/<id>
+    POST   /tasks/<id>/complete | /lessons/<id>/complete
+    POST   /lessons/<id>/review                 {"score": 0-5}
+    POST   /import                              mismo formato que import_from_json
+    GET    /plan/today | /plan/week             con ETag / If-None-Match
+                                                (/plan/today: ocupación de hoy; lo sin
+                                                horario solo con ?unschedulable=1)
+    POST   /batch                               {"requests": [{"method", "path", "body"}]}
+
+Las conexiones son HTTP/1.1 persistentes (keep-alive). Los planes llevan un ETag
+derivado de las versiones de datos y preferencias y del minuto actual: mientras
+nada cambie, un cliente que consulta periódicamente recibe 304 sin cuerpo.
+Antes de cada petición se traen los cambios que otro proceso (p. ej. la interfaz
+gráfica) guardó en el mismo archivo.
+"""
+
+import re
+import threading
+from itertools import islice
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import Codec
+from DataManager import DataManager
+
+ITEM_COLLECTIONS = ("tasks", "events", "lessons")
+MAX_BODY = 16 * 1024 * 1024
+ITEM_ROUTE = re.compile(r'^/(tasks|events|lessons)/(-?\d+)(?:/(complete|review))?$')
+
+
+class ApiError(Exception):
+    """Error de la petición: se responde con `status` y el mensaje en JSON."""
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def item_to_json(item) -> dict:
+    data = item.to_dict()
+    data['id'] = item.item_id
+    data['type'] = item.get_type()
+    data['planned_date'] = str(item.planned_date) if item.planned_date else None
+    if item.chunks:
+        data['chunks'] = [{"date": str(day), "start": start.strftime('%H:%M'), "end": end.strftime('%H:%M')}
+                          for day, start, end in item.chunks]
+    return data
+
+
+class ApiService:
+    """
+    Enrutamiento y lógica de la API, independiente del transporte HTTP.
+
+    Un cerrojo serializa el acceso al DataManager: los hilos del servidor
+    atienden conexiones en paralelo pero las operaciones se aplican de a una.
+    """
+    def __init__(self, dm: DataManager):
+        self.dm = dm
+        self.lock = threading.RLock()
+
+    def plan_etag(self) -> str:
+        dm = self.dm
+        minute = dm.clock.now().strftime('%Y%m%d%H%M')
+        return f'"{dm.data_version}-{dm.preferences_version}-{minute}"'
+
+    def handle(self, method: str, path: str, body=None, if_none_match: str = None):
+        """Atiende una petición. Retorna `(status, payload, headers)`."""
+        with self.lock:
+            # Traer lo que otro proceso guardó en el archivo (un `os.stat` si nada cambió),
+            # para no servir listas, planes ni ETags viejos
+            self.dm.sync()
+            try:
+                path, _, query = path.partition('?')
+                return self._dispatch(method, path.rstrip('/') or '/', body, if_none_match,
+                                      parse_qs(query))
+            except ApiError as e:
+                return e.status, {"error": str(e)}, {}
+            except (ValueError, KeyError, TypeError) as e:
+                return 400, {"error": f"Petición inválida: {e}"}, {}
+
+    def _dispatch(self, method, path, body, if_none_match, params=None):
+        if path == '/health' and method == 'GET':
+            return 200, {"status": "ok", "data_version": self.dm.data_version}, {}
+        if path in ('/plan/today', '/plan/week') and method == 'GET':
+            return self._plan(path, if_none_match, params or {})
+        if path == '/batch' and method == 'POST':
+            return 200, {"responses": self._batch(body)}, {}
+        if path == '/import' and method == 'POST':
+            ok, message = self.dm.import_from_json(self._object(body))
+            return (200 if ok else 400), {"ok": ok, "message": message}, {}
+
+        collection = path[1:]
+        if collection in ITEM_COLLECTIONS:
+            if method == 'GET':
+                items = self._list(collection, params or {})
+                return 200, {collection: [item_to_json(i) for i in items]}, {}
+            if method == 'POST':
+                return 201, {"item": item_to_json(self._add(collection, self._object(body)))}, {}
+            raise ApiError(405, f"Método no permitido: {method} {path}")
+
+        match = ITEM_ROUTE.match(path)
+        if not match:
+            raise ApiError(404, f"Ruta desconocida: {path}")
+        collection, item_id, action = match.group(1), int(match.group(2)), match.group(3)
+        item = self._item(collection, item_id)
+        if action is None and method == 'GET':
+            return 200, {"item": item_to_json(item)}, {}
+        if action is None and method == 'DELETE':
+            delete = {"tasks": self.dm.deleteTask, "events": self.dm.deleteEvent,
+                      "lessons": self.dm.deleteLesson}[collection]
+            delete(item_id)
+            return 200, {"deleted": item_id}, {}
+        if action == 'complete' and method == 'POST' and collection != 'events':
+            complete = (self.dm.mark_task_completed if collection == 'tasks'
+                        else self.dm.mark_lesson_completed)
+            complete(item_id)
+            return 200, {"item": item_to_json(item)}, {}
+        if action == 'review' and method == 'POST' and collection == 'lessons':
+            score = self._object(body).get('score')
+            if not isinstance(score, (int, float)) or not 0 <= score <= 5:
+                raise ApiError(400, "'score' debe ser un número entre 0 y 5")
+            self.dm.reviewLesson(score, item_id)
+            return 200, {"item": item_to_json(item)}, {}
+        raise ApiError(405, f"Método no permitido: {method} {path}")
+
+    # --- Auxiliares ---
+    @staticmethod
+    def _object(body) -> dict:
+        if not isinstance(body, dict):
+            raise ApiError(400, "Se esperaba un objeto JSON en el cuerpo")
+        return body
+
+    def _list(self, collection: str, params: dict):
+        """Items de la colección en orden; con `limit` solo se recorre esa página."""
+        offset = int(params.get('offset', ['0'])[0])
+        limit = params.get('limit', [None])[0]
+        if offset < 0 or limit is not None and int(limit) < 0:
+            raise ApiError(400, "'limit' y 'offset' no pueden ser negativos")
+        stop = offset + int(limit) if limit is not None else None
+        return islice(self.dm.iter_prioritized(collection, exclude_status=None), offset, stop)
+
+    def _item(self, collection: str, item_id: int):
+        item = self.dm.get_item(item_id, collection)
+        if item is None:
+            raise ApiError(404, f"No existe el item {item_id} en {collection}")
+        return item
+
+    def _add(self, collection: str, body: dict):
+        dm = self.dm
+        if collection == 'tasks':
+            return dm.addTask(body['title'], body['due_date'], body.get('estimated_minutes'))
+        if collection == 'events':
+            return dm.addEvent(body['title'], body.get('description', ''), body['due_date'], body['time'])
+        return dm.addLesson(body['title'], body.get('notes', ''), body['due_date'], body['subject'],
+                            estimated_minutes=body.get('estimated_minutes'))
+
+    def _plan(self, path: str, if_none_match: str, params: dict):
+        etag = self.plan_etag()
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if if_none_match and etag in [tag.strip() for tag in if_none_match.split(',')]:
+            return 304, None, headers
+        if path == '/plan/today':
+            # El plan de hoy sale sin planificar los días siguientes; lo que no tiene
+            # horario requiere el plan completo y solo se informa si se pide
+            report = None
+            if params.get('unschedulable', ['0'])[0] not in ('', '0'):
+                report = self.dm.get_unschedulable()
+            items = self.dm.get_today_plan()
+            payload = {"utilization": self.dm.get_today_utilization()}
+        else:
+            items = self.dm.get_plan(horizon=7)
+            report = self.dm.unschedulable
+            payload = {}
+        payload["items"] = [item_to_json(it) for it in items]
+        if report is not None:
+            payload["unschedulable"] = [{"item": item_to_json(it), "reason": reason} for it, reason in report]
+        return 200, payload, headers
+
+    def _batch(self, body) -> list:
+        requests = self._object(body).get('requests')
+        if not isinstance(requests, list):
+            raise ApiError(400, "'requests' debe ser una lista")
+        responses = []
+        for request in requests:
+            if not isinstance(request, dict) or request.get('path') == '/batch':
+                responses.append({"status": 400, "body": {"error": "Petición inválida en el lote"}})
+                continue
+            status, payload, headers = self.handle(request.get('method', 'GET').upper(),
+                                                   request.get('path', '/'), request.get('body'),
+                                                   request.get('if_none_match'))
+            response = {"status": status, "body": payload}
+            if 'ETag' in headers:
+                response['etag'] = headers['ETag']
+            responses.append(response)
+        return responses
+
+
+class ApiRequestHandler(BaseHTTPRequestHandler):
+    """Traduce HTTP a `ApiService.handle`; conexiones persistentes HTTP/1.1."""
+    protocol_version = "HTTP/1.1"
+    server_version = "PlanificadorAPI/1.0"
+
+    def _handle(self, method: str):
+        body = None
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_BODY:
+            self._send(413, {"error": "Cuerpo demasiado grande"}, {})
+            self.close_connection = True
+            return
+        if length:
+            raw = self.rfile.read(length)
+            try:
+                body = Codec.loads(raw)
+            except (ValueError, UnicodeDecodeError):
+                self._send(400, {"error": "El cuerpo no es JSON válido"}, {})
+                return
+        status, payload, headers = self.server.service.handle(
+            method, self.path, body, self.headers.get('If-None-Match'))
+        self._send(status, payload, headers)
+
+    def _send(self, status: int, payload, headers: dict):
+        data = Codec.dumps(payload) if payload is not None else b''
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if data and status != 304:
+            self.wfile.write(data)
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def do_DELETE(self):
+        self._handle('DELETE')
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class ApiServer(ThreadingHTTPServer):
+    """Servidor HTTP local (por defecto solo escucha en 127.0.0.1)."""
+    daemon_threads = True
+
+    def __init__(self, dm: DataManager, host: str = "127.0.0.1", port: int = 8765, verbose: bool = False):
+        self.service = ApiService(dm)
+        self.verbose = verbose
+        super().__init__((host, port), ApiRequestHandler)
+
+
+def serve(dm: DataManager, host: str = "127.0.0.1", port: int = 8765, verbose: bool = False):
+    """Atiende peticiones hasta Ctrl+C."""
+    server = ApiServer(dm, host, port, verbose)
+    print(f"API del planificador en http://{host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,111 @@
+# Archive.py
+"""
+Archivo histórico de items completados.
+
+Los items completados hace más de cierto tiempo salen del almacén activo
+(`DataManager.data`) y se agregan a un archivo JSON Lines comprimido con gzip.
+El archivo es de solo agregado: cada lote se escribe como un nuevo miembro gzip
+al final, sin reescribir lo anterior, y `gzip` lee todos los miembros seguidos.
+
+Cada línea es un objeto:
+    {"type": "tasks" | "lessons" | "events", "archived_date": "YYYY-MM-DD", "item": {...}}
+donde "item" es el mismo diccionario de `to_dict()` del formato de intercambio.
+"""
+
+import gzip
+import json
+import os
+from datetime import date
+from typing import Iterator, List
+
+from Event import Event
+from Lesson import Lesson
+from Task import Task
+
+ITEM_CLASSES = {"tasks": Task, "events": Event, "lessons": Lesson}
+TYPE_KEYS = {"Tarea": "tasks", "Evento": "events", "Lección": "lessons"}
+
+
+class ItemArchive:
+    """Archivo comprimido de solo agregado con el historial de items completados."""
+    def __init__(self, path: str):
+        self.path = path
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def append(self, entries, archived_date: date) -> int:
+        """
+        Agrega `(tipo, item)` al final del archivo. Retorna cuántos se escribieron.
+
+        `tipo` es la clave de `DataManager.data` ('tasks', 'events' o 'lessons').
+        """
+        lines = [
+            json.dumps({"type": kind, "archived_date": str(archived_date), "item": item.to_dict()},
+                       ensure_ascii=False)
+            for kind, item in entries
+        ]
+        if not lines:
+            return 0
+        with gzip.open(self.path, "at", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        return len(lines)
+
+    def iter_records(self) -> Iterator[dict]:
+        """Recorre las líneas del archivo como diccionarios, en orden de archivado."""
+        if not self.exists():
+            return
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def query(self, item_type=None, date_from: date = None, date_to: date = None,
+              text: str = None) -> List[dict]:
+        """
+        Busca en el historial.
+
+        Args:
+            item_type: 'Tarea', 'Evento' o 'Lección' (o la clave 'tasks', etc.)
+            date_from, date_to: Rango inclusivo sobre la fecha de completado
+            text: Texto a buscar (sin distinguir mayúsculas) en el título
+
+        Retorna diccionarios con 'type', 'archived_date', 'completed_date' e 'item'
+        (el objeto Task/Event/Lesson reconstruido), del más reciente al más antiguo.
+        """
+        kind = TYPE_KEYS.get(item_type, item_type)
+        needle = text.lower() if text else None
+        results = []
+        for record in self.iter_records():
+            if kind and record["type"] != kind:
+                continue
+            raw = record["item"]
+            if needle and needle not in str(raw.get("title", "")).lower():
+                continue
+            completed = _completed_date(record)
+            if date_from and completed < date_from:
+                continue
+            if date_to and completed > date_to:
+                continue
+            results.append({
+                "type": record["type"],
+                "archived_date": date.fromisoformat(record["archived_date"]),
+                "completed_date": completed,
+                "item": ITEM_CLASSES[record["type"]].from_dict(raw)
+            })
+        results.sort(key=lambda r: r["completed_date"], reverse=True)
+        return results
+
+    def stats(self) -> dict:
+        """Cantidad de items archivados por tipo y tamaño del archivo en disco."""
+        counts = {"tasks": 0, "events": 0, "lessons": 0}
+        for record in self.iter_records():
+            counts[record["type"]] = counts.get(record["type"], 0) + 1
+        counts["bytes"] = os.path.getsize(self.path) if self.exists() else 0
+        return counts
+
+
+def _completed_date(record: dict) -> date:
+    """Fecha de completado del registro (o la de archivado si no se registró)."""
+    value = record["item"].get("completed_date") or record["archived_date"]
+    return date.fromisoformat(value)
@@ -0,0 +1,194 @@
+# AsyncDataManager.py
+"""
+Fachada asyncio sobre el DataManager para servicios con muchos clientes.
+
+    adm = await AsyncDataManager.open(file_path="base_local.json")
+    await adm.add_task("Taller", "2025-10-01", 60)
+    plan = await adm.today_plan()
+    await adm.close()
+
+- Toda llamada al DataManager (incluida la E/S de disco) corre en un único hilo
+  trabajador, así el bucle de eventos nunca se bloquea y el DataManager, que no
+  es seguro entre hilos, siempre se usa desde el mismo hilo.
+- Las escrituras se serializan con un `asyncio.Lock`.
+- El DataManager trabaja con `autosave=False`: cada mutación solo marca cambios
+  pendientes y las que llegan juntas se escriben en un único `flush()` (commit
+  agrupado). Por defecto cada mutación espera a que su flush termine, así que al
+  volver los datos ya están en disco.
+
+La API síncrona sigue igual para la GUI: solo cambia el DataManager que se
+entrega a esta fachada.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from DataManager import DataManager
+from PrioritizedItem import PrioritizedItem
+
+
+class AsyncDataManager:
+    """
+    Args:
+        dm: DataManager a envolver (pasa a `autosave=False`)
+        flush_delay: Segundos que se esperan para juntar escrituras en un flush
+        wait_for_flush: Si las mutaciones esperan a que sus cambios estén en disco
+    """
+    def __init__(self, dm: DataManager, flush_delay: float = 0.01, wait_for_flush: bool = True,
+                 executor: ThreadPoolExecutor = None):
+        self.dm = dm
+        self.flush_delay = flush_delay
+        self.wait_for_flush = wait_for_flush
+        self._executor = executor or ThreadPoolExecutor(max_workers=1,
+                                                        thread_name_prefix="datamanager")
+        self._own_executor = executor is None
+        self._write_lock = asyncio.Lock()
+        self._pending_flush = None   # Future del próximo flush agrupado
+        self._flush_task = None
+        self.flushes = 0
+        dm.autosave = False
+
+    @classmethod
+    async def open(cls, flush_delay: float = 0.01, wait_for_flush: bool = True, **options):
+        """Crea el DataManager (carga bloqueante) fuera del bucle de eventos."""
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="datamanager")
+        loop = asyncio.get_running_loop()
+        dm = await loop.run_in_executor(executor, lambda: DataManager(**options))
+        adm = cls(dm, flush_delay=flush_delay, wait_for_flush=wait_for_flush, executor=executor)
+        adm._own_executor = True
+        return adm
+
+    # --- Ejecución ---
+    async def _run(self, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, lambda: fn(*args, **kwargs))
+
+    async def _write(self, fn, *args, **kwargs):
+        """Aplica una mutación y la agrega al próximo flush."""
+        async with self._write_lock:
+            result = await self._run(fn, *args, **kwargs)
+        flushed = self._schedule_flush()
+        if self.wait_for_flush:
+            await asyncio.shield(flushed)
+        return result
+
+    def _schedule_flush(self) -> asyncio.Future:
+        if self._pending_flush is None:
+            self._pending_flush = asyncio.get_running_loop().create_future()
+            # Marcar el error como consultado aunque ninguna mutación espere el flush
+            self._pending_flush.add_done_callback(lambda f: f.cancelled() or f.exception())
+            self._flush_task = asyncio.ensure_future(self._flush_later(self._pending_flush))
+        return self._pending_flush
+
+    async def _flush_later(self, future: asyncio.Future):
+        await asyncio.sleep(self.flush_delay)
+        # Las mutaciones que lleguen desde aquí van al flush siguiente
+        self._pending_flush = None
+        try:
+            async with self._write_lock:
+                ok = await self._run(self.dm.flush)
+            self.flushes += 1
+            if ok:
+                future.set_result(True)
+            else:
+                future.set_exception(IOError("No se pudieron guardar los datos"))
+        except Exception as e:
+            future.set_exception(e)
+
+    async def flush(self):
+        """Escribe de inmediato los cambios pendientes."""
+        if self._pending_flush is not None:
+            await asyncio.shield(self._pending_flush)
+        async with self._write_lock:
+            if self.dm.unsaved_changes:
+                if not await self._run(self.dm.flush):
+                    raise IOError("No se pudieron guardar los datos")
+                self.flushes += 1
+
+    async def close(self):
+        """Guarda lo pendiente y libera el hilo trabajador."""
+        try:
+            await self.flush()
+        finally:
+            if self._own_executor:
+                self._executor.shutdown(wait=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    # --- Lecturas ---
+    async def tasks(self) -> List[PrioritizedItem]:
+        return await self._run(self.dm.get_all_tasks)
+
+    async def events(self) -> List[PrioritizedItem]:
+        return await self._run(self.dm.get_prioritized_events)
+
+    async def lessons(self) -> List[PrioritizedItem]:
+        return await self._run(self.dm.get_prioritized_lessons)
+
+    async def item(self, item_id: int, collection: str = None) -> PrioritizedItem:
+        return await self._run(self.dm.get_item, item_id, collection)
+
+    async def query(self, **filters) -> List[PrioritizedItem]:
+        return await self._run(self.dm.query, **filters)
+
+    async def plan(self, horizon: int = None) -> List[PrioritizedItem]:
+        return await self._run(self.dm.get_plan, horizon)
+
+    async def today_plan(self) -> List[PrioritizedItem]:
+        return await self._run(self.dm.get_today_plan)
+
+    async def items_by_day(self) -> dict:
+        return await self._run(self.dm.get_items_by_day)
+
+    async def query_archive(self, **filters) -> List[dict]:
+        return await self._run(self.dm.query_archive, **filters)
+
+    # --- Mutaciones ---
+    async def add_task(self, title, due_date, estimated_minutes: int = None):
+        return await self._write(self.dm.addTask, title, due_date, estimated_minutes)
+
+    async def add_event(self, title, description, due_date, time):
+        return await self._write(self.dm.addEvent, title, description, due_date, time)
+
+    async def add_lesson(self, title, notes, due_date, subject, estimated_minutes: int = None,
+                         notes_file: str = None):
+        return await self._write(self.dm.addLesson, title, notes, due_date, subject,
+                                 estimated_minutes=estimated_minutes, notes_file=notes_file)
+
+    async def delete_task(self, item_id: int) -> bool:
+        return await self._write(self.dm.deleteTask, item_id)
+
+    async def delete_event(self, item_id: int) -> bool:
+        return await self._write(self.dm.deleteEvent, item_id)
+
+    async def delete_lesson(self, item_id: int) -> bool:
+        return await self._write(self.dm.deleteLesson, item_id)
+
+    async def complete_task(self, item_id: int) -> bool:
+        return await self._write(self.dm.mark_task_completed, item_id)
+
+    async def complete_lesson(self, item_id: int) -> bool:
+        return await self._write(self.dm.mark_lesson_completed, item_id)
+
+    async def review_lesson(self, score, item_id: int):
+        return await self._write(self.dm.reviewLesson, score, item_id)
+
+    async def set_item_time_range(self, item, start_time, end_time, duration: int):
+        return await self._write(self.dm.set_item_time_range, item, start_time, end_time, duration)
+
+    async def import_json(self, json_data: dict):
+        return await self._write(self.dm.import_from_json, json_data)
+
+    async def import_file(self, file_path: str):
+        return await self._write(self.dm.import_from_file, file_path)
+
+    async def archive_completed(self, older_than_days: int = None) -> int:
+        return await self._write(self.dm.archive_completed, older_than_days)
+
+    async def export_file(self, file_path: str):
+        return await self._run(self.dm.export_to_file, file_path)
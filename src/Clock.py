@@ -0,0 +1,36 @@
+# Clock.py
+
+from datetime import date, datetime, timedelta
+
+
+class SystemClock:
+    """Reloj del sistema: la fecha y hora reales."""
+    def now(self) -> datetime:
+        return datetime.now()
+
+    def today(self) -> date:
+        return date.today()
+
+
+class FixedClock:
+    """
+    Reloj con un "ahora" fijo.
+
+    Permite planes deterministas (pruebas, benchmarks reproducibles) y simular el
+    paso del tiempo con `advance()`.
+    """
+    def __init__(self, now: datetime):
+        self._now = now
+
+    def now(self) -> datetime:
+        return self._now
+
+    def today(self) -> date:
+        return self._now.date()
+
+    def set(self, now: datetime):
+        self._now = now
+
+    def advance(self, **kwargs):
+        """Adelanta el reloj; acepta los mismos argumentos que `timedelta`."""
+        self._now += timedelta(**kwargs)
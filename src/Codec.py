@@ -0,0 +1,267 @@
+# Codec.py
+"""
+Serialización en bloque de listas de items al formato de intercambio JSON.
+
+Produce los mismos diccionarios que `to_dict()`/`from_dict()` de Task, Event y
+Lesson, más `id` y `version`, que identifican cada registro dentro del almacén
+(el formato de intercambio no los necesita: al importar se asignan ids nuevos).
+Procesa listas completas:
+
+- Las horas se convierten con tablas precalculadas de los 1440 minutos del día
+  (`time` <-> "HH:MM") en lugar de `strftime` y `split(':')` por registro.
+- Las fechas repetidas se convierten una sola vez (cachés por llamada).
+- Los items se construyen asignando su `__dict__` completo, sin pasar por los
+  constructores campo a campo, y con el recolector de ciclos en pausa (los
+  items no forman ciclos y el recolector recorrería cada lote varias veces).
+
+Si está instalado `orjson` se usa para (de)serializar el texto JSON; si no, se
+usa el módulo `json` de la biblioteca estándar con la misma salida compacta.
+"""
+
+import gc
+import json
+from contextlib import contextmanager
+from datetime import date, time, timedelta
+
+from Event import Event
+from Lesson import Lesson
+from Status import Status
+from Task import Task
+
+try:
+    import orjson
+except ImportError:  # Dependencia opcional
+    orjson = None
+
+# Tablas precalculadas: minuto del día <-> texto, valor de estado <-> Status
+TIME_TEXT = {time(m // 60, m % 60): f"{m // 60:02d}:{m % 60:02d}" for m in range(24 * 60)}
+TIME_VALUE = {text: value for value, text in TIME_TEXT.items()}
+STATUS_VALUE = {status.value: status for status in Status}
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+
+def dumps(payload) -> bytes:
+    """JSON compacto en UTF-8 (sin escapar acentos)."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: bytes):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode("utf-8") if isinstance(data, (bytes, bytearray)) else data)
+
+
+# --- Conversión de valores ---
+def _time_text(value):
+    if value is None:
+        return None
+    text = TIME_TEXT.get(value)
+    return text if text is not None else value.strftime('%H:%M')
+
+
+def _parse_time(text):
+    if not text:
+        return None
+    value = TIME_VALUE.get(text)
+    if value is None:
+        h, m = map(int, text.split(':'))
+        value = time(h, m)
+    return value
+
+
+class _DateCache(dict):
+    """Convierte cada fecha distinta una sola vez dentro de una llamada en bloque."""
+    def __init__(self, convert):
+        super().__init__()
+        self.convert = convert
+
+    def __missing__(self, key):
+        value = self[key] = self.convert(key)
+        return value
+
+
+def _date_from_text(value):
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _status(value):
+    status = STATUS_VALUE.get(value)
+    if status is None:
+        raise ValueError(f"Estado desconocido: {value}")
+    return status
+
+
+# --- Codificación ---
+def encode_tasks(tasks) -> list:
+    date_text = _DateCache(str)
+    return [{
+        'title': t.title,
+        'due_date': date_text[t.due_date],
+        'status': t.status.value,
+        'start_time': _time_text(t.start_time),
+        'end_time': _time_text(t.end_time),
+        'duration': t.duration,
+        'estimated_minutes': t.estimated_minutes,
+        'completed_date': date_text[t.completed_date] if t.completed_date else None,
+        'id': t.item_id,
+        'version': t.version
+    } for t in tasks]
+
+
+def encode_events(events) -> list:
+    return [{
+        'title': e.title,
+        'description': e.description,
+        'due_date': e.due_date,
+        'time': e.time,
+        'start_time': _time_text(e.start_time),
+        'end_time': _time_text(e.end_time),
+        'duration': e.duration,
+        'is_fixed': e.is_fixed,
+        'id': e.item_id,
+        'version': e.version
+    } for e in events]
+
+
+def encode_lessons(lessons) -> list:
+    date_text = _DateCache(str)
+    return [{
+        'title': l.title,
+        'notes': l.notes,
+        'due_date': date_text[l.due_date],
+        'subject': l.subject,
+        'status': l.status.value,
+        'efactor': l.efactor,
+        'repetitions': l.repetitions,
+        'next_review_date': date_text[l.next_review_date],
+        'interval': l.interval,
+        'start_time': _time_text(l.start_time),
+        'end_time': _time_text(l.end_time),
+        'duration': l.duration,
+        'estimated_minutes': l.estimated_minutes,
+        'notes_file': l.notes_file,
+        'completed_date': date_text[l.completed_date] if l.completed_date else None,
+        'id': l.item_id,
+        'version': l.version
+    } for l in lessons]
+
+
+# --- Decodificación ---
+def _new(cls, fields: dict, record: dict):
+    item = cls.__new__(cls)
+    fields['planned_date'] = None
+    fields['chunks'] = None
+    fields['item_id'] = record.get('id')
+    fields['version'] = record.get('version', 0)
+    item.__dict__ = fields
+    return item
+
+
+def _estimated(value):
+    return int(value) if value else None
+
+
+def decode_tasks(records) -> list:
+    dates = _DateCache(_date_from_text)
+    tasks = []
+    for d in records:
+        try:
+            estimated = _estimated(d.get('estimated_minutes'))
+            duration = d.get('duration')
+            completed = d.get('completed_date')
+            tasks.append(_new(Task, {
+                'start_time': _parse_time(d.get('start_time')),
+                'end_time': _parse_time(d.get('end_time')),
+                'duration': int(duration) if duration else (estimated or 60),
+                'title': d['title'],
+                'due_date': dates[d['due_date']],
+                'status': _status(d.get('status', 'Pendiente')),
+                'estimated_minutes': estimated,
+                'completed_date': dates[completed] if completed else None
+            }, d))
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"Datos inválidos para la tarea: {d}. Error: {e}")
+    return tasks
+
+
+def decode_events(records) -> list:
+    events = []
+    for d in records:
+        try:
+            duration = d.get('duration')
+            events.append(_new(Event, {
+                'start_time': _parse_time(d.get('start_time')),
+                'end_time': _parse_time(d.get('end_time')),
+                'duration': int(duration) if duration else 60,
+                'title': d['title'],
+                'description': d['description'],
+                'due_date': d['due_date'],
+                'time': d['time'],
+                'is_fixed': True
+            }, d))
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"Datos inválidos para el evento: {d}. Error: {e}")
+    return events
+
+
+def decode_lessons(records) -> list:
+    dates = _DateCache(_date_from_text)
+    lessons = []
+    for d in records:
+        try:
+            estimated = _estimated(d.get('estimated_minutes'))
+            duration = d.get('duration')
+            completed = d.get('completed_date')
+            due_date = d['due_date']
+            next_review = d.get('next_review_date')
+            lessons.append(_new(Lesson, {
+                'start_time': _parse_time(d.get('start_time')),
+                'end_time': _parse_time(d.get('end_time')),
+                'duration': int(duration) if duration else (estimated or 60),
+                'title': d['title'],
+                'notes': d['notes'],
+                'due_date': due_date,
+                'subject': d['subject'],
+                'status': _status(d.get('status', 'Pendiente')),
+                'repetitions': int(d.get('repetitions', 0)),
+                'efactor': float(d.get('efactor', 2.5)),
+                'interval': int(d.get('interval', 0)),
+                # Igual que el constructor: sin repaso previo, al día siguiente de crearla
+                'next_review_date': (dates[next_review] if next_review is not None
+                                     else dates[due_date] + timedelta(days=1)),
+                'notes_file': d.get('notes_file'),
+                'estimated_minutes': estimated,
+                'completed_date': dates[completed] if completed else None
+            }, d))
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"Datos inválidos para la lección: {d}. Error: {e}")
+    return lessons
+
+
+ENCODERS = {'tasks': encode_tasks, 'events': encode_events, 'lessons': encode_lessons}
+DECODERS = {'tasks': decode_tasks, 'events': decode_events, 'lessons': decode_lessons}
+
+
+def encode_data(data: dict) -> dict:
+    """Convierte `DataManager.data` al diccionario del formato de intercambio."""
+    return {key: ENCODERS[key](data[key]) for key in ('tasks', 'events', 'lessons')}
+
+
+@contextmanager
+def _gc_paused():
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def decode_data(raw: dict) -> dict:
+    """Construye las listas de items de `DataManager.data` desde el formato de intercambio."""
+    with _gc_paused():
+        return {key: DECODERS[key](raw.get(key, [])) for key in ('tasks', 'events', 'lessons')}
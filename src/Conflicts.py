@@ -0,0 +1,144 @@
+# Conflicts.py
+"""
+Detección de choques de horario entre eventos (p. ej. dos clases a la misma hora).
+
+Cada evento con hora ocupa `[hora, hora + duración)` de su día. Por día, los
+intervalos se ordenan por inicio y se recorren una sola vez (barrido): el que
+empieza antes de que termine el grupo actual se suma al grupo, y cada grupo con
+dos o más eventos es un choque. Cuesta O(n log n) para n eventos del día.
+
+`ConflictIndex` guarda los grupos por día y solo vuelve a barrer los días
+marcados como modificados, así agregar o importar eventos no revisa todo el
+calendario.
+"""
+
+from datetime import date, time
+from typing import Dict, List
+
+
+def _minutes(value) -> int:
+    """Minutos del día de "HH:MM" (None si no es una hora válida)."""
+    try:
+        hours, minutes = map(int, str(value).split(":")[:2])
+    except ValueError:
+        return None
+    if not (0 <= hours < 24 and 0 <= minutes < 60):
+        return None
+    return hours * 60 + minutes
+
+
+def _time(minutes: int) -> time:
+    minutes = min(minutes, 24 * 60 - 1)
+    return time(minutes // 60, minutes % 60)
+
+
+def sweep(intervals) -> List[list]:
+    """
+    Agrupa los intervalos `(inicio, fin, item)` (en minutos) que se solapan.
+
+    Retorna solo los grupos de dos o más, cada uno ordenado por inicio. Dos
+    intervalos que apenas se tocan (uno termina cuando empieza el otro) no chocan.
+    """
+    groups = []
+    current = []
+    group_end = None
+    for interval in sorted(intervals, key=lambda x: (x[0], x[1])):
+        start, end, _ = interval
+        if current and start < group_end:
+            current.append(interval)
+            group_end = max(group_end, end)
+            continue
+        if len(current) > 1:
+            groups.append(current)
+        current = [interval]
+        group_end = end
+    if len(current) > 1:
+        groups.append(current)
+    return groups
+
+
+def event_interval(event):
+    """`(inicio, fin)` en minutos de un evento con hora, o None si no tiene hora."""
+    start = _minutes(event.time) if getattr(event, 'time', None) else None
+    if start is None:
+        return None
+    return start, start + max(event.duration or 0, 0)
+
+
+def day_conflicts(day: date, events) -> List[dict]:
+    """Choques entre los `events` de `day`: `[{'date', 'start', 'end', 'items'}]`."""
+    intervals = []
+    for event in events:
+        interval = event_interval(event)
+        if interval is not None and interval[1] > interval[0]:
+            intervals.append((interval[0], interval[1], event))
+    return [{'date': day,
+             'start': _time(group[0][0]),
+             'end': _time(max(end for _, end, _ in group)),
+             'items': [item for _, _, item in group]}
+            for group in sweep(intervals)]
+
+
+class ConflictIndex:
+    """
+    Choques por día, recalculados de forma incremental sobre un `ItemIndex`.
+
+    Args:
+        index: Índices del DataManager (aporta los eventos de cada fecha)
+    """
+    EVENT_TYPE = 'Evento'
+
+    def __init__(self, index):
+        self.index = index
+        self._groups: Dict[int, List[dict]] = {}   # ordinal -> choques del día
+        self._dirty = set()                         # ordinales a volver a barrer
+        self._all_dirty = True
+        self.swept_days = 0                         # días barridos (diagnóstico)
+
+    def touch(self, ordinal: int):
+        """Marca un día cuyos eventos cambiaron."""
+        if not self._all_dirty and ordinal is not None:
+            self._dirty.add(ordinal)
+
+    def touch_all(self):
+        """Marca todo el calendario (p. ej. tras recargar los datos)."""
+        self._all_dirty = True
+        self._dirty.clear()
+
+    def _refresh(self):
+        index = self.index
+        event_ids = index.by_type.get(self.EVENT_TYPE, set())
+        if self._all_dirty:
+            # Solo los días con dos o más eventos pueden tener choques: contarlos
+            # con las claves indexadas, sin construir los eventos
+            counts = {}
+            for item_id in event_ids:
+                ordinal = index.priority_ordinal(item_id)
+                counts[ordinal] = counts.get(ordinal, 0) + 1
+            days = [ordinal for ordinal, count in counts.items() if count > 1 and ordinal is not None]
+            self._groups.clear()
+            self._all_dirty = False
+        else:
+            days = self._dirty
+        for ordinal in days:
+            ids = index.by_date.get(ordinal, set()) & event_ids
+            groups = []
+            if len(ids) > 1:
+                groups = day_conflicts(date.fromordinal(ordinal), map(index.get, ids))
+                self.swept_days += 1
+            if groups:
+                self._groups[ordinal] = groups
+            else:
+                self._groups.pop(ordinal, None)
+        self._dirty = set()
+
+    def conflicts(self, date_from: date = None, date_to: date = None) -> List[dict]:
+        """Choques del rango inclusivo de fechas (todos por defecto), por fecha y hora."""
+        self._refresh()
+        lo = date_from.toordinal() if date_from else None
+        hi = date_to.toordinal() if date_to else None
+        result = []
+        for ordinal in sorted(self._groups):
+            if (lo is None or ordinal >= lo) and (hi is None or ordinal <= hi):
+                result.extend(self._groups[ordinal])
+        return result
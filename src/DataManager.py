@@ -1,16 +1,31 @@
 # datamanager.py
 
+import copy
 import json
 import os
 import heapq
-from typing import List, Dict, Any, Union
+from typing import List, Dict, Any, Iterator, Union
 from Task import Task
 from Event import Event
 from Lesson import Lesson
 from Status import Status
-from datetime import date, datetime, time, timedelta
+from datetime import date, time, timedelta
 from PrioritizedItem import PrioritizedItem
-from UserPreferences import UserPreferences
+from UserPreferences import UserPreferences, PreferencesError
+from ItemIndex import ItemIndex
+from PlanCache import PlanCache
+from Planner import Planner
+from Clock import SystemClock
+from Instrumentation import instrument_class
+from Snapshot import Snapshot, SnapshotError, load_snapshot, write_snapshot
+from LazyStore import LazyItemList
+from Archive import ItemArchive
+import Feasibility
+from Optimizer import PlanOptimizer
+from Conflicts import ConflictIndex
+from FileLock import FileLock, LockTimeout
+import Storage
+import Codec
 from Status import Status
 
 path_file = "base_local.json"
@@ -21,28 +36,282 @@ class DataManager:
     Gestor de datos para cargar, guardar y manipular la información.
     Se encarga de la persistencia de los datos en un archivo JSON.
     """
-    def __init__(self, file_path=path_file):
+    def __init__(self, file_path=path_file, clock=None, storage_format="json", archive_after_days=30,
+                 encoding="json", preferences_path=preferences_file, shared_items=()):
         self.file_path = file_path
-        self.preferences_path = preferences_file
+        # "json" (por defecto), "snapshot" (binario compacto, ver Snapshot.py) o
+        # "lazy" (snapshot en memoria mapeada que construye los items al accederlos)
+        self.storage_format = storage_format
+        # Codificación del archivo JSON al guardar: "json", "json-compact", "gzip" o "zstd".
+        # Al cargar se detecta sola (ver Storage.py)
+        Storage.check_encoding(encoding)
+        self.encoding = encoding
+        self.snapshot_path = os.path.splitext(file_path)[0] + ".snap"
+        # Historial de completados (JSON Lines comprimido, solo agregado; ver Archive.py)
+        self.archive = ItemArchive(os.path.splitext(file_path)[0] + ".archive.jsonl.gz")
+        # Días tras completarse para pasar un item al archivo (None desactiva el archivado)
+        self.archive_after_days = archive_after_days
+        # Reloj inyectable: con un FixedClock los planes son reproducibles
+        self.clock = clock if clock is not None else SystemClock()
+        self.preferences_path = preferences_path
+        # Items de solo lectura compartidos entre perfiles (p. ej. el horario común, ver
+        # ProfileManager): entran en los índices y en los planes pero no se guardan aquí.
+        # Se copian porque el planificador escribe en cada item su colocación y reloj,
+        # y otro perfil (quizá en otro hilo) planifica los mismos eventos
+        self.shared_items = tuple(copy.copy(item) for item in shared_items)
+        # Con autosave=False las mutaciones solo marcan cambios pendientes y se
+        # escriben al llamar a `flush()` (ver AsyncDataManager)
+        self.autosave = True
+        self.unsaved_changes = False
+        # Concurrencia entre procesos: cerrojo de archivo y versiones por registro.
+        # _changed: id -> versión en disco antes del primer cambio local (None = agregado aquí)
+        # _deleted: id -> versión en disco del item borrado aquí
+        self.lock_path = file_path + ".lock"
+        self._changed = {}
+        self._deleted = {}
+        self._disk_stamp = None
+        # El archivo existía pero no se pudo leer: no se guarda encima (ver `flush`)
+        self._unreadable = False
+        self.conflicts = []
+        self._next_id = 1
+        # id -> (colección, posición en self.data[colección]) de los items propios
+        self._slots = {}
         self.data = self.loadData()
         self.user_preferences = self.loadPreferences()
+        self.index = ItemIndex()
+        self.index.resolver = self._resolve_lazy
+        # Choques de horario entre eventos, recalculados solo en los días que cambian
+        self.conflict_index = ConflictIndex(self.index)
+        self.index.listener = self._on_index_change
+        self._rebuild_index()
+        # Versiones para invalidar los planes memoizados (las preferencias entran a la
+        # clave ya compiladas; preferences_version solo cuenta los guardados, p. ej. para ETags)
+        self.data_version = 0
+        self.preferences_version = 0
+        self.plan_cache = PlanCache(version_of=lambda key: key[1])
+        self._applied_plan_key = None
+        self.planner = Planner()
+        # Items del último plan que no se pudieron colocar: [(item, motivo)]
+        self.unschedulable = []
+        # Fracción ocupada de la jornada por día en el último plan
+        self.utilization = {}
+        # Análisis de plazos del último plan (ver Feasibility.analyze)
+        self.feasibility = None
+        # Estadísticas de la última optimización del plan (ver Optimizer.py)
+        self.optimizer_stats = None
+        if archive_after_days is not None:
+            self.archive_completed()
+
+    # --- Índices secundarios ---
+    def _register(self, item, source: str = None):
+        """
+        Asigna un id al item (si no tiene o está repetido) y lo agrega a los índices.
+
+        `source` es la fuente ordenada donde se mezcla (por defecto la de su tipo).
+        """
+        if item.item_id is None or item.item_id in self.index:
+            item.item_id = self._next_id
+            self._next_id += 1
+        item.clock = self.clock
+        self.index.add(item, source)
+        return item
+
+    def _touch(self, item, added: bool = False):
+        """Registra un cambio local del item: sube su versión y queda pendiente de guardar."""
+        if added:
+            self._changed[item.item_id] = None
+        elif item.item_id not in self._changed:
+            self._changed[item.item_id] = item.version
+        item.version += 1
+
+    def _forget(self, item):
+        """Registra el borrado local del item (para la fusión al guardar)."""
+        base = self._changed.pop(item.item_id, item.version)
+        if base is not None:
+            self._deleted[item.item_id] = base
+
+    def _on_index_change(self, item_type: str, ordinal: int):
+        if item_type == ConflictIndex.EVENT_TYPE:
+            self.conflict_index.touch(ordinal)
+
+    def _rebuild_index(self):
+        """Reconstruye los índices a partir de las listas de `self.data`."""
+        self.index.clear()
+        self.conflict_index.touch_all()
+        self._slots = {}
+        # Los ids guardados se conservan; los nuevos continúan después del mayor
+        max_id = 0
+        for items in self.data.values():
+            if isinstance(items, LazyItemList):
+                max_id = max(max_id, items.max_id())
+            else:
+                max_id = max([max_id] + [item.item_id for item in items if item.item_id is not None])
+        self._next_id = max(self._next_id, max_id + 1)
+        for key in ('tasks', 'events', 'lessons'):
+            items = self.data[key]
+            if isinstance(items, LazyItemList):
+                # Indexar con los campos crudos, sin construir los items
+                for item_id, keys, priority_time, item in items.iter_index_keys():
+                    if item is not None:
+                        self._register(item)
+                    else:
+                        self.index.add_keys(item_id, keys, priority_time)
+            else:
+                for item in items:
+                    self._register(item)
+            self._reslot(key)
+        for item in self.shared_items:
+            self._register(item, 'shared')
+
+    def _reslot(self, key: str):
+        """Recalcula la posición de cada item de `self.data[key]`."""
+        items = self.data[key]
+        ids = items.iter_ids() if isinstance(items, LazyItemList) else (item.item_id for item in items)
+        for position, item_id in enumerate(ids):
+            self._slots[item_id] = (key, position)
+
+    def _append(self, key: str, item):
+        """Agrega el item al final de `self.data[key]` y lo registra."""
+        items = self.data[key]
+        items.append(item)
+        self._register(item)
+        self._slots[item.item_id] = (key, len(items) - 1)
+        return item
+
+    def _remove(self, item_id: int):
+        """Quita un item en O(1): el último de su lista pasa a ocupar su posición."""
+        key, position = self._slots.pop(item_id)
+        items = self.data[key]
+        if isinstance(items, LazyItemList):
+            moved_id = items.swap_remove(position)
+        else:
+            last = items.pop()
+            moved_id = None
+            if position < len(items):
+                items[position] = last
+                moved_id = last.item_id
+        if moved_id is not None:
+            self._slots[moved_id] = (key, position)
+        self.index.remove(item_id)
+
+    def get_item(self, item_id: int, key: str = None):
+        """
+        Item propio con ese id, o None si no existe (o no es de la colección `key`).
+
+        Los items compartidos entre perfiles no se pueden modificar y no se retornan.
+        """
+        slot = self._slots.get(item_id)
+        if slot is None or (key is not None and slot[0] != key):
+            return None
+        return self.index.get(item_id)
+
+    def _open_lazy(self):
+        """Abre el snapshot en memoria mapeada; los items se construyen al accederlos."""
+        snapshot = Snapshot(self.snapshot_path)
+        data = {}
+        for key in ('tasks', 'events', 'lessons'):
+            data[key] = LazyItemList(getattr(snapshot, key), on_load=self._on_lazy_load)
+        return data
+
+    def _on_lazy_load(self, item):
+        item.clock = self.clock
+
+    def _resolve_lazy(self, item_id):
+        """Construye el item de `item_id` desde el snapshot (almacén perezoso)."""
+        for items in self.data.values():
+            if isinstance(items, LazyItemList):
+                record = items.record_of(item_id)
+                if record is not None:
+                    return items.load(record)
+        return None
+
+    def loaded_item_count(self) -> int:
+        """Cantidad de items construidos como objetos Python (con las copias compartidas)."""
+        return len(self.shared_items) + sum(
+            items.loaded_count() if isinstance(items, LazyItemList) else len(items)
+            for items in self.data.values())
+
+    def query(self, item_type=None, status=None, subject=None, date_from=None, date_to=None,
+              exclude_status=None) -> List[PrioritizedItem]:
+        """
+        Consulta los items usando los índices secundarios, ordenados por prioridad.
+
+        Args:
+            item_type: 'Tarea', 'Evento' o 'Lección' (o una colección de ellos)
+            status: Status o colección de Status (los eventos no tienen estado)
+            subject: Asignatura o colección de asignaturas (solo lecciones)
+            date_from, date_to: Rango inclusivo sobre `get_priority_date()`
+            exclude_status: Status a descartar del resultado
+        """
+        ids = self.index.query(item_type=item_type, status=status, subject=subject,
+                               date_from=date_from, date_to=date_to,
+                               exclude_status=exclude_status)
+        return list(self._by_priority(ids))
+
+    def iter_prioritized(self, sources=None, date_from: date = None, date_to: date = None,
+                         exclude_status=Status.COMPLETADO) -> Iterator[PrioritizedItem]:
+        """
+        Recorre los items en orden de prioridad sin armar una lista combinada.
+
+        Cada fuente ('tasks', 'events', 'lessons' y 'shared' para el horario
+        compartido) está ordenada por separado y se mezclan de forma perezosa
+        (ver `ItemIndex.iter_sorted`): quien solo necesita la primera página o
+        una ventana de fechas solo toca esos items.
+
+        Args:
+            sources: Fuente o colección de fuentes (todas por defecto)
+            date_from, date_to: Rango inclusivo sobre `get_priority_date()`
+            exclude_status: Status a saltear (None para no saltear ninguno)
+        """
+        index = self.index
+        for item_id in index.iter_sorted(sources, date_from, date_to):
+            if exclude_status is not None and index.status_of(item_id) == exclude_status:
+                continue
+            yield index.get(item_id)
+
+    def _by_priority(self, ids):
+        """
+        Recorre los items de `ids` en orden de prioridad, extrayéndolos del heap de
+        a uno: armarlo es O(n) y cada item que se consume cuesta O(log n).
+        """
+        # La clave desempata por id, así los empates salen siempre en el mismo orden
+        min_heap = [(item.priority_key(), item) for item in map(self.index.get, ids)]
+        heapq.heapify(min_heap)
+        while min_heap:
+            yield heapq.heappop(min_heap)[1]
+
+    def get_subjects(self) -> List[str]:
+        """Retorna las asignaturas registradas en las lecciones."""
+        return self.index.subjects()
 
     def loadData(self):
         """Carga los datos del archivo JSON y los convierte en objetos."""
+        if self.storage_format in ("snapshot", "lazy") and os.path.exists(self.snapshot_path):
+            try:
+                with FileLock(self.lock_path, shared=True):
+                    if self.storage_format == "lazy":
+                        return self._open_lazy()
+                    return load_snapshot(self.snapshot_path)
+            except (SnapshotError, IOError, LockTimeout) as e:
+                print(f"Error al cargar el snapshot: {e}. Se usará el JSON.")
+
         if not os.path.exists(self.file_path):
             return {"tasks": [], "events": [], "lessons": []}
         
         try:
-            with open(self.file_path, "r", encoding="utf-8") as f:
-                raw_data = json.load(f)
-                return {
-                    "tasks": [Task.from_dict(task) for task in raw_data.get('tasks', [])],
-                    "events": [Event.from_dict(events) for events in raw_data.get('events', [])],
-                    "lessons": [Lesson.from_dict(lessons) for lessons in raw_data.get('lessons', [])]
-                }
-        except (json.JSONDecodeError, IOError) as e:
+            # Cerrojo compartido: otro proceso no puede estar escribiendo a la vez
+            with FileLock(self.lock_path, shared=True):
+                self._disk_stamp = self._stat()
+                raw_data = Storage.read_file(self.file_path)
+        except (ValueError, EOFError, IOError, LockTimeout) as e:
+            # Solo errores de lectura o del contenedor (JSON, gzip, zstd)
             print(f"Error al cargar el archivo JSON: {e}. Se creará uno nuevo.")
+            self._unreadable = True
             return {"tasks": [], "events": [], "lessons": []}
+        # Conversión en bloque, equivalente a `from_dict` de cada item (ver Codec.py).
+        # Un registro inválido lanza ValueError: cargar vacío y guardar después
+        # borraría también los registros válidos
+        return Codec.decode_data(raw_data)
 
     def loadPreferences(self):
         """Carga las preferencias del usuario desde un archivo JSON."""
@@ -53,12 +322,25 @@ class DataManager:
             with open(self.preferences_path, "r", encoding="utf-8") as f:
                 data = json.load(f)
                 return UserPreferences.from_dict(data)
-        except (json.JSONDecodeError, IOError) as e:
+        except (json.JSONDecodeError, PreferencesError, IOError) as e:
             print(f"Error al cargar preferencias: {e}. Se usarán las predeterminadas.")
             return UserPreferences()
 
     def savePreferences(self):
-        """Guarda las preferencias del usuario en un archivo JSON."""
+        """
+        Valida y guarda las preferencias del usuario en un archivo JSON.
+
+        Al guardar se vuelven a compilar (ver `UserPreferences.compile`): los planes
+        se memoizan contra la forma compilada, así que solo los cambios que
+        afectan al planificador los invalidan. Si algún valor es inválido no se
+        guarda nada y se sigue usando la última forma válida.
+        """
+        try:
+            self.user_preferences.compile()
+        except PreferencesError as e:
+            print(f"Preferencias inválidas: {e}. No se guardaron.")
+            return
+        self.preferences_version += 1
         try:
             with open(self.preferences_path, "w", encoding="utf-8") as f:
                 json.dump(self.user_preferences.to_dict(), f, indent=4)
@@ -67,16 +349,311 @@ class DataManager:
 
     def saveData(self):
         """Guarda los datos de los objetos en un archivo JSON."""
+        # Toda mutación termina guardando: aquí se invalida la caché de planes
+        self.data_version += 1
+        self.unsaved_changes = True
+        if self.autosave:
+            self.flush()
+
+    def flush(self) -> bool:
+        """
+        Escribe los datos en disco. Retorna False si no se pudo escribir.
+
+        Con almacenamiento JSON, si otro proceso guardó desde la última lectura,
+        primero se fusionan sus cambios (ver `_merge_from_disk`), todo bajo un
+        cerrojo exclusivo para que ninguna escritura se pierda.
+        """
         try:
-            with open(self.file_path, "w", encoding="utf-8") as f:
-                serializable_data = {
-                    "tasks": [t.to_dict() for t in self.data["tasks"]],
-                    "events": [e.to_dict() for e in self.data["events"]],
-                    "lessons": [l.to_dict() for l in self.data["lessons"]]
-                }
-                json.dump(serializable_data, f, indent=4)
+            with FileLock(self.lock_path):
+                self._write_locked()
+        except LockTimeout as e:
+            print(f"Error al guardar los datos: {e}")
+            return False
         except IOError as e:
             print(f"Error al guardar los datos: {e}")
+            return False
+        return True
+
+    def _write_locked(self):
+        """Escritura de `flush`; quien llama ya tiene el cerrojo exclusivo."""
+        if self.storage_format in ("snapshot", "lazy"):
+            self._write_snapshot()
+        else:
+            if self._unreadable:
+                self._set_aside_unreadable()
+            elif self._stat() != self._disk_stamp:
+                self._merge_from_disk()
+            Storage.write_file(self.file_path, self._serialize(), self.encoding)
+            self._disk_stamp = self._stat()
+        self._changed.clear()
+        self._deleted.clear()
+        self.unsaved_changes = False
+
+    def _write_snapshot(self):
+        """
+        Escribe el snapshot. Si el almacén perezoso lo tiene en memoria mapeada, el
+        mapeo se cierra antes de reemplazar el archivo (Windows no reemplaza un
+        archivo mapeado) y las listas pasan a leer del snapshot nuevo.
+        """
+        lazy = [key for key, items in self.data.items() if isinstance(items, LazyItemList)]
+        if not lazy:
+            write_snapshot(self.snapshot_path, self.data)
+            return
+        current = self.data[lazy[0]].snapshot
+        replaced = False
+        try:
+            write_snapshot(self.snapshot_path, self.data, before_replace=current.close)
+            replaced = True
+        finally:
+            if current.buffer is None:
+                # Si el reemplazo falló, se reabre el archivo anterior con el mismo orden
+                snapshot = Snapshot(self.snapshot_path)
+                for key in lazy:
+                    self.data[key].rebind(getattr(snapshot, key), rewritten=replaced)
+
+    def _set_aside_unreadable(self):
+        """Renombra el archivo que no se pudo cargar para que el guardado no lo pise."""
+        if os.path.exists(self.file_path):
+            backup = f"{self.file_path}.{self.clock.now():%Y%m%d%H%M%S}.ilegible"
+            os.replace(self.file_path, backup)
+            print(f"El archivo de datos no se pudo cargar; se conserva como {backup}.")
+        self._unreadable = False
+        self._disk_stamp = None
+
+    # --- Concurrencia entre procesos ---
+    def _stat(self):
+        """Huella del archivo de datos para detectar escrituras de otros procesos."""
+        try:
+            st = os.stat(self.file_path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def sync(self) -> int:
+        """
+        Trae los cambios que otro proceso guardó en el archivo, sin escribir nada.
+
+        Cuesta un `os.stat` si el archivo no cambió. Retorna cuántos registros se
+        agregaron, actualizaron o quitaron.
+        """
+        if self.storage_format != "json" or self._stat() == self._disk_stamp:
+            return 0
+        try:
+            with FileLock(self.lock_path, shared=True):
+                applied = self._merge_from_disk()
+                self._disk_stamp = self._stat()
+        except LockTimeout:
+            return 0
+        return applied
+
+    def _merge_from_disk(self) -> int:
+        """
+        Fusiona en memoria la versión del archivo escrita por otro proceso.
+
+        Solo se construyen los registros cuya versión difiere de la local. Los
+        cambios sin conflicto se aplican; si un mismo registro cambió aquí y allá,
+        se conserva el cambio local y se anota en `self.conflicts`.
+        """
+        try:
+            raw = Storage.read_file(self.file_path)
+        except (ValueError, EOFError, IOError) as e:
+            print(f"No se pudo leer el archivo para fusionar: {e}")
+            return 0
+        records = {key: raw.get(key, []) for key in ('tasks', 'events', 'lessons')}
+        if any(r.get('id') is None for rs in records.values() for r in rs):
+            # Escrito por una versión sin ids: no se puede fusionar registro a registro
+            print("El archivo fue escrito sin ids de registro; se sobrescribirá sin fusionar.")
+            return 0
+        disk_ids = {r['id'] for rs in records.values() for r in rs}
+        if disk_ids:
+            self._next_id = max(self._next_id, max(disk_ids) + 1)
+        local = {item.item_id: (key, item) for key in ('tasks', 'events', 'lessons')
+                 for item in self.data[key]}
+
+        applied = 0
+        for key, rs in records.items():
+            incoming = []
+            for r in rs:
+                rid, version = r['id'], r.get('version', 0)
+                if rid in self._deleted:
+                    if version != self._deleted[rid]:
+                        self._conflict(key, rid, "borrado aquí y modificado en otro proceso")
+                        self._deleted[rid] = version
+                    continue
+                if rid in self._changed:
+                    base = self._changed[rid]
+                    if base is None:
+                        # Ambos procesos usaron el mismo id nuevo: el item local recibe otro
+                        self._reassign_id(local.pop(rid)[1])
+                        incoming.append(r)
+                    elif version != base:
+                        self._conflict(key, rid, "modificado aquí y en otro proceso")
+                        self._changed[rid] = version
+                        # El cambio local gana: su versión debe superar la del disco,
+                        # o el otro proceso no lo vería como un cambio al fusionar
+                        item = local[rid][1]
+                        item.version = max(item.version, version) + 1
+                    continue
+                current = local.get(rid)
+                if current is None or current[1].version != version:
+                    incoming.append(r)
+            for new in Codec.DECODERS[key](incoming):
+                current = local.get(new.item_id)
+                if current is not None:
+                    item = current[1]
+                    planned_date = item.planned_date
+                    item.__dict__.update(vars(new))
+                    item.planned_date = planned_date
+                    self.index.update(item)
+                    self.planner.invalidate(item)
+                else:
+                    self._append(key, new)
+                applied += 1
+
+        # Lo que ya no está en el archivo lo borró otro proceso
+        removed = {key: set() for key in ('tasks', 'events', 'lessons')}
+        for rid, (key, item) in local.items():
+            if rid in disk_ids:
+                continue
+            if rid in self._changed:
+                if self._changed[rid] is not None:
+                    self._conflict(key, rid, "modificado aquí y borrado en otro proceso")
+                    self._changed[rid] = None
+                continue
+            removed[key].add(rid)
+        for key, ids in removed.items():
+            if ids:
+                self._drop_items(key, ids)
+                applied += len(ids)
+
+        if applied:
+            self.data_version += 1
+        return applied
+
+    def _reassign_id(self, item):
+        self.index.remove(item.item_id)
+        del self._changed[item.item_id]
+        slot = self._slots.pop(item.item_id)
+        item.item_id = None
+        self._register(item)
+        self._slots[item.item_id] = slot
+        self._changed[item.item_id] = None
+
+    def _conflict(self, key: str, item_id: int, reason: str):
+        self.conflicts.append({'type': key, 'id': item_id, 'reason': reason})
+        print(f"Conflicto en {key} #{item_id}: {reason}. Se conserva el cambio local.")
+
+    def _serialize(self) -> Dict[str, List[dict]]:
+        """Convierte los items al formato JSON de intercambio (equivale a `to_dict`)."""
+        return Codec.encode_data(self.data)
+
+    # --- Archivo de completados ---
+    def archive_completed(self, older_than_days: int = None) -> int:
+        """
+        Mueve al archivo los items completados hace más de `older_than_days` días.
+
+        Los items completados antes de que existiera `completed_date` usan su
+        fecha de prioridad como referencia. Retorna cuántos items se archivaron.
+
+        Todo ocurre bajo el cerrojo exclusivo del almacén: primero se traen los
+        cambios de otros procesos (lo que otra instancia ya archivó desaparece
+        aquí), luego se agrega al archivo y se guardan los datos sin esos items,
+        así dos instancias que arrancan juntas no archivan lo mismo dos veces.
+        """
+        if older_than_days is None:
+            older_than_days = self.archive_after_days if self.archive_after_days is not None else 0
+        today = self.clock.today()
+        cutoff = today - timedelta(days=older_than_days)
+        try:
+            with FileLock(self.lock_path):
+                if self.storage_format == "json" and self._stat() != self._disk_stamp:
+                    self._merge_from_disk()
+                    self._disk_stamp = self._stat()
+                moved = self._archivable(cutoff)
+                if not any(moved.values()):
+                    return 0
+                # Primero el archivo: si algo falla después, el item queda duplicado, no perdido
+                try:
+                    self.archive.append(((kind, item) for kind, items in moved.items() for item in items),
+                                        today)
+                except IOError as e:
+                    print(f"Error al escribir el archivo de completados: {e}")
+                    return 0
+                for kind, items in moved.items():
+                    if items:
+                        for item in items:
+                            self._forget(item)
+                        self._drop_items(kind, {item.item_id for item in items})
+                # Se guarda aun sin autosave: los datos en disco no pueden conservar
+                # lo que ya está en el archivo una vez soltado el cerrojo
+                self.data_version += 1
+                self._write_locked()
+        except (LockTimeout, IOError) as e:
+            print(f"Error al archivar los completados: {e}")
+            return 0
+        return sum(len(items) for items in moved.values())
+
+    def _archivable(self, cutoff: date) -> Dict[str, list]:
+        """Items completados en o antes de `cutoff`, por colección."""
+        moved = {'tasks': [], 'lessons': []}
+        kinds = {'Tarea': 'tasks', 'Lección': 'lessons'}
+        for item_id in sorted(self.index.query(status=Status.COMPLETADO)):
+            if self._completed_ordinal(item_id) > cutoff.toordinal():
+                continue
+            item = self.index.get(item_id)
+            moved[kinds[item.get_type()]].append(item)
+        return moved
+
+    def _completed_ordinal(self, item_id) -> int:
+        """Ordinal de la fecha de completado, sin construir items del almacén perezoso."""
+        item = self.index.items.get(item_id)
+        if item is None:
+            for items in self.data.values():
+                if isinstance(items, LazyItemList) and items.record_of(item_id) is not None:
+                    # Si ya se construyó, su fecha pudo cambiar después de leer el registro
+                    item = items.loaded(item_id)
+                    if item is None:
+                        completed = items.raw_completed(item_id)
+                        if completed is not None:
+                            return completed
+                    break
+        if item is not None:
+            completed = item.completed_date or item.get_priority_date()
+            return completed.toordinal()
+        # Sin fecha registrada: la de prioridad guardada en el índice
+        return self.index.priority_ordinal(item_id)
+
+    def _drop_items(self, key: str, item_ids: set):
+        """Quita de `self.data[key]` y de los índices los items de `item_ids`."""
+        items = self.data[key]
+        if isinstance(items, LazyItemList):
+            items.remove_ids(item_ids)
+        else:
+            self.data[key] = [item for item in items if item.item_id not in item_ids]
+        for item_id in item_ids:
+            self._slots.pop(item_id, None)
+            self.index.remove(item_id)
+        self._reslot(key)
+
+    def query_archive(self, item_type=None, date_from: date = None, date_to: date = None,
+                      text: str = None) -> List[dict]:
+        """Consulta el historial de items archivados (ver `ItemArchive.query`)."""
+        return self.archive.query(item_type=item_type, date_from=date_from, date_to=date_to, text=text)
+
+    def archive_stats(self) -> dict:
+        """Cantidad de items archivados por tipo y tamaño del archivo."""
+        return self.archive.stats()
+
+    def export_to_file(self, file_path):
+        """
+        Exporta todos los elementos a un archivo JSON (formato de intercambio).
+        """
+        try:
+            with open(file_path, "w", encoding="utf-8") as f:
+                json.dump(self._serialize(), f, indent=4)
+            return True, "Exportación completada con éxito"
+        except IOError as e:
+            return False, f"Error al exportar: {str(e)}"
 
     # --- Métodos para Tareas ---
     def addTask(self, title, due_date, estimated_minutes: int | None = None):
@@ -95,18 +672,24 @@ class DataManager:
                     else:
                         due_date = date.fromisoformat(due_date)
                 except Exception:
-                    due_date = date.today()
-        new_task = Task(title, due_date, estimated_minutes=estimated_minutes)
-        self.data["tasks"].append(new_task)
+                    due_date = self.clock.today()
+        new_task = self._append('tasks', Task(title, due_date, estimated_minutes=estimated_minutes))
+        self._touch(new_task, added=True)
         self.saveData()
+        return new_task
 
-    def deleteTask(self, index):
-        """Elimina una tarea por su índice."""
-        if 0 <= index < len(self.data['tasks']):
-            del self.data['tasks'][index]
-            self.saveData()
-            return True
-        return False
+    def deleteTask(self, item_id: int) -> bool:
+        """Elimina una tarea por su id."""
+        return self._delete('tasks', item_id)
+
+    def _delete(self, key: str, item_id: int) -> bool:
+        item = self.get_item(item_id, key)
+        if item is None:
+            return False
+        self._forget(item)
+        self._remove(item_id)
+        self.saveData()
+        return True
 
     def get_all_prioritized_items(self, days_range: int = None) -> List[PrioritizedItem]:
         """
@@ -115,24 +698,13 @@ class DataManager:
         Args:
             days_range: Si se especifica, solo retorna items dentro de los próximos N días
         """
-        min_heap = []
-        today = date.today()
-        
-        # Añadir todos los items al heap, ignorando completados
-        for item in self.data['tasks'] + self.data['events'] + self.data['lessons']:
-            if hasattr(item, 'status') and item.status == Status.COMPLETADO:
-                continue
-            if days_range is not None:
-                days_until = (item.get_priority_date() - today).days
-                if days_until < 0 or days_until > days_range:
-                    continue
-            heapq.heappush(min_heap, item)
-        
-        # Extraer items del heap en orden de prioridad
-        prioritized_items = []
-        while min_heap:
-            prioritized_items.append(heapq.heappop(min_heap))
-        return prioritized_items
+        today = self.clock.today()
+        date_from = date_to = None
+        if days_range is not None:
+            date_from, date_to = today, today + timedelta(days=days_range)
+
+        # Mezcla de las fuentes ya ordenadas, solo dentro del rango
+        return list(self.iter_prioritized(date_from=date_from, date_to=date_to))
 
     def suggest_time_slots(self, items: List[PrioritizedItem]) -> None:
         """Asigna horarios sin sobrescribir eventos fijos ni solapar con ellos.
@@ -140,97 +712,144 @@ class DataManager:
         - Los Eventos se consideran fijos y conservan su `time` (1h por defecto si no hay duración).
         - Tareas y Lecciones se colocan en los huecos libres de la jornada (08:00–22:00),
           empezando desde la hora actual.
-        - Si no hay espacio, continúa al día siguiente.
+        - Si no hay espacio, continúa al día siguiente, hasta el horizonte del planificador
+          o hasta agotar su tiempo: `scheduling['horizon_days']` y
+          `scheduling['time_budget_ms']` en las preferencias.
+        - Lo que no se puede colocar queda sin horario y se informa en `self.unschedulable`.
+        - Con `task_splitting` activado en las preferencias, los items largos se dividen
+          en partes que llenan los huecos, con las pausas de `breaks` (ver `Planner`).
+        - Si solo cambió parte de la secuencia desde el último plan, se reparan
+          únicamente el día afectado y los siguientes (ver `Planner`).
         """
-        WORK_START = time(8, 0)
-        WORK_END = time(22, 0)
+        prefs = self.user_preferences.compiled
+        self.planner.configure(split=prefs.split_enabled, min_chunk=prefs.min_chunk,
+                               break_duration=prefs.break_duration,
+                               break_frequency=prefs.break_frequency,
+                               max_days=prefs.plan_horizon_days,
+                               time_budget=prefs.plan_budget_ms / 1000 if prefs.plan_budget_ms else None)
+        self.planner.plan(items, self.clock.now())
+        self.unschedulable = self.planner.unschedulable
+        self.utilization = self.planner.utilization
 
-        now = datetime.now()
-        today = now.date()
+    def _schedule_order(self, items: List[PrioritizedItem]) -> List[PrioritizedItem]:
+        """
+        Orden en que se colocan los items: el de prioridad o, con `minimize_late` en
+        las preferencias, primero los que Moore–Hodgson deja a tiempo.
+        """
+        if not self.user_preferences.compiled.minimize_late:
+            return items
+        free_today, day_capacity = self.planner.capacity(items, self.clock.now())
+        events = [it for it in items if it.get_type() == 'Evento']
+        work = [it for it in items if it.get_type() != 'Evento']
+        on_time, late = Feasibility.moore_hodgson(work, free_today, day_capacity, self.clock.today())
+        return events + on_time + late
 
-        def parse_hhmm(value: str) -> time:
-            try:
-                h, m = map(int, value.split(":"))
-                return time(h, m)
-            except Exception:
-                return WORK_START
-
-        # 1) Preparar intervalos ocupados por día (eventos hoy) y acumulados de tareas
-        occupied_by_day: Dict[date, List[tuple[time, time]]] = {}
-        occupied_by_day[today] = []
-        for item in items:
-            if getattr(item, 'get_type', lambda: '')() == 'Evento':
-                event_date = item.get_priority_date()
-                if event_date == today and hasattr(item, 'time') and item.time:
-                    start_t = parse_hhmm(item.time)
-                    start_dt = datetime.combine(today, start_t)
-                    end_dt = start_dt + timedelta(minutes=item.duration)
-                    # Establecer hora en el evento y agregar a bloque ocupado
-                    item.set_time_range(start_dt.time(), end_dt.time())
-                    item.planned_date = today
-                    occupied_by_day[today].append((start_dt.time(), end_dt.time()))
-
-        # Ordenar intervalos por inicio del día actual
-        occupied_by_day[today].sort(key=lambda x: x[0])
-
-        # 2) Construir bloques libres por día
-        def get_free_blocks_for_day(day: date) -> List[tuple[time, time]]:
-            # Obtener ocupados de ese día; si no hay, inicializar
-            if day not in occupied_by_day:
-                occupied_by_day[day] = []
-            day_occupied = sorted(occupied_by_day[day], key=lambda x: x[0])
-            # Si es hoy, no empezar antes de ahora
-            start_limit = max(now.time(), WORK_START) if day == today else WORK_START
-            blocks = []
-            cursor = start_limit
-            for s, e in day_occupied:
-                if e <= cursor:
-                    continue
-                if s > cursor:
-                    blocks.append((cursor, min(s, WORK_END)))
-                cursor = max(cursor, e)
-                if cursor >= WORK_END:
-                    break
-            if cursor < WORK_END:
-                blocks.append((cursor, WORK_END))
-            return [(s, e) for s, e in blocks if s < e]
-
-        # 3) Asignar Tareas/Lecciones en huecos libres
-        schedulables = [it for it in items if getattr(it, 'get_type', lambda: '')() != 'Evento']
-        current_day = today
-        i = 0
-        while i < len(schedulables):
-            free_blocks = get_free_blocks_for_day(current_day)
-            if not free_blocks:
-                current_day = current_day + timedelta(days=1)
-                continue
-            placed_any = False
-            for block_start, block_end in free_blocks:
-                # Mientras quede espacio en este bloque, colocar items
-                cursor_dt = datetime.combine(current_day, block_start)
-                end_block_dt = datetime.combine(current_day, block_end)
-                while i < len(schedulables) and cursor_dt + timedelta(minutes=schedulables[i].duration) <= end_block_dt:
-                    it = schedulables[i]
-                    it.set_time_range(cursor_dt.time(), (cursor_dt + timedelta(minutes=it.duration)).time())
-                    it.planned_date = current_day
-                    # Marcar el intervalo como ocupado para este día
-                    if current_day not in occupied_by_day:
-                        occupied_by_day[current_day] = []
-                    occupied_by_day[current_day].append((it.start_time, it.end_time))
-                    occupied_by_day[current_day].sort(key=lambda x: x[0])
-                    cursor_dt += timedelta(minutes=it.duration)
-                    i += 1
-                    placed_any = True
-                if i >= len(schedulables):
-                    break
-            if not placed_any:
-                # No hubo espacio hoy; pasar al siguiente día completo
-                current_day = current_day + timedelta(days=1)
+    def _optimize_plan(self, items: List[PrioritizedItem]):
+        """Mejora el plan voraz con búsqueda local si `scheduling['optimize']` está activo."""
+        prefs = self.user_preferences.compiled
+        if not prefs.optimize:
+            return
+        now = self.clock.now()
+        budget = prefs.optimize_budget_ms / 1000
+        self.optimizer_stats = PlanOptimizer(self.planner, prefs).optimize(items, now, budget)
+        if self.optimizer_stats['accepted']:
+            self.utilization = self.planner.utilization_of(items, now)
+            # Los horarios ya no son los del planificador: el próximo plan se calcula completo
+            self.planner.reset()
+
+    def _analyze_feasibility(self, items: List[PrioritizedItem]) -> dict:
+        """Plazos que no se cumplen con el orden de colocación de `items`."""
+        free_today, day_capacity = self.planner.capacity(items, self.clock.now())
+        work = [it for it in items if it.get_type() != 'Evento']
+        if not self.user_preferences.compiled.minimize_late:
+            work = Feasibility.edf_order(work)
+        return Feasibility.analyze(work, free_today, day_capacity, self.clock.today())
+
+    # --- Planes memoizados ---
+    def _plan_key(self, view: str, horizon: int = None) -> tuple:
+        # El planificador trabaja al minuto: el "ahora" truncado forma parte de la clave.
+        # Las preferencias entran ya compiladas (hashables): cambiar, p. ej., el tamaño
+        # de fuente no invalida los planes. La versión de los datos va en la posición 1
+        # (la que lee `PlanCache.version_of`)
+        now = self.clock.now().replace(second=0, microsecond=0)
+        return (view, self.data_version, self.user_preferences.compiled, now, horizon)
+
+    def get_plan(self, horizon: int = None) -> List[PrioritizedItem]:
+        """
+        Retorna los items priorizados con horario asignado, memoizando el resultado.
+
+        El plan solo se recalcula cuando cambia la versión de los datos, las
+        preferencias compiladas, el minuto actual del reloj o el horizonte.
+
+        `horizon` (días) solo filtra qué items entran al plan por su fecha; hasta
+        dónde se buscan huecos lo fija `scheduling['horizon_days']`. Un plan cortado
+        por `scheduling['time_budget_ms']` queda memoizado como cualquier otro hasta
+        que cambie la clave (a lo sumo, al minuto siguiente).
+        """
+        key = self._plan_key('plan', horizon)
+
+        def compute():
+            items = self._schedule_order(self.get_all_prioritized_items(horizon))
+            self.suggest_time_slots(items)
+            self._optimize_plan(items)
+            self.feasibility = self._analyze_feasibility(items)
+            self._applied_plan_key = key
+            placements = [(it, it.start_time, it.end_time, it.planned_date, it.chunks)
+                          for it in items]
+            return items, placements, (self.unschedulable, self.utilization, self.feasibility)
+
+        items, placements, report = self.plan_cache.get(key, compute)
+        self.unschedulable, self.utilization, self.feasibility = report
+        if self._applied_plan_key != key:
+            # Los horarios viven en los propios items: restaurar los de este plan
+            for it, start, end, planned, chunks in placements:
+                it.start_time, it.end_time, it.planned_date, it.chunks = start, end, planned, chunks
+            self._applied_plan_key = key
+            # La colocación incremental ya no corresponde a los items
+            self.planner.reset()
+        return items
+
+    def get_unschedulable(self) -> List[tuple]:
+        """Items del plan actual que quedaron sin horario, con el motivo: [(item, motivo)]."""
+        self.get_plan()
+        return self.unschedulable
+
+    def get_day_utilization(self) -> Dict[date, float]:
+        """Fracción ocupada del tiempo libre de cada día planificado (0.0 a 1.0)."""
+        self.get_plan()
+        return self.utilization
+
+    def get_feasibility(self) -> dict:
+        """
+        Items del plan actual que no llegan a su fecha y por cuánto (ver `Feasibility.analyze`).
+
+        Con `scheduling['minimize_late']` el plan usa el orden de Moore–Hodgson, que
+        minimiza la cantidad de items atrasados.
+        """
+        self.get_plan()
+        return self.feasibility
+
+    def get_conflicts(self, date_from: date = None, date_to: date = None) -> List[dict]:
+        """
+        Eventos que se solapan, agrupados por día: `[{'date', 'start', 'end', 'items'}]`.
+
+        Incluye los del horario compartido. Solo se vuelven a revisar los días
+        cuyos eventos cambiaron desde la última consulta (ver `Conflicts.py`).
+        """
+        return self.conflict_index.conflicts(date_from, date_to)
+
+    def plan_cache_stats(self) -> dict:
+        """Retorna las estadísticas de aciertos/fallos de la caché de planes."""
+        return self.plan_cache.stats()
 
     def get_items_by_day(self) -> Dict[str, List[PrioritizedItem]]:
         """
         Organiza los items por día (hoy, mañana, próximos días, etc.)
         """
+        all_items = self.get_plan()
+        return self.plan_cache.get(self._plan_key('by_day'), lambda: self._group_items_by_day(all_items))
+
+    def _group_items_by_day(self, all_items: List[PrioritizedItem]) -> Dict[str, List[PrioritizedItem]]:
         items_by_day = {
             "Para Hoy (Urgente)": [],  # Vencidos y de hoy
             "Mañana": [],
@@ -238,13 +857,9 @@ class DataManager:
             "Más adelante": []
         }
         
-        today = date.today()
+        today = self.clock.today()
         tomorrow = today + timedelta(days=1)
         week_later = today + timedelta(days=7)
-        
-        # Obtener todos los items, asignar horarios respetando eventos fijos
-        all_items = self.get_all_prioritized_items()
-        self.suggest_time_slots(all_items)
 
         for item in all_items:
             priority_date = item.get_priority_date()
@@ -273,11 +888,69 @@ class DataManager:
         - Incluye eventos cuyo `get_priority_date()` sea hoy.
         - Incluye tareas y lecciones con `planned_date == hoy`.
         - Ordenado por `start_time` si existe.
+
+        Puede calcularse sin planificar todo (ver `_compute_today_plan`), así que no
+        actualiza `unschedulable` ni `utilization`. La ocupación de hoy está en
+        `get_today_utilization()`. Lo que no se pudo colocar requiere el plan completo
+        (`get_unschedulable()`): quien lo necesite debe pedirlo antes, y así el plan de
+        hoy se filtra de ese plan en lugar de calcularse aparte.
+        """
+        return self._today()[0]
+
+    def get_today_utilization(self) -> float | None:
+        """
+        Fracción ocupada del tiempo libre de hoy (None si hoy no hay nada colocado).
+
+        Sale del mismo cálculo que `get_today_plan()`, sin planificar los días siguientes.
         """
-        today = date.today()
-        all_items = self.get_all_prioritized_items()
-        self.suggest_time_slots(all_items)
+        return self._today()[1]
 
+    def _today(self) -> tuple:
+        """Plan de hoy memoizado: `(items, ocupación de hoy)`."""
+        key = self._plan_key('today')
+        if key in self.plan_cache or self._today_plan_is_prefix():
+            compute = self._compute_today_plan
+        else:
+            all_items = self.get_plan()
+            compute = lambda: self._filter_today_plan(all_items)
+
+        def with_utilization():
+            items = compute()
+            return items, self.planner.utilization_of(items, self.clock.now()).get(self.clock.today())
+        return self.plan_cache.get(key, with_utilization)
+
+    def _today_plan_is_prefix(self) -> bool:
+        """
+        Si el plan de hoy se puede calcular solo (sin planificar todo): cuando el plan
+        completo ya está en caché, o con modos que reordenan o dividen items, no.
+        """
+        prefs = self.user_preferences.compiled
+        return (self._plan_key('plan') not in self.plan_cache
+                and not prefs.split_enabled and not prefs.minimize_late and not prefs.optimize)
+
+    def _compute_today_plan(self) -> List[PrioritizedItem]:
+        """
+        Coloca items en orden de prioridad solo hasta llenar el día: la colocación
+        voraz de cada item depende únicamente de los anteriores, así que lo que
+        queda para hoy coincide con el plan completo. Las fuentes ya están
+        ordenadas: solo se recorren los k items extraídos en lugar de ordenar y
+        planificar los n.
+        """
+        today = self.clock.today()
+        events = list(self.iter_prioritized(('events', 'shared'), today, today))
+        work = self.iter_prioritized(('tasks', 'lessons'))
+        today_items = list(events)
+        for item in self.planner.iter_placements(events, work, self.clock.now()):
+            if item.planned_date != today:
+                break
+            today_items.append(item)
+        # Los horarios de estos items ya no son los del último plan completo aplicado
+        self._applied_plan_key = None
+        today_items.sort(key=lambda x: (x.start_time if x.start_time else time(23, 59)))
+        return today_items
+
+    def _filter_today_plan(self, all_items: List[PrioritizedItem]) -> List[PrioritizedItem]:
+        today = self.clock.today()
         today_items: List[PrioritizedItem] = []
         for item in all_items:
             if getattr(item, 'get_type', lambda: '')() == 'Evento':
@@ -290,42 +963,50 @@ class DataManager:
         today_items.sort(key=lambda x: (x.start_time if x.start_time else time(23, 59)))
         return today_items
 
+    def set_item_time_range(self, item: PrioritizedItem, start_time: time, end_time: time, duration: int):
+        """Edita manualmente el horario de un item y lo guarda."""
+        self._touch(item)
+        item.set_duration(duration)
+        item.set_time_range(start_time, end_time)
+        self.index.update(item)
+        self.planner.invalidate(item)
+        self.saveData()
+
     def get_prioritized_tasks(self):
-        """Retorna una lista de tareas ordenadas por prioridad usando Min-Heap."""
-        min_heap = []
-        for task in self.data['tasks']:
-            heapq.heappush(min_heap, task)
-        return [heapq.heappop(min_heap) for _ in range(len(min_heap))]
+        """Retorna una lista de tareas ordenadas por prioridad (fuente ya ordenada)."""
+        return list(self.iter_prioritized('tasks', exclude_status=None))
 
     def get_prioritized_events(self):
-        """Retorna una lista de eventos ordenados por prioridad usando Min-Heap."""
-        min_heap = []
-        for event in self.data['events']:
-            heapq.heappush(min_heap, event)
-        return [heapq.heappop(min_heap) for _ in range(len(min_heap))]
+        """Retorna una lista de eventos ordenados por prioridad (fuente ya ordenada)."""
+        return list(self.iter_prioritized('events', exclude_status=None))
 
     def get_prioritized_lessons(self):
-        """Retorna una lista de lecciones ordenadas por prioridad usando Min-Heap."""
-        min_heap = []
-        for lesson in self.data['lessons']:
-            heapq.heappush(min_heap, lesson)
-        return [heapq.heappop(min_heap) for _ in range(len(min_heap))]
+        """Retorna una lista de lecciones ordenadas por prioridad (fuente ya ordenada)."""
+        return list(self.iter_prioritized('lessons', exclude_status=None))
 
     def get_all_tasks(self):
         """Retorna la lista de todas las tareas ordenadas por prioridad."""
         return self.get_prioritized_tasks()
 
     # --- Estados ---
-    def mark_task_completed(self, index: int) -> bool:
-        if 0 <= index < len(self.data['tasks']):
-            self.data['tasks'][index].status = Status.COMPLETADO
+    def mark_task_completed(self, item_id: int) -> bool:
+        task = self.get_item(item_id, 'tasks')
+        if task is not None:
+            self._touch(task)
+            task.status = Status.COMPLETADO
+            task.completed_date = self.clock.today()
+            self.index.update(task)
             self.saveData()
             return True
         return False
 
-    def mark_lesson_completed(self, index: int) -> bool:
-        if 0 <= index < len(self.data['lessons']):
-            self.data['lessons'][index].status = Status.COMPLETADO
+    def mark_lesson_completed(self, item_id: int) -> bool:
+        lesson = self.get_item(item_id, 'lessons')
+        if lesson is not None:
+            self._touch(lesson)
+            lesson.status = Status.COMPLETADO
+            lesson.completed_date = self.clock.today()
+            self.index.update(lesson)
             self.saveData()
             return True
         return False
@@ -378,7 +1059,8 @@ class DataManager:
                 for task_data in json_data['tasks']:
                     try:
                         task = Task.from_dict(task_data)
-                        self.data['tasks'].append(task)
+                        self._append('tasks', task)
+                        self._touch(task, added=True)
                     except ValueError as e:
                         print(f"Error importando tarea: {e}")
 
@@ -387,7 +1069,8 @@ class DataManager:
                 for event_data in json_data['events']:
                     try:
                         event = Event.from_dict(event_data)
-                        self.data['events'].append(event)
+                        self._append('events', event)
+                        self._touch(event, added=True)
                     except ValueError as e:
                         print(f"Error importando evento: {e}")
 
@@ -409,7 +1092,8 @@ class DataManager:
                                 lesson.notes_file = target_path
                             except Exception as e:
                                 print(f"No se pudo copiar el archivo de notas: {e}")
-                        self.data['lessons'].append(lesson)
+                        self._append('lessons', lesson)
+                        self._touch(lesson, added=True)
                     except ValueError as e:
                         print(f"Error importando lección: {e}")
 
@@ -422,30 +1106,27 @@ class DataManager:
 
     def import_from_file(self, file_path):
         """
-        Importa elementos desde un archivo JSON.
+        Importa elementos desde un archivo JSON (también comprimido, ver Storage.py).
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                json_data = json.load(f)
-                return self.import_from_json(json_data)
-        except json.JSONDecodeError:
+            json_data = Storage.read_file(file_path)
+        except (json.JSONDecodeError, UnicodeDecodeError):
             return False, "El archivo no contiene JSON válido"
         except Exception as e:
             return False, f"Error al leer el archivo: {str(e)}"
+        return self.import_from_json(json_data)
 
     # --- Métodos para Eventos ---
     def addEvent(self, title, description, due_date, time):
         """Agrega un nuevo evento a la lista."""
-        new_event = Event(title, description, due_date, time)
-        self.data['events'].append(new_event)
+        new_event = self._append('events', Event(title, description, due_date, time))
+        self._touch(new_event, added=True)
         self.saveData()
+        return new_event
 
-    def deleteEvent(self, index):
-        if 0 <= index < len(self.data['events']):
-            del self.data['events'][index]
-            self.saveData()
-            return True
-        return False
+    def deleteEvent(self, item_id: int) -> bool:
+        """Elimina un evento por su id."""
+        return self._delete('events', item_id)
 
     def get_all_events(self):
         return self.data['events']
@@ -465,27 +1146,33 @@ class DataManager:
                 saved_notes_file = target_path
             except Exception as e:
                 print(f"No se pudo copiar el archivo de notas: {e}")
-        new_lesson = Lesson(title, notes, due_date, subject, estimated_minutes=estimated_minutes, notes_file=saved_notes_file)
-        self.data['lessons'].append(new_lesson)
+        new_lesson = self._append('lessons', Lesson(title, notes, due_date, subject, estimated_minutes=estimated_minutes,
+                                                    notes_file=saved_notes_file))
+        self._touch(new_lesson, added=True)
         self.saveData()
+        return new_lesson
     
-    def deleteLesson(self, index):
-        if 0 <= index < len(self.data['lessons']):
-            del self.data['lessons'][index]
-            self.saveData()
-            return True
-        return False
+    def deleteLesson(self, item_id: int) -> bool:
+        """Elimina una lección por su id."""
+        return self._delete('lessons', item_id)
     
-    def reviewLesson(self, score, index):
-        if 0 <= index < len(self.data['lessons']):
-            self.data['lessons'][index].review_lesson(score)
+    def reviewLesson(self, score, item_id: int) -> bool:
+        lesson = self.get_item(item_id, 'lessons')
+        if lesson is not None:
+            self._touch(lesson)
+            lesson.review_lesson(score, today=self.clock.today())
+            self.index.update(lesson)
             self.saveData()
             return True
         else:
             print("Hubo un error, no se pudo actualizar.")
+            return False
 
 
 
     def get_all_lessons(self):
         return self.data['lessons']
 
+
+# Spans de tiempo alrededor de cada método público (sin costo si está desactivado)
+instrument_class(DataManager)
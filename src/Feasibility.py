@@ -0,0 +1,99 @@
+# Feasibility.py
+"""
+Análisis de plazos sobre la capacidad libre de los próximos días.
+
+La capacidad es una línea de tiempo en minutos: lo que queda libre hoy (tras los
+eventos) y luego una jornada completa por día. Atendiendo los items por fecha
+límite (EDF, primero el plazo más cercano) y acumulando su duración, el día en
+que termina cada uno sale en O(1) de esa línea, así que el análisis completo es
+O(n log n) por el ordenamiento.
+
+EDF es óptimo cuando el trabajo se puede dividir: si con ese orden un item queda
+atrasado, no existe plan que lo evite. Con el planificador sin división el
+resultado real solo puede ser igual o peor.
+
+    report = analyze(edf_order(items), free_today, day_capacity, today)
+    on_time, late = moore_hodgson(items, free_today, day_capacity, today)
+"""
+
+import heapq
+from datetime import date, timedelta
+from typing import List, Tuple
+
+
+def edf_order(items) -> list:
+    """Items ordenados por fecha límite (estable ante empates)."""
+    return sorted(items, key=lambda item: item.get_priority_date())
+
+
+def capacity_until(day: date, free_today: int, day_capacity: int, today: date) -> int:
+    """Minutos libres acumulados desde ahora hasta el fin de `day`."""
+    if day < today:
+        return 0
+    return free_today + (day - today).days * day_capacity
+
+
+def finish_date(demand: int, free_today: int, day_capacity: int, today: date):
+    """Día en que se completan `demand` minutos de trabajo (None si no hay capacidad)."""
+    if demand <= free_today:
+        return today
+    if day_capacity <= 0:
+        return None
+    return today + timedelta(days=-(-(demand - free_today) // day_capacity))
+
+
+def analyze(sequence, free_today: int, day_capacity: int, today: date) -> dict:
+    """
+    Calcula qué items de `sequence`, atendidos en ese orden, no llegan a su fecha.
+
+    Retorna un diccionario con:
+        feasible: Si todos terminan a tiempo
+        late: [{item, due_date, finish_date, days_late, minutes_short}] en orden de atención
+        max_days_late: Mayor atraso en días
+        demand: Minutos de trabajo totales
+    """
+    late = []
+    demand = 0
+    for item in sequence:
+        demand += item.duration
+        due = item.get_priority_date()
+        available = capacity_until(due, free_today, day_capacity, today)
+        if demand > available:
+            finish = finish_date(demand, free_today, day_capacity, today)
+            late.append({
+                'item': item,
+                'due_date': due,
+                'finish_date': finish,
+                'days_late': (finish - due).days if finish is not None else None,
+                'minutes_short': demand - available
+            })
+    return {
+        'feasible': not late,
+        'late': late,
+        'max_days_late': max((entry['days_late'] or 0 for entry in late), default=0),
+        'demand': demand
+    }
+
+
+def moore_hodgson(items, free_today: int, day_capacity: int, today: date) -> Tuple[List, List]:
+    """
+    Minimiza la cantidad de items atrasados (algoritmo de Moore–Hodgson).
+
+    Recorre en orden EDF; cuando el acumulado supera la capacidad hasta el plazo
+    del item actual, posterga el más largo de los aceptados (un montículo de
+    máximos por duración). Retorna `(a_tiempo, postergados)`, ambos en orden EDF:
+    planificar los primeros antes que los segundos deja la menor cantidad de
+    items fuera de plazo. O(n log n).
+    """
+    accepted = []   # (-duración, posición EDF, item)
+    deferred = []
+    demand = 0
+    for k, item in enumerate(edf_order(items)):
+        heapq.heappush(accepted, (-item.duration, k, item))
+        demand += item.duration
+        if demand > capacity_until(item.get_priority_date(), free_today, day_capacity, today):
+            duration, position, longest = heapq.heappop(accepted)
+            demand += duration
+            deferred.append((position, longest))
+    on_time = [item for _, _, item in sorted(accepted, key=lambda entry: entry[1])]
+    return on_time, [item for _, item in sorted(deferred, key=lambda entry: entry[0])]
@@ -0,0 +1,89 @@
+# FileLock.py
+"""
+Cerrojo de archivo entre procesos.
+
+Usa `fcntl.flock` en Linux/macOS y `msvcrt.locking` en Windows sobre un archivo
+auxiliar `<datos>.lock`, así el archivo de datos puede reemplazarse de forma
+atómica (`os.replace`) mientras el cerrojo sigue tomado.
+
+    with FileLock("base_local.json.lock"):                 # exclusivo (escritura)
+        ...
+    with FileLock("base_local.json.lock", shared=True):    # compartido (lectura)
+        ...
+
+En Windows no hay cerrojos compartidos: `shared=True` toma uno exclusivo.
+"""
+
+import os
+import time as timer
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class LockTimeout(TimeoutError):
+    """No se pudo tomar el cerrojo dentro del tiempo indicado."""
+
+
+class FileLock:
+    """
+    Args:
+        path: Archivo de cerrojo (se crea si no existe)
+        shared: Cerrojo compartido (varios lectores) en vez de exclusivo
+        timeout: Segundos máximos de espera (None = esperar indefinidamente)
+    """
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, path: str, shared: bool = False, timeout: float = 10.0):
+        self.path = path
+        self.shared = shared
+        self.timeout = timeout
+        self._fd = None
+
+    def acquire(self):
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = None if self.timeout is None else timer.monotonic() + self.timeout
+        while True:
+            try:
+                self._lock(fd)
+                self._fd = fd
+                return self
+            except OSError:
+                if deadline is not None and timer.monotonic() >= deadline:
+                    os.close(fd)
+                    raise LockTimeout(f"No se pudo bloquear {self.path} en {self.timeout} s")
+                timer.sleep(self.POLL_INTERVAL)
+
+    def _lock(self, fd):
+        if fcntl is not None:
+            mode = fcntl.LOCK_SH if self.shared else fcntl.LOCK_EX
+            fcntl.flock(fd, mode | fcntl.LOCK_NB)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+
+    def release(self):
+        if self._fd is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    @property
+    def locked(self) -> bool:
+        return self._fd is not None
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, *exc):
+        self.release()
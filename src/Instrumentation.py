@@ -0,0 +1,200 @@
+# Instrumentation.py
+"""
+Instrumentación de los caminos críticos.
+
+Mide con "spans" (intervalos con nombre) cuánto tardan los métodos públicos del
+DataManager y el llenado de las tablas de la GUI. Está desactivada por defecto:
+cada método envuelto solo consulta una bandera antes de llamar al original.
+
+Variables de entorno:
+    PLANIFICADOR_INSTRUMENTACION=1  activa los spans al iniciar
+    PLANIFICADOR_PERFILADOR=1       activa además cProfile al iniciar
+"""
+
+import cProfile
+import functools
+import inspect
+import io
+import os
+import pstats
+import time as timer
+from collections import deque
+
+RECENT_SAMPLES = 256  # Muestras recientes guardadas por span (para percentiles)
+
+
+class SpanStats:
+    """Contadores acumulados y duraciones recientes de un span."""
+    __slots__ = ('name', 'count', 'total', 'max', 'recent')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=RECENT_SAMPLES)
+
+    def record(self, elapsed: float):
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+        self.recent.append(elapsed)
+
+    def to_dict(self) -> dict:
+        recent = sorted(self.recent)
+
+        def pct(p):
+            if not recent:
+                return 0.0
+            return recent[min(len(recent) - 1, int(p / 100 * len(recent)))] * 1000
+
+        return {
+            'name': self.name,
+            'count': self.count,
+            'total_ms': self.total * 1000,
+            'mean_ms': self.total / self.count * 1000 if self.count else 0.0,
+            'p50_ms': pct(50),
+            'p99_ms': pct(99),
+            'max_ms': self.max * 1000
+        }
+
+
+_enabled = os.environ.get('PLANIFICADOR_INSTRUMENTACION', '') not in ('', '0')
+_spans = {}
+_profiler = None
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset():
+    """Borra las estadísticas acumuladas."""
+    _spans.clear()
+
+
+def record(name: str, elapsed: float):
+    stats = _spans.get(name)
+    if stats is None:
+        stats = _spans[name] = SpanStats(name)
+    stats.record(elapsed)
+
+
+def _timed_iteration(name: str, generator):
+    """
+    Recorre `generator` sumando solo el tiempo que pasa dentro de él (no el de
+    quien lo consume) y lo registra al agotarse o cerrarse (p. ej. tras `islice`).
+    """
+    elapsed = 0.0
+    try:
+        while True:
+            start = timer.perf_counter()
+            try:
+                value = next(generator)
+            except StopIteration:
+                return
+            finally:
+                elapsed += timer.perf_counter() - start
+            yield value
+    finally:
+        generator.close()
+        record(name, elapsed)
+
+
+def span(name: str):
+    """
+    Decorador que mide cada llamada a la función bajo el span `name`.
+
+    En un generador, crearlo no cuesta nada: se mide su recorrido (ver `_timed_iteration`).
+    """
+    def decorator(fn):
+        if inspect.isgeneratorfunction(fn):
+            @functools.wraps(fn)
+            def generator_wrapper(*args, **kwargs):
+                if not _enabled:
+                    return fn(*args, **kwargs)
+                return _timed_iteration(name, fn(*args, **kwargs))
+            return generator_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            start = timer.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(name, timer.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def instrument_class(cls, prefix: str = None):
+    """Envuelve con un span cada método público definido en `cls`."""
+    prefix = prefix or cls.__name__
+    for attr, value in list(vars(cls).items()):
+        if attr.startswith('_') or not callable(value) or isinstance(value, (staticmethod, classmethod)):
+            continue
+        setattr(cls, attr, span(f"{prefix}.{attr}")(value))
+    return cls
+
+
+def stats() -> list:
+    """Retorna las estadísticas de cada span, del más costoso al más barato."""
+    return sorted((s.to_dict() for s in _spans.values()), key=lambda d: d['total_ms'], reverse=True)
+
+
+def format_stats() -> str:
+    """Retorna las estadísticas como una tabla de texto."""
+    lines = [f"{'Span':<42}{'Llamadas':>10}{'Total ms':>12}{'Media ms':>11}{'p99 ms':>10}{'Máx ms':>10}"]
+    for s in stats():
+        lines.append(f"{s['name']:<42}{s['count']:>10}{s['total_ms']:>12.2f}"
+                     f"{s['mean_ms']:>11.3f}{s['p99_ms']:>10.3f}{s['max_ms']:>10.3f}")
+    return "\n".join(lines)
+
+
+# --- Perfilador (cProfile) ---
+def profiler_active() -> bool:
+    return _profiler is not None
+
+
+def start_profiler():
+    """Activa cProfile para todo el proceso."""
+    global _profiler
+    if _profiler is None:
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+
+
+def stop_profiler(output_path: str = None, limit: int = 25) -> str:
+    """
+    Detiene cProfile y retorna el resumen de las funciones más costosas.
+
+    Si se indica `output_path`, guarda allí el perfil completo (formato pstats).
+    """
+    global _profiler
+    if _profiler is None:
+        return ""
+    _profiler.disable()
+    if output_path:
+        _profiler.dump_stats(output_path)
+    buffer = io.StringIO()
+    pstats.Stats(_profiler, stream=buffer).sort_stats('cumulative').print_stats(limit)
+    _profiler = None
+    return buffer.getvalue()
+
+
+if os.environ.get('PLANIFICADOR_PERFILADOR', '') not in ('', '0'):
+    enable()
+    start_profiler()
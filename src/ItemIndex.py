@@ -0,0 +1,289 @@
+# ItemIndex.py
+
+import heapq
+from bisect import bisect_left, bisect_right, insort
+from datetime import date
+from typing import Dict, Iterable, Iterator, Set
+
+# Fuente ordenada de cada tipo de item propio (las externas se nombran al agregarlas)
+TYPE_SOURCES = {'Tarea': 'tasks', 'Evento': 'events', 'Lección': 'lessons'}
+
+
+class ItemIndex:
+    """
+    Índices secundarios sobre los items del DataManager.
+
+    Mantiene, para cada item registrado, su identificador agrupado por
+    tipo, estado, asignatura y fecha de prioridad (ordinal), de modo que
+    los filtros se resuelven intersectando conjuntos en vez de recorrer
+    todas las listas.
+
+    Además cada fuente (una por colección, y una por cada fuente externa como
+    el horario compartido) guarda sus claves de orden ordenadas: `iter_sorted`
+    las mezcla de forma perezosa sin armar una lista combinada.
+    """
+    def __init__(self):
+        self.items: Dict[int, object] = {}        # id -> item (los ya construidos)
+        self.by_type: Dict[str, Set[int]] = {}     # 'Tarea' -> ids
+        self.by_status: Dict[object, Set[int]] = {}  # Status (None en eventos) -> ids
+        self.by_subject: Dict[str, Set[int]] = {}  # asignatura -> ids (solo lecciones)
+        self.by_date: Dict[int, Set[int]] = {}     # ordinal de fecha -> ids
+        self._ordinals = []                        # claves de by_date ordenadas
+        self._keys = {}                            # id -> claves indexadas (para poder retirarlo)
+        self._shared_keys = {}                     # tuplas de claves compartidas entre items
+        self.by_source: Dict[str, list] = {}       # fuente -> claves de orden (ver `_order_key`)
+        self._order = {}                           # id -> (fuente, clave de orden)
+        self._unsorted = set()                     # fuentes con claves agregadas fuera de orden
+        # Para ids indexados sin objeto (almacén perezoso): id -> item bajo demanda
+        self.resolver = None
+        # Aviso de cambios: listener(tipo, ordinal) al agregar, quitar o actualizar un id
+        self.listener = None
+
+    @staticmethod
+    def _keys_for(item):
+        """Calcula las claves con las que se indexa un item."""
+        priority_date = item.get_priority_date()
+        if isinstance(priority_date, str):
+            priority_date = date.fromisoformat(priority_date)
+        return (
+            item.get_type(),
+            getattr(item, 'status', None),
+            getattr(item, 'subject', None),
+            priority_date.toordinal() if priority_date else None
+        )
+
+    @staticmethod
+    def _put(mapping, key, item_id):
+        bucket = mapping.get(key)
+        if bucket is None:
+            bucket = mapping[key] = set()
+        bucket.add(item_id)
+
+    @staticmethod
+    def _drop(mapping, key, item_id):
+        bucket = mapping.get(key)
+        if bucket is None:
+            return False
+        bucket.discard(item_id)
+        if not bucket:
+            del mapping[key]
+            return True
+        return False
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, item_id):
+        return item_id in self._keys
+
+    def get(self, item_id):
+        """Retorna el item de `item_id`, construyéndolo si solo estaba indexado."""
+        item = self.items.get(item_id)
+        if item is None and self.resolver is not None and item_id in self._keys:
+            item = self.resolver(item_id)
+        return item
+
+    def priority_ordinal(self, item_id) -> int:
+        """Ordinal de la fecha de prioridad indexada de `item_id`."""
+        return self._keys[item_id][3]
+
+    def status_of(self, item_id):
+        """Estado indexado de `item_id` (None en eventos)."""
+        return self._keys[item_id][1]
+
+    def clear(self):
+        self.items.clear()
+        self.by_type.clear()
+        self.by_status.clear()
+        self.by_subject.clear()
+        self.by_date.clear()
+        self._ordinals.clear()
+        self._keys.clear()
+        self._shared_keys.clear()
+        self.by_source.clear()
+        self._order.clear()
+        self._unsorted.clear()
+
+    def add(self, item, source: str = None):
+        """
+        Registra un item en todos los índices. O(log d) por la lista de fechas.
+
+        `source` es la fuente ordenada del item; por defecto la de su tipo o, si ya
+        estaba registrado, la que tenía.
+        """
+        self.add_keys(item.item_id, self._keys_for(item), item.get_priority_time(), source)
+        self.items[item.item_id] = item
+
+    def add_keys(self, item_id, keys, priority_time: str = "", source: str = None):
+        """
+        Indexa un id con claves ya calculadas `(tipo, estado, asignatura, ordinal)`,
+        sin necesidad de tener el objeto (ver `resolver`).
+        """
+        if item_id in self._keys:
+            if source is None:
+                source = self._order.get(item_id, (None,))[0]
+            self.remove(item_id)
+        # Muchos items comparten claves: guardar una sola tupla por combinación
+        keys = self._shared_keys.setdefault(keys, keys)
+        item_type, status, subject, ordinal = keys
+        self._keys[item_id] = keys
+        self._put(self.by_type, item_type, item_id)
+        self._put(self.by_status, status, item_id)
+        if subject is not None:
+            self._put(self.by_subject, subject, item_id)
+        if self.listener is not None:
+            self.listener(item_type, ordinal)
+        if ordinal is not None:
+            if ordinal not in self.by_date:
+                insort(self._ordinals, ordinal)
+            self._put(self.by_date, ordinal, item_id)
+            self._sort_in(item_id, source or TYPE_SOURCES.get(item_type, item_type),
+                          self._order_key(ordinal, priority_time, item_id))
+
+    # --- Fuentes ordenadas ---
+    @staticmethod
+    def _order_key(ordinal: int, priority_time: str, item_id: int) -> tuple:
+        """Clave de orden equivalente a `PrioritizedItem.priority_key()`."""
+        return (ordinal, 0 if priority_time else 1, priority_time or "", item_id)
+
+    def _sort_in(self, item_id, source: str, key: tuple):
+        # Se agrega al final y la fuente se ordena recién al leerla: armar el índice
+        # de muchos items cuesta un solo sort en vez de un insort por item
+        keys = self.by_source.get(source)
+        if keys is None:
+            keys = self.by_source[source] = []
+        if keys and key < keys[-1]:
+            self._unsorted.add(source)
+        keys.append(key)
+        self._order[item_id] = (source, key)
+
+    def _sort_out(self, item_id):
+        entry = self._order.pop(item_id, None)
+        if entry is None:
+            return
+        source, key = entry
+        keys = self._sorted_keys(source)
+        del keys[bisect_left(keys, key)]
+
+    def _sorted_keys(self, source: str) -> list:
+        keys = self.by_source.get(source, [])
+        if source in self._unsorted:
+            keys.sort()
+            self._unsorted.discard(source)
+        return keys
+
+    def sources(self):
+        """Nombres de las fuentes ordenadas."""
+        return list(self.by_source)
+
+    def iter_sorted(self, sources=None, date_from: date = None, date_to: date = None) -> Iterator[int]:
+        """
+        Recorre los ids de `sources` (todas por defecto) en orden de prioridad,
+        mezclando las fuentes ya ordenadas con `heapq.merge`.
+
+        El rango de fechas (inclusivo) se ubica con búsqueda binaria en cada fuente:
+        solo se tocan las claves del rango, y cada id que se consume cuesta
+        O(log s) para s fuentes. No se deben agregar ni quitar items durante el recorrido.
+        """
+        names = list(self.by_source) if sources is None else self._as_keys(sources)
+        runs = []
+        for name in names:
+            keys = self._sorted_keys(name)
+            lo = bisect_left(keys, (date_from.toordinal(),)) if date_from else 0
+            hi = bisect_left(keys, (date_to.toordinal() + 1,)) if date_to else len(keys)
+            if lo < hi:
+                runs.append(map(keys.__getitem__, range(lo, hi)))
+        if len(runs) == 1:
+            merged = runs[0]
+        else:
+            merged = heapq.merge(*runs)
+        for key in merged:
+            yield key[3]
+
+    def remove(self, item_id):
+        """Retira un item de todos los índices."""
+        keys = self._keys.pop(item_id, None)
+        if keys is None:
+            return
+        item_type, status, subject, ordinal = keys
+        self.items.pop(item_id, None)
+        self._sort_out(item_id)
+        if self.listener is not None:
+            self.listener(item_type, ordinal)
+        self._drop(self.by_type, item_type, item_id)
+        self._drop(self.by_status, status, item_id)
+        if subject is not None:
+            self._drop(self.by_subject, subject, item_id)
+        if ordinal is not None and self._drop(self.by_date, ordinal, item_id):
+            pos = bisect_left(self._ordinals, ordinal)
+            del self._ordinals[pos]
+
+    def update(self, item):
+        """Reindexa un item cuyo estado, asignatura, fecha u hora pudo cambiar."""
+        keys = self._keys_for(item)
+        order = self._order.get(item.item_id)
+        if (self._keys.get(item.item_id) != keys or order is not None
+                and order[1] != self._order_key(keys[3], item.get_priority_time(), item.item_id)):
+            self.add(item)
+        elif self.listener is not None:
+            # Mismas claves, pero pudo cambiar otro dato (p. ej. la duración)
+            self.listener(keys[0], keys[3])
+
+    def _ids_in_date_range(self, date_from, date_to) -> Set[int]:
+        lo = bisect_left(self._ordinals, date_from.toordinal()) if date_from else 0
+        hi = bisect_right(self._ordinals, date_to.toordinal()) if date_to else len(self._ordinals)
+        result = set()
+        for ordinal in self._ordinals[lo:hi]:
+            result |= self.by_date[ordinal]
+        return result
+
+    @staticmethod
+    def _union(mapping, keys: Iterable) -> Set[int]:
+        result = set()
+        for key in keys:
+            result |= mapping.get(key, set())
+        return result
+
+    @staticmethod
+    def _as_keys(value):
+        if isinstance(value, (list, tuple, set, frozenset)):
+            return value
+        return (value,)
+
+    def query(self, item_type=None, status=None, subject=None,
+              date_from: date = None, date_to: date = None,
+              exclude_status=None) -> Set[int]:
+        """
+        Retorna los ids que cumplen todos los filtros indicados.
+
+        `item_type`, `status` y `subject` aceptan un valor o una colección de valores.
+        El rango de fechas es inclusivo y se resuelve con búsqueda binaria sobre los ordinales.
+        """
+        candidates = []
+        if item_type is not None:
+            candidates.append(self._union(self.by_type, self._as_keys(item_type)))
+        if status is not None:
+            candidates.append(self._union(self.by_status, self._as_keys(status)))
+        if subject is not None:
+            candidates.append(self._union(self.by_subject, self._as_keys(subject)))
+        if date_from is not None or date_to is not None:
+            candidates.append(self._ids_in_date_range(date_from, date_to))
+
+        if not candidates:
+            result = set(self._keys)
+        else:
+            # Intersectar empezando por el conjunto más pequeño
+            candidates.sort(key=len)
+            result = set(candidates[0])
+            for other in candidates[1:]:
+                if not result:
+                    break
+                result &= other
+
+        if exclude_status is not None and result:
+            result -= self._union(self.by_status, self._as_keys(exclude_status))
+        return result
+
+    def subjects(self):
+        """Retorna las asignaturas indexadas, ordenadas alfabéticamente."""
+        return sorted(self.by_subject)
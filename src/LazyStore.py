@@ -0,0 +1,244 @@
+# LazyStore.py
+"""
+Almacén perezoso de items sobre un snapshot en memoria mapeada.
+
+En lugar de materializar cada Task/Event/Lesson al abrir el archivo, cada lista
+de `DataManager.data` es una `LazyItemList`: guarda solo el número de registro
+de cada posición (4-8 bytes por item) y construye el objeto la primera vez que
+se accede a él. Los índices secundarios se arman leyendo los campos crudos del
+registro, así que los items completados o lejanos nunca se convierten en objetos
+Python salvo que alguien los pida.
+"""
+
+from array import array
+from bisect import bisect_left
+
+from Snapshot import ID_FIELD, LESSON_COMPLETED, NO_DATE, STATUSES, TASK_COMPLETED
+
+
+class LazyItemList:
+    """
+    Lista de items respaldada por una `RecordSequence` del snapshot.
+
+    Cada posición guarda un código: un número de registro del snapshot (>= 0) o,
+    para los items agregados después de abrirlo, -(k + 1) con k su posición en
+    `self._new`. El id de cada registro viene guardado en el propio registro; una
+    copia ordenada de los ids permite buscar un registro por id con bisección.
+    """
+    def __init__(self, records, on_load=None):
+        self._on_load = on_load
+        self._attach(records, {})
+
+    def _attach(self, records, loaded: dict):
+        self._records = records
+        self._order = array('q', range(len(records)))
+        self._loaded = loaded   # número de registro -> item ya construido
+        self._new = []          # items agregados tras la carga
+        # id de cada registro y la misma información ordenada por id (16 bytes por item)
+        self._record_ids = array('q', (fields[ID_FIELD] for fields in records.iter_raw()))
+        by_id = sorted(range(len(records)), key=self._record_ids.__getitem__)
+        self._sorted_ids = array('q', (self._record_ids[r] for r in by_id))
+        self._sorted_records = array('q', by_id)
+
+    def rebind(self, records, rewritten: bool = True):
+        """
+        Cambia el snapshot de respaldo después de cerrar el anterior.
+
+        Con `rewritten`, `records` viene del snapshot recién escrito desde esta
+        lista (su registro k es la posición k): los items ya construidos se
+        conservan como los mismos objetos y el resto se sigue leyendo sin
+        construir. Si no, es el mismo archivo reabierto y solo cambia el mapeo.
+        """
+        if not rewritten:
+            self._records = records
+            return
+        loaded = {}
+        for position, code in enumerate(self._order):
+            item = self._loaded.get(code) if code >= 0 else self._new[-code - 1]
+            if item is not None:
+                loaded[position] = item
+        self._attach(records, loaded)
+
+    # --- Protocolo de lista ---
+    def __len__(self):
+        return len(self._order)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._resolve(code) for code in self._order[index]]
+        return self._resolve(self._order[index])
+
+    def __delitem__(self, index):
+        code = self._order[index]
+        if code < 0:
+            self._new[-code - 1] = None
+        else:
+            self._loaded.pop(code, None)
+        del self._order[index]
+
+    def __iter__(self):
+        for code in self._order:
+            yield self._resolve(code)
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    def append(self, item):
+        self._new.append(item)
+        self._order.append(-len(self._new))
+
+    def id_at(self, position: int) -> int:
+        """Id del item en `position` sin construirlo."""
+        code = self._order[position]
+        return self._record_ids[code] if code >= 0 else self._new[-code - 1].item_id
+
+    def iter_ids(self):
+        """Ids de cada posición, en orden, sin construir los items."""
+        for code in self._order:
+            yield self._record_ids[code] if code >= 0 else self._new[-code - 1].item_id
+
+    def swap_remove(self, position: int):
+        """
+        Quita la posición en O(1) moviendo a ella el último elemento.
+
+        Retorna el id del elemento movido (None si se quitó el último).
+        """
+        code = self._order[position]
+        if code < 0:
+            self._new[-code - 1] = None
+        else:
+            self._loaded.pop(code, None)
+        last = self._order.pop()
+        if position == len(self._order):
+            return None
+        self._order[position] = last
+        return self.id_at(position)
+
+    def remove_ids(self, item_ids) -> int:
+        """Quita en una pasada las posiciones cuyos ids estén en `item_ids`."""
+        keep = array('q')
+        removed = 0
+        for code in self._order:
+            if code >= 0:
+                item_id = self._record_ids[code]
+            else:
+                item_id = self._new[-code - 1].item_id
+            if item_id in item_ids:
+                if code < 0:
+                    self._new[-code - 1] = None
+                else:
+                    self._loaded.pop(code, None)
+                removed += 1
+            else:
+                keep.append(code)
+        self._order = keep
+        return removed
+
+    def index(self, item) -> int:
+        """Posición de `item` sin materializar el resto de la lista."""
+        record = self.record_of(item.item_id)
+        if record is not None and self._loaded.get(record) is item:
+            return self._order.index(record)
+        for k, new_item in enumerate(self._new):
+            if new_item is item:
+                return self._order.index(-(k + 1))
+        raise ValueError("El item no está en la lista")
+
+    # --- Acceso perezoso ---
+    def record_of(self, item_id):
+        """Número de registro del snapshot que corresponde a `item_id` (o None)."""
+        if item_id is None:
+            return None
+        pos = bisect_left(self._sorted_ids, item_id)
+        if pos < len(self._sorted_ids) and self._sorted_ids[pos] == item_id:
+            return self._sorted_records[pos]
+        return None
+
+    def loaded(self, item_id):
+        """Item del snapshot con `item_id` si ya se construyó (None si no)."""
+        record = self.record_of(item_id)
+        return self._loaded.get(record) if record is not None else None
+
+    def max_id(self) -> int:
+        """Mayor id guardado en el snapshot (0 si está vacío)."""
+        return self._sorted_ids[-1] if self._sorted_ids else 0
+
+    def load(self, record: int):
+        """Construye (una sola vez) el item del registro `record`."""
+        item = self._loaded.get(record)
+        if item is None:
+            item = self._records[record]
+            if self._on_load:
+                self._on_load(item)
+            self._loaded[record] = item
+        return item
+
+    def _resolve(self, code):
+        return self.load(code) if code >= 0 else self._new[-code - 1]
+
+    def raw_completed(self, item_id):
+        """
+        Ordinal de `completed_date` leído del registro sin construir el item.
+
+        Retorna None si el item ya está construido, no es de esta lista o no
+        tiene fecha de completado.
+        """
+        record = self.record_of(item_id)
+        if record is None or record in self._loaded or self._records.kind == 'events':
+            return None
+        position = TASK_COMPLETED if self._records.kind == 'tasks' else LESSON_COMPLETED
+        completed = self._records.raw(record)[position]
+        return completed if completed != NO_DATE else None
+
+    def loaded_count(self) -> int:
+        """Cantidad de items materializados (incluye los agregados)."""
+        return len(self._loaded) + sum(1 for item in self._new if item is not None)
+
+    def iter_entries(self):
+        """
+        Recorre la lista para serializarla sin materializar nada nuevo.
+
+        Produce `(campos_crudos, None)` para registros aún no construidos y
+        `(None, item)` para los demás.
+        """
+        for code in self._order:
+            if code < 0:
+                yield None, self._new[-code - 1]
+            elif code in self._loaded:
+                yield None, self._loaded[code]
+            else:
+                yield self._records.raw(code), None
+
+    @property
+    def snapshot(self):
+        return self._records.snapshot
+
+    def iter_index_keys(self):
+        """
+        Recorre `(id, claves, hora, item)` de cada posición para armar los índices.
+
+        Para los registros sin construir, `item` es None y las claves
+        `(tipo, estado, asignatura, ordinal)` y la hora de prioridad (solo
+        eventos) se leen de los campos crudos.
+        """
+        kind = self._records.kind
+        string = self._records.snapshot.string
+        if len(self._order) == len(self._records) and not self._new:
+            # Caso habitual (recién abierto): recorrer los registros en bloque
+            codes = enumerate(self._records.iter_raw())
+        else:
+            codes = ((code, self._records.raw(code) if code >= 0 else None) for code in self._order)
+        for code, fields in codes:
+            if code < 0 or code in self._loaded:
+                item = self._resolve(code)
+                yield item.item_id, None, None, item
+                continue
+            priority_time = ""
+            if kind == 'tasks':
+                keys = ('Tarea', STATUSES[fields[2]], None, fields[1])
+            elif kind == 'events':
+                keys = ('Evento', None, None, fields[2])
+                priority_time = string(fields[3])
+            else:
+                keys = ('Lección', STATUSES[fields[4]], string(fields[3]), fields[7])
+            yield fields[ID_FIELD], keys, priority_time, None
@@ -22,6 +22,7 @@ class Lesson(PrioritizedItem):
         if estimated_minutes:
             self.duration = int(estimated_minutes)
         self.estimated_minutes = int(estimated_minutes) if estimated_minutes else None
+        self.completed_date = None  # Fecha en que se marcó como completada
 
         # Si es una lección nueva, calcula la primera fecha de repaso
         if next_review_date is None:
@@ -42,7 +43,7 @@ class Lesson(PrioritizedItem):
         """Implementa el método abstracto de PrioritizedItem."""
         return "Lección"
 
-    def review_lesson(self, score):
+    def review_lesson(self, score, today: date = None):
         if score < 3:
             self.repetitions = 0
             self.interval = 1
@@ -63,7 +64,9 @@ class Lesson(PrioritizedItem):
         if score <= 1.3 and self.efactor < 1.3:
             self.efactor = 1.3
 
-        self.next_review_date = date.today() + timedelta(days=self.interval)
+        if today is None:
+            today = self.clock.today()
+        self.next_review_date = today + timedelta(days=self.interval)
         return {
             "efactor": self.efactor,
             "interval": self.interval,
@@ -92,7 +95,8 @@ class Lesson(PrioritizedItem):
             'end_time': self.end_time.strftime('%H:%M') if self.end_time else None,
             'duration': self.duration,
             'estimated_minutes': self.estimated_minutes,
-            'notes_file': self.notes_file
+            'notes_file': self.notes_file,
+            'completed_date': str(self.completed_date) if self.completed_date else None
         }
     
     @staticmethod
@@ -122,5 +126,7 @@ class Lesson(PrioritizedItem):
             lesson.end_time = time(h, m)
         if data.get('duration'):
             lesson.duration = int(data['duration'])
+        if data.get('completed_date'):
+            lesson.completed_date = date.fromisoformat(data['completed_date'])
             
         return lesson
\ No newline at end of file
@@ -0,0 +1,246 @@
+# Optimizer.py
+"""
+Optimizador de búsqueda local sobre el plan voraz.
+
+Parte de la colocación del `Planner` (cada día es una secuencia de items
+empaquetada en sus huecos libres) y prueba movimientos al azar:
+
+- intercambio: dos items cambian de lugar (en el mismo día o entre días)
+- traslado: un item pasa a otra posición de otro día
+
+Solo se aceptan los que no empeoran el puntaje del plan (los empates permiten
+recorrer mesetas), así que en todo momento el plan actual es el mejor encontrado
+y se puede cortar cuando se agota el tiempo.
+El puntaje es la suma del de cada día, y un movimiento solo vuelve a empaquetar
+los (a lo sumo dos) días que toca: evaluar un candidato cuesta O(items del día).
+
+Puntaje (menor es mejor):
+- atraso: días después de la fecha límite
+- preferencias: minutos fuera del bloque preferido según la prioridad
+  (`preferred_task_times` de las preferencias compiladas); las tareas urgentes
+  también cuentan como bien ubicadas dentro de `high_focus_times`
+- fragmentación: minutos libres que quedan sin usar al final de un bloque
+  porque el siguiente item no cabía
+
+Los planes divididos en partes (modo `task_splitting`) no se optimizan.
+"""
+
+import random
+import time as timer
+from datetime import datetime, time, timedelta
+from typing import Dict, List
+
+
+class PlanOptimizer:
+    """
+    Args:
+        planner: Planificador que produjo la colocación (aporta jornada y huecos)
+        preferences: `CompiledPreferences` con bloques y preferencias de productividad
+        seed: Semilla de los movimientos al azar (planes reproducibles)
+    """
+    LATE_WEIGHT = 1000      # por día de atraso
+    PREFERENCE_WEIGHT = 1   # por minuto fuera del bloque preferido
+    FRAGMENT_WEIGHT = 2     # por minuto libre inutilizado entre items
+    CHECK_EVERY = 64        # movimientos entre consultas al reloj
+
+    def __init__(self, planner, preferences, seed: int = 0):
+        self.planner = planner
+        self.preferences = preferences
+        self.random = random.Random(seed)
+
+    # --- Preferencias ---
+    def _preferred_windows(self) -> Dict[str, List[tuple]]:
+        """Ventanas en minutos (ya validadas al compilar las preferencias) por prioridad."""
+        prefs = self.preferences
+        windows = {}
+        for level in ('high_priority', 'medium_priority', 'low_priority'):
+            block = prefs.preferred_block(level)
+            windows[level] = [block] if block else []
+        windows['high_priority'] = windows['high_priority'] + list(prefs.high_focus_times)
+        return windows
+
+    @staticmethod
+    def _level(days_remaining: int) -> str:
+        if days_remaining <= 1:
+            return 'high_priority'
+        if days_remaining <= 3:
+            return 'medium_priority'
+        return 'low_priority'
+
+    # --- Evaluación ---
+    def _pack(self, day_ordinal: int, blocks, seq):
+        """
+        Empaqueta `seq` en `blocks` y retorna `(puntaje, inicios)`, o None si no
+        entra en el día. Prueba dos variantes y se queda con la mejor: la del
+        planificador (cada item a continuación del anterior) y una que deja un
+        hueco para que el item empiece en su bloque preferido si allí cabe entero.
+        """
+        packed = self._pack_variant(day_ordinal, blocks, seq, False)
+        if packed is None:
+            return None
+        aligned = self._pack_variant(day_ordinal, blocks, seq, True)
+        if aligned is not None and aligned[0] < packed[0]:
+            return aligned
+        return packed
+
+    def _pack_variant(self, day_ordinal: int, blocks, seq, align: bool):
+        duration, due, windows = self._duration, self._due, self._windows
+        nblocks = len(blocks)
+        if not seq:
+            return 0, []
+        if not nblocks:
+            return None
+        b = 0
+        cursor, block_end = blocks[0]
+        score = 0
+        starts = []
+        for item in seq:
+            d = duration[item]
+            while cursor + d > block_end:
+                b += 1
+                if b == nblocks:
+                    return None
+                score += self.FRAGMENT_WEIGHT * (block_end - cursor)
+                cursor, block_end = blocks[b]
+            if align:
+                for ws, we in windows[item]:
+                    if cursor >= ws and cursor + d <= we:
+                        break   # ya está dentro de un bloque preferido
+                    if cursor < ws and ws + d <= min(we, block_end):
+                        cursor = ws
+                        break
+            starts.append(cursor)
+            end = cursor + d
+            inside = 0
+            for ws, we in windows[item]:
+                overlap = min(end, we) - max(cursor, ws)
+                if overlap > 0:
+                    inside += overlap
+            score += self.PREFERENCE_WEIGHT * (d - min(d, inside))
+            late = day_ordinal - due[item]
+            if late > 0:
+                score += self.LATE_WEIGHT * late
+            cursor = end
+        return score, starts
+
+    # --- Búsqueda ---
+    def optimize(self, items, now: datetime, time_budget: float = 0.05, max_moves: int = None) -> dict:
+        """
+        Mejora en el lugar los horarios de `items` (ya planificados por el `Planner`).
+
+        Se detiene al agotar `time_budget` segundos o `max_moves` candidatos y deja
+        aplicado el mejor plan encontrado. Retorna estadísticas de la búsqueda.
+        """
+        started = timer.perf_counter()
+        now = now.replace(second=0, microsecond=0)
+        today = now.date()
+        work = [it for it in items if getattr(it, 'get_type', lambda: '')() != 'Evento'
+                and it.planned_date is not None]
+        stats = {'moves': 0, 'accepted': 0, 'initial_score': 0, 'score': 0, 'elapsed': 0.0}
+        if len(work) < 2 or any(it.chunks for it in work):
+            return stats
+
+        level_windows = self._preferred_windows()
+        self._duration = {it: it.duration for it in work}
+        self._due = {it: it.get_priority_date().toordinal() for it in work}
+        self._windows = {it: level_windows[self._level(it.get_days_remaining())] for it in work}
+
+        # Días candidatos: de hoy al último con items o, si es posterior, a la última
+        # fecha límite dentro del horizonte (los días vacíos también reciben items)
+        last = max(max(it.planned_date for it in work),
+                   min(max(it.get_priority_date() for it in work),
+                       today + timedelta(days=self.planner.max_days)))
+        days = [today + timedelta(days=k) for k in range((last - today).days + 1)]
+        work_start = self.planner.WORK_START
+        full_day = [(work_start.hour * 60 + work_start.minute,
+                     work_start.hour * 60 + work_start.minute + self.planner.max_window())]
+        blocks = {day: full_day for day in days}
+        blocks[today] = self.planner.free_blocks_today(items, now)
+        seqs = {day: [] for day in days}
+        for it in sorted(work, key=lambda it: (it.planned_date, it.start_time)):
+            seqs[it.planned_date].append(it)
+        location = {it: it.planned_date for it in work}
+        scores = {}
+        for day in days:
+            packed = self._pack(day.toordinal(), blocks[day], seqs[day])
+            if packed is None:
+                # La colocación no coincide con los huecos (p. ej. editada a mano): no tocar
+                return stats
+            scores[day] = packed[0]
+        total = sum(scores.values())
+        stats['initial_score'] = total
+
+        rand = self.random
+        deadline = started + time_budget if time_budget is not None else None
+        moves = accepted = 0
+        while max_moves is None or moves < max_moves:
+            if moves % self.CHECK_EVERY == 0 and deadline is not None and timer.perf_counter() >= deadline:
+                break
+            moves += 1
+            other_moved = False
+            item = rand.choice(work)
+            day_a = location[item]
+            seq_a = seqs[day_a]
+            i = seq_a.index(item)
+            if rand.random() < 0.5:
+                # Intercambio con otro item
+                other = rand.choice(work)
+                if other is item:
+                    continue
+                day_b = location[other]
+                if day_b == day_a:
+                    new_a = seq_a[:]
+                    j = new_a.index(other)
+                    new_a[i], new_a[j] = new_a[j], new_a[i]
+                    new_b = None
+                else:
+                    new_a = seq_a[:]
+                    new_a[i] = other
+                    new_b = seqs[day_b][:]
+                    new_b[new_b.index(other)] = item
+                    other_moved = True
+            else:
+                # Traslado a otra posición de otro día (o del mismo)
+                day_b = rand.choice(days)
+                if day_b == day_a:
+                    new_a = seq_a[:i] + seq_a[i + 1:]
+                    new_a.insert(rand.randint(0, len(new_a)), item)
+                    new_b = None
+                else:
+                    new_a = seq_a[:i] + seq_a[i + 1:]
+                    new_b = seqs[day_b][:]
+                    new_b.insert(rand.randint(0, len(new_b)), item)
+
+            packed_a = self._pack(day_a.toordinal(), blocks[day_a], new_a)
+            if packed_a is None:
+                continue
+            delta = packed_a[0] - scores[day_a]
+            if new_b is not None:
+                packed_b = self._pack(day_b.toordinal(), blocks[day_b], new_b)
+                if packed_b is None:
+                    continue
+                delta += packed_b[0] - scores[day_b]
+            if delta > 0:
+                continue
+            # Aceptar (los empates también, para moverse por mesetas del puntaje):
+            # el plan actual sigue siendo el mejor encontrado
+            accepted += 1
+            total += delta
+            seqs[day_a], scores[day_a] = new_a, packed_a[0]
+            if new_b is not None:
+                seqs[day_b], scores[day_b] = new_b, packed_b[0]
+                location[item] = day_b
+                if other_moved:
+                    location[other] = day_a
+
+        # Aplicar la mejor colocación a los items
+        for day in days:
+            packed = self._pack(day.toordinal(), blocks[day], seqs[day])
+            for it, start in zip(seqs[day], packed[1]):
+                end = start + self._duration[it]
+                it.start_time = time(start // 60, start % 60)
+                it.end_time = time(end // 60, end % 60)
+                it.planned_date = day
+        stats.update(moves=moves, accepted=accepted, score=total,
+                     elapsed=timer.perf_counter() - started)
+        return stats
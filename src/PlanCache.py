@@ -0,0 +1,62 @@
+# PlanCache.py
+
+from collections import OrderedDict
+
+
+class PlanCache:
+    """
+    Caché memoizada de planes calculados por el DataManager.
+
+    Las claves incluyen la versión de los datos y de las preferencias, por lo que
+    cualquier mutación invalida implícitamente los planes anteriores: dejan de
+    coincidir con la clave actual. Con `version_of` (que extrae de una clave la
+    versión de los datos, que solo crece), al guardar un plan de una versión
+    nueva se descartan en el acto los de versiones anteriores, que ya no pueden
+    acertar; el resto se desaloja por la política LRU.
+    """
+    def __init__(self, max_entries: int = 32, version_of=None):
+        self.max_entries = max_entries
+        self.version_of = version_of
+        self._version = None
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, compute):
+        """Retorna el valor cacheado para `key` o lo calcula con `compute()`."""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+        self.misses += 1
+        value = compute()
+        if self.version_of is not None:
+            self._discard_older(self.version_of(key))
+        self._entries[key] = value
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return value
+
+    def _discard_older(self, version):
+        if self._version is not None and version <= self._version:
+            return
+        self._version = version
+        for key in [k for k in self._entries if self.version_of(k) < version]:
+            del self._entries[key]
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def clear(self):
+        """Vacía la caché sin reiniciar las estadísticas."""
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """Retorna las estadísticas de aciertos y fallos de la caché."""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._entries),
+            'hit_rate': self.hits / total if total else 0.0
+        }
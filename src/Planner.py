@@ -0,0 +1,453 @@
+# Planner.py
+
+import time as timer
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List
+
+
+class Planner:
+    """
+    Planificador incremental de franjas horarias.
+
+    Coloca Tareas y Lecciones en los huecos libres de la jornada (08:00–22:00)
+    respetando los eventos fijos de hoy. Conserva la colocación anterior y, cuando
+    cambia un único item, solo repara el día afectado y los siguientes: los items
+    de días anteriores no se vuelven a colocar. El resultado es idéntico al de
+    recalcular todo el plan desde cero.
+
+    Args:
+        max_days: Horizonte: días hacia adelante en los que se buscan huecos
+        time_budget: Segundos de cómputo máximos por plan (None = sin límite)
+
+    Los items que no se pueden colocar quedan sin horario y se informan en
+    `unschedulable` como pares `(item, motivo)`. `utilization` guarda, por día,
+    la fracción del tiempo libre de la jornada que ocupa el plan.
+
+    En modo dividido (`configure(split=True)`) las tareas y lecciones largas se
+    reparten en partes de al menos `min_chunk` minutos que llenan los huecos en
+    orden, con una pausa de `break_duration` minutos cada `break_frequency`
+    minutos de trabajo seguido. Las partes quedan en `item.chunks` como
+    `[(día, inicio, fin)]` y `start_time`/`end_time`/`planned_date` son los de
+    la primera. Este modo siempre recalcula el plan completo.
+    """
+    WORK_START = time(8, 0)
+    WORK_END = time(22, 0)
+
+    def __init__(self, max_days: int = 365, time_budget: float = 5.0):
+        self.max_days = max_days
+        self.time_budget = time_budget
+        self.reset()
+        self.last_placed = 0  # Colocaciones realizadas en la última llamada
+        self.unschedulable: List[tuple] = []
+        self.utilization: Dict[date, float] = {}
+        self.split = False
+        self.min_chunk = 30
+        self.break_duration = 15
+        self.break_frequency = 120
+
+    def configure(self, split: bool = False, min_chunk: int = 30, break_duration: int = 15,
+                  break_frequency: int = 120, max_days: int = None, time_budget=False):
+        """
+        Activa o desactiva el modo dividido y fija sus parámetros. `max_days` y
+        `time_budget` cambian el horizonte y el tiempo máximo si se indican
+        (`time_budget=None` quita el límite de tiempo).
+        """
+        # Una parte nunca puede superar el trabajo seguido permitido entre pausas
+        if break_frequency:
+            min_chunk = min(min_chunk, break_frequency)
+        settings = (bool(split), max(1, int(min_chunk)), max(0, int(break_duration)),
+                    max(0, int(break_frequency)),
+                    self.max_days if max_days is None else max(1, int(max_days)),
+                    self.time_budget if time_budget is False else time_budget)
+        if settings != (self.split, self.min_chunk, self.break_duration, self.break_frequency,
+                        self.max_days, self.time_budget):
+            (self.split, self.min_chunk, self.break_duration, self.break_frequency,
+             self.max_days, self.time_budget) = settings
+            # La colocación guardada puede haberse cortado con el horizonte o tiempo anteriores
+            self.reset()
+
+    def reset(self):
+        """Olvida la colocación anterior; el próximo plan se calcula completo."""
+        self._context = None                  # (hoy, límite de inicio, eventos de hoy)
+        self._seq = []                        # [(item, duración)] en orden de prioridad
+        self._days: List[date] = []           # día planificado por índice
+        self._day_start: Dict[date, int] = {} # día -> primer índice colocado ese día
+        self._dirty = set()                   # items modificados fuera del planificador
+
+    def invalidate(self, item):
+        """Marca un item cuya hora fue editada para que se vuelva a colocar."""
+        self._dirty.add(item)
+
+    def max_window(self) -> int:
+        """Minutos de la jornada más larga posible: ningún item más largo cabe en un día."""
+        start, end = self.WORK_START, self.WORK_END
+        return (end.hour * 60 + end.minute) - (start.hour * 60 + start.minute)
+
+    @staticmethod
+    def _unplace(item):
+        item.start_time = item.end_time = None
+        item.planned_date = None
+        item.chunks = None
+
+    @staticmethod
+    def _minutes(value: time) -> int:
+        return value.hour * 60 + value.minute
+
+    @staticmethod
+    def _time(minutes: int) -> time:
+        return time(minutes // 60, minutes % 60)
+
+    @staticmethod
+    def _parse_hhmm(value: str) -> time:
+        try:
+            h, m = map(int, value.split(":"))
+            return time(h, m)
+        except Exception:
+            return Planner.WORK_START
+
+    def _event_intervals(self, items, today: date):
+        """Recorre `(evento, inicio, fin)` de los eventos con hora de hoy."""
+        for item in items:
+            if getattr(item, 'get_type', lambda: '')() == 'Evento':
+                event_date = item.get_priority_date()
+                if event_date == today and hasattr(item, 'time') and item.time:
+                    start_dt = datetime.combine(today, self._parse_hhmm(item.time))
+                    end_dt = start_dt + timedelta(minutes=item.duration)
+                    yield item, start_dt.time(), end_dt.time()
+
+    def _place_events(self, items, today: date) -> List[tuple]:
+        """Fija los eventos de hoy y retorna sus intervalos ocupados ordenados."""
+        occupied = []
+        for item, start, end in self._event_intervals(items, today):
+            item.set_time_range(start, end)
+            item.planned_date = today
+            occupied.append((start, end))
+        occupied.sort(key=lambda x: x[0])
+        return occupied
+
+    def free_blocks_today(self, items, now: datetime) -> List[tuple]:
+        """Huecos libres que quedan hoy, en minutos `(inicio, fin)`, sin colocar nada."""
+        now = now.replace(second=0, microsecond=0)
+        start_limit = max(now.time(), self.WORK_START)
+        occupied = [(start, end) for _, start, end in self._event_intervals(items, now.date())]
+        return [(self._minutes(s), self._minutes(e)) for s, e in self._free_blocks(occupied, start_limit)]
+
+    def capacity(self, items, now: datetime) -> tuple:
+        """
+        Minutos libres que quedan hoy (descontando los eventos) y los de una
+        jornada completa, sin colocar nada.
+        """
+        free_today = sum(end - start for start, end in self.free_blocks_today(items, now))
+        return free_today, self.max_window()
+
+    def utilization_of(self, items, now: datetime) -> Dict[date, float]:
+        """Ocupación por día de la colocación actual de `items` (p. ej. tras optimizarla)."""
+        now = now.replace(second=0, microsecond=0)
+        today = now.date()
+        start_limit = max(now.time(), self.WORK_START)
+        occupied = [(start, end) for _, start, end in self._event_intervals(items, today)]
+        seq = [(it, it.duration) for it in items if getattr(it, 'get_type', lambda: '')() != 'Evento']
+        return self._utilization(seq, today, start_limit, occupied)
+
+    def _free_blocks(self, day_occupied, start_limit: time) -> List[tuple]:
+        blocks = []
+        cursor = start_limit
+        for s, e in sorted(day_occupied, key=lambda x: x[0]):
+            if e <= cursor:
+                continue
+            if s > cursor:
+                blocks.append((cursor, min(s, self.WORK_END)))
+            cursor = max(cursor, e)
+            if cursor >= self.WORK_END:
+                break
+        if cursor < self.WORK_END:
+            blocks.append((cursor, self.WORK_END))
+        return [(s, e) for s, e in blocks if s < e]
+
+    def _first_change(self, seq) -> int:
+        """Primer índice en el que la secuencia nueva difiere de la anterior."""
+        old = self._seq
+        limit = min(len(seq), len(old))
+        dirty = self._dirty
+        for i in range(limit):
+            item, duration = seq[i]
+            old_item, old_duration = old[i]
+            if item is not old_item or duration != old_duration or item in dirty:
+                return i
+        return limit
+
+    def plan(self, items, now: datetime) -> None:
+        """Asigna `start_time`, `end_time` y `planned_date` a los items no fijos."""
+        now = now.replace(second=0, microsecond=0)
+        today = now.date()
+        start_limit = max(now.time(), self.WORK_START)
+        occupied_today = self._place_events(items, today)
+        if self.split:
+            self._plan_split([it for it in items if getattr(it, 'get_type', lambda: '')() != 'Evento'],
+                             today, start_limit, occupied_today)
+            return
+
+        # Descartar de entrada (O(1) por item) lo que no cabe en ninguna jornada
+        window = self.max_window()
+        seq = []
+        unschedulable = []
+        for it in items:
+            if getattr(it, 'get_type', lambda: '')() == 'Evento':
+                continue
+            if it.duration > window:
+                self._unplace(it)
+                unschedulable.append((it, f"Dura {it.duration} min y la jornada más larga es de {window} min"))
+            else:
+                seq.append((it, it.duration))
+        self.unschedulable = unschedulable
+        context = (today, start_limit, tuple(occupied_today))
+
+        resume = 0
+        if context == self._context:
+            first = self._first_change(seq)
+            if first == len(seq) == len(self._seq):
+                # Nada cambió: la colocación anterior sigue vigente
+                self._dirty.clear()
+                self.last_placed = 0
+                return
+            if first > 0:
+                # Reparar desde el inicio del día del último item sin cambios
+                resume = self._day_start[self._days[first - 1]]
+
+        old_seq, old_days, old_day_start = self._seq, self._days, self._day_start
+        days = old_days[:resume]
+        day_start = {d: idx for d, idx in old_day_start.items() if idx < resume}
+        day = old_days[resume] if resume else today
+        dirty = self._dirty
+
+        last_day = today + timedelta(days=self.max_days)
+        deadline = None if self.time_budget is None else timer.monotonic() + self.time_budget
+        stop_reason = None
+
+        placed = 0
+        i = resume
+        n = len(seq)
+        entering_new_day = False
+        day_occupied = list(occupied_today) if day == today else []
+        while i < n:
+            if entering_new_day:
+                entering_new_day = False
+                if day > last_day:
+                    stop_reason = f"No hay hueco en los próximos {self.max_days} días"
+                    break
+                if deadline is not None and timer.monotonic() > deadline:
+                    stop_reason = f"Se agotó el tiempo de planificación ({self.time_budget} s)"
+                    break
+                day_occupied = list(occupied_today) if day == today else []
+                # Convergencia: si el resto de la secuencia coincide con el plan
+                # anterior desde este mismo día, su colocación sigue siendo válida
+                j = old_day_start.get(day)
+                if j is not None and n - i == len(old_seq) - j and seq[i:] == old_seq[j:] \
+                        and not any(it in dirty for it, _ in seq[i:]):
+                    shift = i - j
+                    days.extend(old_days[j:])
+                    for d, idx in old_day_start.items():
+                        if idx >= j:
+                            day_start[d] = idx + shift
+                    break
+
+            start = start_limit if day == today else self.WORK_START
+            free_blocks = self._free_blocks(day_occupied, start)
+            if not free_blocks:
+                day = day + timedelta(days=1)
+                entering_new_day = True
+                continue
+            placed_any = False
+            for block_start, block_end in free_blocks:
+                # Mientras quede espacio en este bloque, colocar items
+                cursor_dt = datetime.combine(day, block_start)
+                end_block_dt = datetime.combine(day, block_end)
+                while i < n and cursor_dt + timedelta(minutes=seq[i][1]) <= end_block_dt:
+                    it, duration = seq[i]
+                    end_dt = cursor_dt + timedelta(minutes=duration)
+                    it.set_time_range(cursor_dt.time(), end_dt.time())
+                    it.planned_date = day
+                    it.chunks = None
+                    day_occupied.append((it.start_time, it.end_time))
+                    if day not in day_start:
+                        day_start[day] = i
+                    days.append(day)
+                    cursor_dt = end_dt
+                    i += 1
+                    placed += 1
+                    placed_any = True
+                if i >= n:
+                    break
+            if not placed_any:
+                # No hubo espacio en este día; pasar al siguiente día completo
+                day = day + timedelta(days=1)
+                entering_new_day = True
+
+        if stop_reason is not None:
+            for it, _ in seq[i:]:
+                self._unplace(it)
+                unschedulable.append((it, stop_reason))
+            # Plan truncado: el próximo se calcula completo
+            context = None
+
+        self._context = context
+        self._seq = seq
+        self._days = days
+        self._day_start = day_start
+        self._dirty = set()
+        self.last_placed = placed
+        self.utilization = self._utilization(seq, today, start_limit, occupied_today)
+
+    def iter_placements(self, events, work, now: datetime):
+        """
+        Generador del plan voraz (sin dividir): consume `work` (tareas y lecciones
+        en orden de prioridad, p. ej. extraídas de un heap) de a un item y produce
+        cada item ya colocado, día por día: todo lo de un día sale antes que lo
+        del siguiente, así que quien lo recorre puede detenerse en cuanto aparece
+        un día posterior sin haber consumido el resto.
+
+        Coloca exactamente igual que `plan()`, pero no guarda estado incremental.
+        """
+        now = now.replace(second=0, microsecond=0)
+        today = now.date()
+        start_limit = max(now.time(), self.WORK_START)
+        occupied_today = self._place_events(events, today)
+        window = self.max_window()
+        work = iter(work)
+
+        def next_item():
+            for item in work:
+                if item.duration <= window:
+                    return item
+                self._unplace(item)
+            return None
+
+        pending = next_item()
+        day = today
+        day_occupied = list(occupied_today)
+        while pending is not None:
+            start = start_limit if day == today else self.WORK_START
+            placed_any = False
+            for block_start, block_end in self._free_blocks(day_occupied, start):
+                cursor_dt = datetime.combine(day, block_start)
+                end_block_dt = datetime.combine(day, block_end)
+                while pending is not None and cursor_dt + timedelta(minutes=pending.duration) <= end_block_dt:
+                    end_dt = cursor_dt + timedelta(minutes=pending.duration)
+                    pending.set_time_range(cursor_dt.time(), end_dt.time())
+                    pending.planned_date = day
+                    pending.chunks = None
+                    day_occupied.append((pending.start_time, pending.end_time))
+                    cursor_dt = end_dt
+                    placed_any = True
+                    yield pending
+                    pending = next_item()
+                if pending is None:
+                    return
+            if not placed_any:
+                day = day + timedelta(days=1)
+                day_occupied = []
+
+    def _plan_split(self, seq, today: date, start_limit: time, occupied_today) -> None:
+        """
+        Plan en modo dividido: llena cada hueco libre, en orden de prioridad, con
+        partes de los items (nunca menores que `min_chunk`, salvo un item entero
+        más corto) e intercala pausas. Recorre cada bloque libre una sola vez.
+        """
+        self.reset()
+        last_day = today + timedelta(days=self.max_days)
+        deadline = None if self.time_budget is None else timer.monotonic() + self.time_budget
+        min_chunk, pause, every = self.min_chunk, self.break_duration, self.break_frequency
+        stop_reason = None
+
+        placed = 0
+        i = 0
+        n = len(seq)
+        remaining = seq[0].duration if n else 0
+        chunks = []
+        day = today
+        while i < n:
+            if day > last_day:
+                stop_reason = f"No hay hueco en los próximos {self.max_days} días"
+                break
+            if deadline is not None and timer.monotonic() > deadline:
+                stop_reason = f"Se agotó el tiempo de planificación ({self.time_budget} s)"
+                break
+            if day == today:
+                blocks = self._free_blocks(occupied_today, start_limit)
+            else:
+                blocks = self._free_blocks([], self.WORK_START)
+            worked = 0      # minutos de trabajo seguido desde la última pausa
+            last_end = None
+            for block_start, block_end in blocks:
+                cursor, end = self._minutes(block_start), self._minutes(block_end)
+                if last_end is not None and cursor - last_end >= pause:
+                    worked = 0  # el hueco entre bloques ya sirve de pausa
+                while i < n and cursor < end:
+                    if every and worked >= every:
+                        cursor += pause
+                        worked = 0
+                        continue
+                    room = end - cursor
+                    limit = min(room, every - worked) if every else room
+                    chunk = min(remaining, limit)
+                    if chunk < remaining:
+                        # No dejar un resto menor que el mínimo
+                        chunk = min(chunk, remaining - min_chunk)
+                        if chunk < min_chunk:
+                            if limit == room:
+                                break   # no cabe una parte en este bloque
+                            if worked:
+                                cursor += pause   # adelantar la pausa
+                                worked = 0
+                                continue
+                            # Ni recién descansado se evita un resto corto: aceptarlo
+                            chunk = limit
+                    chunks.append((day, cursor, cursor + chunk))
+                    cursor += chunk
+                    worked += chunk
+                    remaining -= chunk
+                    if remaining == 0:
+                        self._assign_chunks(seq[i], chunks)
+                        placed += 1
+                        i += 1
+                        chunks = []
+                        remaining = seq[i].duration if i < n else 0
+                last_end = min(cursor, end)
+                if i >= n:
+                    break
+            day = day + timedelta(days=1)
+
+        unschedulable = []
+        if stop_reason is not None:
+            for it in seq[i:]:
+                self._unplace(it)
+                unschedulable.append((it, stop_reason))
+        self.unschedulable = unschedulable
+        self.last_placed = placed
+        self.utilization = self._utilization([(it, it.duration) for it in seq[:i]], today, start_limit,
+                                             occupied_today)
+
+    def _assign_chunks(self, item, chunks):
+        first_day, first_start, first_end = chunks[0]
+        item.set_time_range(self._time(first_start), self._time(first_end))
+        item.planned_date = first_day
+        item.chunks = ([(d, self._time(s), self._time(e)) for d, s, e in chunks]
+                       if len(chunks) > 1 else None)
+
+    def _utilization(self, seq, today: date, start_limit: time, occupied_today) -> Dict[date, float]:
+        """Fracción ocupada del tiempo libre de cada día con items planificados."""
+        busy: Dict[date, int] = {}
+        for it, _ in seq:
+            if it.planned_date is None:
+                continue
+            parts = getattr(it, 'chunks', None) or ((it.planned_date, it.start_time, it.end_time),)
+            for day, start, end in parts:
+                busy[day] = busy.get(day, 0) + self._minutes(end) - self._minutes(start)
+        window = self.max_window()
+        free_today = sum(self._minutes(e) - self._minutes(s)
+                         for s, e in self._free_blocks(occupied_today, start_limit))
+        utilization = {}
+        for day, minutes in sorted(busy.items()):
+            available = free_today if day == today else window
+            utilization[day] = min(1.0, minutes / available) if available else 1.0
+        return utilization
@@ -1,5 +1,7 @@
 # PreferencesDialog.py
 
+import copy
+from tkinter import messagebox
 import customtkinter as ctk
 from datetime import datetime
 from UserPreferences import UserPreferences
@@ -22,6 +24,8 @@ class PreferencesDialog(ctk.CTkToplevel):
         self._create_work_hours_section()
         self._create_time_blocks_section()
         self._create_breaks_section()
+        self._create_splitting_section()
+        self._create_reminders_section()
         self._create_meal_times_section()
         self._create_productivity_section()
         self._create_non_working_days_section()
@@ -154,6 +158,46 @@ class PreferencesDialog(ctk.CTkToplevel):
         self.break_frequency.insert(0, str(self.preferences.breaks['frequency']))
         self.break_frequency.pack(side="left", padx=5)
 
+    def _create_splitting_section(self):
+        """Crea la sección de división de tareas largas"""
+        section = self._create_section_header("División de Tareas")
+        
+        frame = ctk.CTkFrame(self.main_frame)
+        frame.pack(fill="x", pady=5)
+        
+        # Activar la división en partes
+        self.split_enabled = ctk.BooleanVar(value=self.preferences.task_splitting['enabled'])
+        ctk.CTkCheckBox(
+            frame,
+            text="Dividir tareas largas en los huecos libres",
+            variable=self.split_enabled
+        ).pack(side="left", padx=5)
+        
+        # Tamaño mínimo de cada parte
+        ctk.CTkLabel(frame, text="Parte mínima (min):").pack(side="left", padx=5)
+        self.split_min_chunk = ctk.CTkEntry(frame, width=50)
+        self.split_min_chunk.insert(0, str(self.preferences.task_splitting['min_chunk']))
+        self.split_min_chunk.pack(side="left", padx=5)
+
+    def _create_reminders_section(self):
+        """Crea la sección de recordatorios"""
+        section = self._create_section_header("Recordatorios")
+        
+        frame = ctk.CTkFrame(self.main_frame)
+        frame.pack(fill="x", pady=5)
+        
+        self.reminders_enabled = ctk.BooleanVar(value=self.preferences.reminders['enabled'])
+        ctk.CTkCheckBox(
+            frame,
+            text="Avisar antes de cada inicio y fecha límite",
+            variable=self.reminders_enabled
+        ).pack(side="left", padx=5)
+        
+        ctk.CTkLabel(frame, text="Anticipación (min):").pack(side="left", padx=5)
+        self.reminders_lead = ctk.CTkEntry(frame, width=50)
+        self.reminders_lead.insert(0, str(self.preferences.reminders['lead_minutes']))
+        self.reminders_lead.pack(side="left", padx=5)
+
     def _create_meal_times_section(self):
         """Crea la sección de horarios de comida"""
         section = self._create_section_header("Horarios de Comida")
@@ -218,6 +262,32 @@ class PreferencesDialog(ctk.CTkToplevel):
                 
             setattr(self, f"{priority}_var", var)
 
+        # Optimización del plan por búsqueda local
+        optimize_frame = ctk.CTkFrame(frame)
+        optimize_frame.pack(fill="x", pady=2)
+        self.optimize_enabled = ctk.BooleanVar(value=self.preferences.scheduling['optimize'])
+        ctk.CTkCheckBox(
+            optimize_frame,
+            text="Optimizar el plan según estas preferencias",
+            variable=self.optimize_enabled
+        ).pack(side="left", padx=5)
+        ctk.CTkLabel(optimize_frame, text="Tiempo (ms):").pack(side="left", padx=5)
+        self.optimize_budget = ctk.CTkEntry(optimize_frame, width=60)
+        self.optimize_budget.insert(0, str(self.preferences.scheduling['optimize_budget_ms']))
+        self.optimize_budget.pack(side="left", padx=5)
+
+        # Límites del planificador: horizonte y tiempo máximo de cálculo
+        limits_frame = ctk.CTkFrame(frame)
+        limits_frame.pack(fill="x", pady=2)
+        ctk.CTkLabel(limits_frame, text="Buscar huecos hasta (días):").pack(side="left", padx=5)
+        self.plan_horizon = ctk.CTkEntry(limits_frame, width=60)
+        self.plan_horizon.insert(0, str(self.preferences.scheduling.get('horizon_days', 365)))
+        self.plan_horizon.pack(side="left", padx=5)
+        ctk.CTkLabel(limits_frame, text="Tiempo máximo (ms, 0 = sin límite):").pack(side="left", padx=5)
+        self.plan_budget = ctk.CTkEntry(limits_frame, width=60)
+        self.plan_budget.insert(0, str(self.preferences.scheduling.get('time_budget_ms', 5000)))
+        self.plan_budget.pack(side="left", padx=5)
+
     def _create_non_working_days_section(self):
         """Crea la sección de días no laborables"""
         section = self._create_section_header("Días No Laborables")
@@ -239,46 +309,69 @@ class PreferencesDialog(ctk.CTkToplevel):
             ).pack(side="left", padx=5)
 
     def _save_preferences(self):
-        """Guarda las preferencias y cierra el diálogo"""
+        """Valida y compila las preferencias; si son correctas, las guarda y cierra el diálogo"""
+        # Se edita una copia: si algo es inválido, las preferencias actuales no cambian
+        prefs = UserPreferences.from_dict(copy.deepcopy(self.preferences.to_dict()))
+        try:
+            self._apply_fields(prefs)
+            prefs.compile()
+        except ValueError as e:  # incluye PreferencesError y números mal escritos
+            messagebox.showerror("Preferencias inválidas", str(e), parent=self)
+            return
+        self.preferences = prefs
+        self.destroy()
+
+    def _apply_fields(self, prefs):
+        """Copia los valores de los campos del diálogo a `prefs`"""
         # Actualizar tamaño de fuente
         try:
-            self.preferences.font_size = int(self.font_size.get())
+            prefs.font_size = int(self.font_size.get())
         except ValueError:
-            self.preferences.font_size = 14  # Valor por defecto si hay error
+            prefs.font_size = 14  # Valor por defecto si hay error
         
         # Actualizar horarios de trabajo
-        self.preferences.work_hours['start'] = self.work_start.get()
-        self.preferences.work_hours['end'] = self.work_end.get()
+        prefs.work_hours['start'] = self.work_start.get()
+        prefs.work_hours['end'] = self.work_end.get()
         
         # Actualizar bloques de tiempo
-        self.preferences.time_blocks['morning']['start'] = self.morning_start.get()
-        self.preferences.time_blocks['morning']['end'] = self.morning_end.get()
-        self.preferences.time_blocks['afternoon']['start'] = self.afternoon_start.get()
-        self.preferences.time_blocks['afternoon']['end'] = self.afternoon_end.get()
-        self.preferences.time_blocks['evening']['start'] = self.evening_start.get()
-        self.preferences.time_blocks['evening']['end'] = self.evening_end.get()
+        prefs.time_blocks['morning']['start'] = self.morning_start.get()
+        prefs.time_blocks['morning']['end'] = self.morning_end.get()
+        prefs.time_blocks['afternoon']['start'] = self.afternoon_start.get()
+        prefs.time_blocks['afternoon']['end'] = self.afternoon_end.get()
+        prefs.time_blocks['evening']['start'] = self.evening_start.get()
+        prefs.time_blocks['evening']['end'] = self.evening_end.get()
         
         # Actualizar pausas
-        self.preferences.breaks['duration'] = int(self.break_duration.get())
-        self.preferences.breaks['frequency'] = int(self.break_frequency.get())
+        prefs.breaks['duration'] = int(self.break_duration.get())
+        prefs.breaks['frequency'] = int(self.break_frequency.get())
+        
+        # Actualizar división de tareas
+        prefs.task_splitting['enabled'] = self.split_enabled.get()
+        prefs.task_splitting['min_chunk'] = int(self.split_min_chunk.get())
+        
+        # Actualizar recordatorios
+        prefs.reminders['enabled'] = self.reminders_enabled.get()
+        prefs.reminders['lead_minutes'] = int(self.reminders_lead.get())
         
         # Actualizar comidas
-        self.preferences.meal_times['lunch']['time'] = self.lunch_time.get()
-        self.preferences.meal_times['lunch']['duration'] = int(self.lunch_duration.get())
-        self.preferences.meal_times['dinner']['time'] = self.dinner_time.get()
-        self.preferences.meal_times['dinner']['duration'] = int(self.dinner_duration.get())
+        prefs.meal_times['lunch']['time'] = self.lunch_time.get()
+        prefs.meal_times['lunch']['duration'] = int(self.lunch_duration.get())
+        prefs.meal_times['dinner']['time'] = self.dinner_time.get()
+        prefs.meal_times['dinner']['duration'] = int(self.dinner_duration.get())
         
         # Actualizar preferencias de productividad
         for priority in ['high_priority', 'medium_priority', 'low_priority']:
             var = getattr(self, f"{priority}_var")
-            self.preferences.productivity_preferences['preferred_task_times'][priority] = var.get()
+            prefs.productivity_preferences['preferred_task_times'][priority] = var.get()
+        prefs.scheduling['optimize'] = self.optimize_enabled.get()
+        prefs.scheduling['optimize_budget_ms'] = int(self.optimize_budget.get())
+        prefs.scheduling['horizon_days'] = int(self.plan_horizon.get())
+        prefs.scheduling['time_budget_ms'] = int(self.plan_budget.get())
         
         # Actualizar días no laborables
-        self.preferences.non_working_days = [
+        prefs.non_working_days = [
             i for i, var in enumerate(self.day_vars) if var.get()
         ]
-        
-        self.destroy()
 
     def get_preferences(self):
         """Retorna las preferencias actualizadas"""
@@ -1,14 +1,21 @@
 from abc import ABC, abstractmethod
 from datetime import date, datetime, time, timedelta
+from Clock import SystemClock
 
 class PrioritizedItem(ABC):
     """Clase base abstracta para elementos priorizables."""
+
+    # Reloj usado para "hoy"/"ahora"; el DataManager inyecta el suyo en cada item
+    clock = SystemClock()
     
     def __init__(self):
         self.start_time = None  # Hora de inicio sugerida
         self.end_time = None    # Hora de finalización sugerida
         self.duration = 60      # Duración predeterminada en minutos
         self.planned_date = None  # Fecha planificada (no persistente)
+        self.chunks = None        # Partes [(día, inicio, fin)] si el plan lo dividió (no persistente)
+        self.item_id = None       # Identificador único en el almacén (lo asigna el DataManager)
+        self.version = 0          # Versión del registro: aumenta con cada cambio guardado
     
     @abstractmethod
     def get_priority_date(self) -> date:
@@ -34,7 +41,7 @@ class PrioritizedItem(ABC):
             self.end_time = end_time
         else:
             # Si no se proporciona end_time, calcular basado en la duración
-            start_dt = datetime.combine(date.today(), start_time)
+            start_dt = datetime.combine(self.clock.today(), start_time)
             end_dt = start_dt + timedelta(minutes=self.duration)
             self.end_time = end_dt.time()
 
@@ -43,25 +50,25 @@ class PrioritizedItem(ABC):
         self.duration = minutes
         if self.start_time:
             # Actualizar end_time basado en la nueva duración
-            start_dt = datetime.combine(date.today(), self.start_time)
+            start_dt = datetime.combine(self.clock.today(), self.start_time)
             end_dt = start_dt + timedelta(minutes=minutes)
             self.end_time = end_dt.time()
 
     def get_suggested_time_slot(self) -> tuple:
         """Retorna una sugerencia de horario basada en el tipo y estado."""
-        today = date.today()
+        today = self.clock.today()
         priority_date = self.get_priority_date()
         
         if priority_date < today:
             # Para elementos vencidos, sugerir el siguiente horario disponible
-            now = datetime.now().time()
+            now = self.clock.now().time()
             if now.hour < 22:  # Si aún hay tiempo hoy
                 start = time(now.hour + 1, 0)
             else:  # Si es muy tarde, programar para mañana temprano
                 start = time(8, 0)
             
             # Calcular hora de finalización
-            start_dt = datetime.combine(date.today(), start)
+            start_dt = datetime.combine(today, start)
             end_dt = start_dt + timedelta(minutes=self.duration)
             return start, end_dt.time()
             
@@ -76,7 +83,7 @@ class PrioritizedItem(ABC):
                 priority_date = date.fromisoformat(priority_date)
             except Exception:
                 return 0
-        return (priority_date - date.today()).days if priority_date else 0
+        return (priority_date - self.clock.today()).days if priority_date else 0
 
     def get_priority_text(self) -> str:
         """Retorna un texto descriptivo de la prioridad."""
@@ -90,6 +97,15 @@ class PrioritizedItem(ABC):
         else:
             return f"{days} DÍAS"
 
+    def priority_key(self) -> tuple:
+        """
+        Clave de orden equivalente a `__lt__`, desempatada por id: con ella el
+        heap extrae los empates siempre en el mismo orden.
+        """
+        priority_time = self.get_priority_time()
+        return (self.get_priority_date(), 0 if priority_time else 1, priority_time or "",
+                self.item_id if self.item_id is not None else 0)
+
     def __lt__(self, other):
         """Permite comparación para el heap basada en fecha y hora."""
         if not isinstance(other, PrioritizedItem):
@@ -0,0 +1,143 @@
+# ProfileManager.py
+"""
+Varios perfiles (usuarios) en un mismo proceso.
+
+Cada perfil es un directorio con su propio archivo de datos y de preferencias:
+
+    <raíz>/<perfil>/base_local.json
+    <raíz>/<perfil>/user_preferences.json
+
+Los `DataManager` se abren al primer uso y se mantienen en una caché LRU: cuando
+se supera la cantidad de perfiles abiertos o el total de items en memoria, se
+cierran los menos usados (cada mutación ya se guardó en disco, así que cerrar un
+perfil es solo soltar su referencia). El horario común (p. ej. `horario.json`)
+se lee y decodifica una sola vez; cada perfil recibe una copia superficial de sus
+eventos, porque el planificador escribe en ellos la colocación de ese perfil.
+
+La caché es segura entre hilos; cada `DataManager` no lo es, así que quien lo
+use desde varios hilos debe serializar el acceso a un mismo perfil.
+"""
+
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import List
+
+import Codec
+import Storage
+from Clock import SystemClock
+from DataManager import DataManager, path_file, preferences_file
+
+PROFILE_NAME = re.compile(r'^[\w.-]+$')
+
+
+class ProfileManager:
+    """
+    Caché LRU de `DataManager`, uno por perfil.
+
+    Args:
+        root_dir: Directorio con un subdirectorio por perfil
+        max_open: Máximo de perfiles abiertos a la vez
+        max_loaded_items: Máximo de items construidos en memoria entre todos los
+            perfiles abiertos (None = sin límite). Es la medida de memoria: cada
+            item cuesta del orden de 1 KB entre el objeto y sus índices.
+        shared_timetable: Archivo JSON cuyos eventos se comparten entre perfiles
+        clock: Reloj común a todos los perfiles
+        **options: Argumentos extra para cada `DataManager` (storage_format, encoding...)
+    """
+    def __init__(self, root_dir: str, max_open: int = 8, max_loaded_items: int = None,
+                 shared_timetable: str = None, clock=None, **options):
+        self.root_dir = root_dir
+        self.max_open = max_open
+        self.max_loaded_items = max_loaded_items
+        self.clock = clock if clock is not None else SystemClock()
+        self.options = options
+        self.shared_items = self._load_shared(shared_timetable) if shared_timetable else ()
+        self._open = OrderedDict()   # perfil -> DataManager, del menos al más usado
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _load_shared(path: str) -> tuple:
+        """
+        Carga los eventos del horario común.
+
+        Reciben ids negativos para no chocar con los de ningún perfil. Estos
+        objetos no se modifican: cada `DataManager` trabaja sobre copias. Solo se
+        comparten eventos: las tareas y lecciones se colocan según el resto del
+        plan de cada usuario y no pueden ser de un único objeto.
+        """
+        events = Codec.decode_events(Storage.read_file(path).get('events', []))
+        for k, event in enumerate(events, start=1):
+            event.item_id = -k
+        return tuple(events)
+
+    def profile_dir(self, name: str) -> str:
+        if not PROFILE_NAME.match(name) or name in ('.', '..'):
+            raise ValueError(f"Nombre de perfil inválido: {name!r}")
+        return os.path.join(self.root_dir, name)
+
+    def profiles(self) -> List[str]:
+        """Perfiles existentes en disco (abiertos o no)."""
+        if not os.path.isdir(self.root_dir):
+            return []
+        return sorted(name for name in os.listdir(self.root_dir)
+                      if os.path.isdir(os.path.join(self.root_dir, name)) and PROFILE_NAME.match(name))
+
+    def get(self, name: str) -> DataManager:
+        """Retorna el `DataManager` del perfil, abriéndolo (y creándolo) si hace falta."""
+        with self._lock:
+            dm = self._open.get(name)
+            if dm is not None:
+                self._open.move_to_end(name)
+                self.hits += 1
+                return dm
+            self.misses += 1
+            directory = self.profile_dir(name)
+            os.makedirs(directory, exist_ok=True)
+            dm = DataManager(file_path=os.path.join(directory, path_file), clock=self.clock,
+                             preferences_path=os.path.join(directory, preferences_file),
+                             shared_items=self.shared_items, **self.options)
+            self._open[name] = dm
+            self._enforce_limits()
+            return dm
+
+    def close(self, name: str) -> bool:
+        """Cierra el perfil (sus datos ya están en disco). Retorna si estaba abierto."""
+        with self._lock:
+            return self._open.pop(name, None) is not None
+
+    def is_open(self, name: str) -> bool:
+        return name in self._open
+
+    def open_profiles(self) -> List[str]:
+        """Perfiles abiertos, del menos al más recientemente usado."""
+        return list(self._open)
+
+    def loaded_items(self) -> int:
+        """Items construidos en memoria entre todos los perfiles abiertos (y el horario común)."""
+        return sum(dm.loaded_item_count() for dm in self._open.values()) + len(self.shared_items)
+
+    def _enforce_limits(self):
+        # Nunca se cierra el perfil recién pedido (el último de la LRU)
+        while len(self._open) > 1 and (len(self._open) > self.max_open or self._over_memory()):
+            self._open.popitem(last=False)
+            self.evictions += 1
+
+    def _over_memory(self) -> bool:
+        return self.max_loaded_items is not None and self.loaded_items() > self.max_loaded_items
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            'open': len(self._open),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / total if total else 0.0,
+            'loaded_items': self.loaded_items(),
+            'shared_items': len(self.shared_items)
+        }
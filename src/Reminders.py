@@ -0,0 +1,217 @@
+# Reminders.py
+"""
+Recordatorios de inicio (horario planificado de hoy) y de vencimiento.
+
+Los avisos pendientes viven en un min-heap ordenado por el momento de aviso y
+hay un único temporizador armado, el del primero: mientras no llegue ese momento
+no se ejecuta nada, tenga el heap diez o diez mil avisos.
+
+    reminders = ReminderScheduler(dm, notify, after=app.after, after_cancel=app.after_cancel)
+    reminders.refresh()   # tras cada cambio de los datos o del plan
+
+`refresh()` compara los avisos que corresponden al plan actual con los
+pendientes y solo toca el heap para los que cambiaron (O(log n) cada uno). Los
+que desaparecen no se buscan dentro del heap: se descartan al salir por arriba
+(borrado perezoso). A medianoche hay un aviso interno que vuelve a calcularlos
+para el nuevo día.
+
+Sin interfaz gráfica, `HeadlessTimer` ofrece el mismo `after`/`after_cancel`
+sobre `sched` y `run()` duerme hasta cada aviso (ver `cli.py recordatorios`).
+"""
+
+import heapq
+import math
+import sched
+import time as timer
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+from Planner import Planner
+
+START = 'inicio'
+DUE = 'vence'
+_NEW_DAY = 'dia'
+
+
+class HeadlessTimer:
+    """`after(ms, callback)` / `after_cancel(handle)` como en Tk, para CLI o demonios."""
+    def __init__(self):
+        self._scheduler = sched.scheduler(timer.monotonic, timer.sleep)
+
+    def after(self, ms: int, callback: Callable):
+        return self._scheduler.enter(ms / 1000, 0, callback)
+
+    def after_cancel(self, handle):
+        try:
+            self._scheduler.cancel(handle)
+        except ValueError:
+            pass   # ya se ejecutó
+
+    def run(self):
+        """Duerme hasta cada temporizador y lo ejecuta; vuelve cuando no queda ninguno."""
+        self._scheduler.run()
+
+
+def describe(reminder: dict) -> str:
+    """Texto de un aviso para mostrarlo al usuario."""
+    item = reminder['item']
+    moment = reminder['at'].strftime('%H:%M')
+    if reminder['kind'] == START:
+        return f"{item.get_type()} '{item.title}' empieza a las {moment}"
+    return f"{item.get_type()} '{item.title}' vence el {reminder['at'].date()}"
+
+
+class ReminderScheduler:
+    """
+    Args:
+        dm: DataManager del que se leen el plan de hoy y las fechas límite
+        notify: Función que recibe cada aviso `{'item', 'kind', 'at', 'notify_at'}`
+        after, after_cancel: Temporizador (p. ej. los de la ventana Tk); por
+            defecto un `HeadlessTimer`
+    """
+    DUE_HORIZON_DAYS = 7   # vencimientos que se agendan por adelantado
+
+    def __init__(self, dm, notify: Callable[[dict], None], after: Callable = None,
+                 after_cancel: Callable = None):
+        self.dm = dm
+        self.notify = notify
+        if after is None:
+            self.timer = HeadlessTimer()
+            after, after_cancel = self.timer.after, self.timer.after_cancel
+        else:
+            self.timer = None
+        self._after = after
+        self._after_cancel = after_cancel
+        self._heap = []                      # (momento de aviso, n, clave)
+        self._pending: Dict[tuple, dict] = {}  # clave -> aviso vigente
+        self._fired = set()                  # claves ya avisadas
+        self._armed = None                   # (handle, momento de aviso) del temporizador
+        self._counter = 0
+        self.fired_count = 0
+
+    # --- Avisos que corresponden al plan actual ---
+    def _settings(self):
+        prefs = self.dm.user_preferences.compiled
+        return prefs.reminders_enabled, timedelta(minutes=prefs.reminder_lead)
+
+    def _collect(self, now: datetime) -> Dict[tuple, dict]:
+        """Avisos futuros por clave `(tipo, id, momento)`."""
+        enabled, lead = self._settings()
+        wanted = {}
+        if not enabled:
+            return wanted
+        today = now.date()
+
+        def add(kind, item, moment):
+            key = (kind, item.item_id, moment)
+            if moment > now and key not in self._fired:
+                wanted[key] = {'item': item, 'kind': kind, 'at': moment, 'notify_at': moment - lead}
+
+        for item in self.dm.get_today_plan():
+            if item.chunks:
+                for day, start, _ in item.chunks:
+                    if day == today:
+                        add(START, item, datetime.combine(today, start))
+            elif item.start_time is not None:
+                add(START, item, datetime.combine(today, item.start_time))
+        horizon = today + timedelta(days=self.DUE_HORIZON_DAYS)
+        for item in self.dm.iter_prioritized(('tasks', 'lessons'), date_from=today, date_to=horizon):
+            add(DUE, item, datetime.combine(item.get_priority_date(), Planner.WORK_START))
+        midnight = datetime.combine(today + timedelta(days=1), datetime.min.time())
+        wanted[(_NEW_DAY, None, midnight)] = {'item': None, 'kind': _NEW_DAY, 'at': midnight,
+                                              'notify_at': midnight}
+        return wanted
+
+    def refresh(self):
+        """Vuelve a calcular los avisos y rearma el temporizador si cambió el primero."""
+        now = self.dm.clock.now()
+        wanted = self._collect(now)
+        for key in list(self._pending):
+            if key not in wanted:
+                del self._pending[key]      # su entrada del heap queda muerta
+        for key, reminder in wanted.items():
+            current = self._pending.get(key)
+            self._pending[key] = reminder
+            if current is None or current['notify_at'] != reminder['notify_at']:
+                self._push(key, reminder['notify_at'])
+        # Olvidar los avisos ya dados de días anteriores
+        self._fired = {key for key in self._fired if key[2].date() >= now.date()}
+        if len(self._heap) > 2 * len(self._pending) + 64:
+            self._compact()
+        self._arm()
+
+    def _push(self, key: tuple, notify_at: datetime):
+        self._counter += 1
+        heapq.heappush(self._heap, (notify_at, self._counter, key))
+
+    def _compact(self):
+        """Reconstruye el heap solo con los vigentes cuando hay demasiadas entradas muertas."""
+        self._heap = [(r['notify_at'], n, key) for n, (key, r) in enumerate(self._pending.items())]
+        self._counter = len(self._heap)
+        heapq.heapify(self._heap)
+
+    def _live(self, entry) -> bool:
+        notify_at, _, key = entry
+        reminder = self._pending.get(key)
+        return reminder is not None and reminder['notify_at'] == notify_at
+
+    # --- Temporizador ---
+    def _arm(self):
+        heap = self._heap
+        while heap and not self._live(heap[0]):
+            heapq.heappop(heap)
+        if not heap:
+            self.cancel()
+            return
+        notify_at = heap[0][0]
+        if self._armed is not None:
+            if self._armed[1] == notify_at:
+                return
+            self._after_cancel(self._armed[0])
+        delay = (notify_at - self.dm.clock.now()).total_seconds() * 1000
+        handle = self._after(max(0, math.ceil(delay)), self._fire)
+        self._armed = (handle, notify_at)
+
+    def cancel(self):
+        """Desarma el temporizador (los avisos quedan pendientes hasta el próximo `refresh`)."""
+        if self._armed is not None:
+            self._after_cancel(self._armed[0])
+            self._armed = None
+
+    def _fire(self):
+        self._armed = None
+        now = self.dm.clock.now()
+        new_day = False
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            entry = heapq.heappop(heap)
+            if not self._live(entry):
+                continue
+            key = entry[2]
+            reminder = self._pending.pop(key)
+            if reminder['kind'] == _NEW_DAY:
+                new_day = True
+                continue
+            self._fired.add(key)
+            self.fired_count += 1
+            self.notify(reminder)
+        if new_day:
+            self.refresh()
+        else:
+            self._arm()
+
+    # --- Consulta ---
+    def upcoming(self) -> List[dict]:
+        """Avisos pendientes ordenados por momento de aviso."""
+        reminders = [r for r in self._pending.values() if r['kind'] != _NEW_DAY]
+        return sorted(reminders, key=lambda r: (r['notify_at'], r['at']))
+
+    def __len__(self):
+        return sum(1 for key in self._pending if key[0] != _NEW_DAY)
+
+    def run(self):
+        """Modo sin interfaz: calcula los avisos y duerme hasta cada uno (Ctrl+C para salir)."""
+        if self.timer is None:
+            raise RuntimeError("run() solo está disponible con el temporizador sin interfaz")
+        self.refresh()
+        self.timer.run()
@@ -0,0 +1,303 @@
+# Snapshot.py
+"""
+Formato binario compacto para abrir rápido almacenes grandes.
+
+Estructura del archivo (little-endian):
+
+    cabecera | tareas | eventos | lecciones | tabla de offsets de strings | blob UTF-8
+
+Cada item se guarda como un registro de ancho fijo: fechas como ordinales de día,
+horas como minutos del día (-1 = sin hora) y textos como índices a una tabla de
+strings deduplicada. El archivo se abre con `mmap` y los registros se decodifican
+solo cuando se accede a ellos. JSON sigue siendo el formato de intercambio.
+"""
+
+import mmap
+import os
+import struct
+from datetime import date, time
+
+from Event import Event
+from Lesson import Lesson
+from Status import Status
+from Task import Task
+
+MAGIC = b'PLSN'
+VERSION = 3
+
+HEADER = struct.Struct('<4sHHIIIIQQQQQ')
+# Todos los registros terminan con id y versión (ver ID_FIELD / VERSION_FIELD)
+# title, due, status, start, end, duration, estimated, completed, id, version
+TASK = struct.Struct('<IiBhhiiiqI')
+# title, description, due, time, start, end, duration, is_fixed, id, version
+EVENT = struct.Struct('<IIiIhhiBqI')
+# title, notes, due, subject, status, efactor, repetitions, next_review, interval,
+# start, end, duration, estimated, notes_file, completed, id, version
+LESSON = struct.Struct('<IIiIBdiiihhiiIiqI')
+OFFSET = struct.Struct('<I')
+
+# Posiciones de los campos que son índices a la tabla de strings
+TASK_STRINGS = (0,)
+EVENT_STRINGS = (0, 1, 3)
+LESSON_STRINGS = (0, 1, 3, 13)
+# Posiciones de otros campos que se leen sin construir el item
+TASK_COMPLETED = 7
+LESSON_COMPLETED = 14
+ID_FIELD = -2
+VERSION_FIELD = -1
+
+NO_STRING = 0xFFFFFFFF
+NO_MINUTE = -1
+NO_NUMBER = -1
+NO_DATE = -1
+
+STATUSES = list(Status)
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+TIMES = [time(m // 60, m % 60) for m in range(24 * 60)]
+
+
+class SnapshotError(ValueError):
+    """El archivo no es un snapshot válido o es de otra versión."""
+
+
+def _minutes(value) -> int:
+    return value.hour * 60 + value.minute if value else NO_MINUTE
+
+
+def _ordinal(value) -> int:
+    if value is None:
+        return NO_DATE
+    if isinstance(value, str):
+        value = date.fromisoformat(value)
+    return value.toordinal()
+
+
+class _StringTable:
+    """Construye la tabla de strings deduplicada durante la escritura."""
+    def __init__(self):
+        self.indexes = {}
+        self.values = []
+
+    def add(self, value) -> int:
+        if value is None:
+            return NO_STRING
+        value = str(value)
+        index = self.indexes.get(value)
+        if index is None:
+            index = self.indexes[value] = len(self.values)
+            self.values.append(value)
+        return index
+
+
+def _entries(items):
+    """Pares `(campos_crudos, item)`; las listas perezosas aportan registros sin construir."""
+    if hasattr(items, 'iter_entries'):
+        return items.iter_entries(), items.snapshot
+    return ((None, item) for item in items), None
+
+
+def _pack_section(items, record: struct.Struct, string_fields, pack_item, strings) -> bytearray:
+    out = bytearray()
+    entries, source = _entries(items)
+    for raw, item in entries:
+        if item is not None:
+            out += pack_item(item)
+        else:
+            # Registro de otro snapshot: copiar los enteros y reubicar sus strings
+            fields = list(raw)
+            for pos in string_fields:
+                fields[pos] = strings.add(source.string(fields[pos]))
+            out += record.pack(*fields)
+    return out
+
+
+def write_snapshot(path: str, data: dict, before_replace=None):
+    """
+    Escribe tareas, eventos y lecciones en `path` de forma atómica.
+
+    `before_replace()` se llama con el archivo temporal ya escrito, justo antes
+    de reemplazar `path`: ahí se cierra el snapshot mapeado del que se copiaron
+    registros (en Windows no se puede reemplazar un archivo mapeado).
+    """
+    strings = _StringTable()
+    s = strings.add
+
+    def pack_task(t):
+        return TASK.pack(s(t.title), _ordinal(t.due_date), STATUS_CODES[t.status],
+                         _minutes(t.start_time), _minutes(t.end_time), int(t.duration),
+                         t.estimated_minutes if t.estimated_minutes else NO_NUMBER,
+                         _ordinal(t.completed_date), t.item_id, t.version)
+
+    def pack_event(e):
+        return EVENT.pack(s(e.title), s(e.description), _ordinal(e.due_date), s(e.time),
+                          _minutes(e.start_time), _minutes(e.end_time), int(e.duration),
+                          1 if e.is_fixed else 0, e.item_id, e.version)
+
+    def pack_lesson(l):
+        return LESSON.pack(s(l.title), s(l.notes), _ordinal(l.due_date), s(l.subject),
+                           STATUS_CODES[l.status], float(l.efactor), int(l.repetitions),
+                           _ordinal(l.next_review_date), int(l.interval),
+                           _minutes(l.start_time), _minutes(l.end_time), int(l.duration),
+                           l.estimated_minutes if l.estimated_minutes else NO_NUMBER,
+                           s(l.notes_file), _ordinal(l.completed_date), l.item_id, l.version)
+
+    tasks = _pack_section(data['tasks'], TASK, TASK_STRINGS, pack_task, strings)
+    events = _pack_section(data['events'], EVENT, EVENT_STRINGS, pack_event, strings)
+    lessons = _pack_section(data['lessons'], LESSON, LESSON_STRINGS, pack_lesson, strings)
+
+    blob = bytearray()
+    offsets = bytearray()
+    for value in strings.values:
+        offsets += OFFSET.pack(len(blob))
+        blob += value.encode('utf-8')
+    offsets += OFFSET.pack(len(blob))
+
+    tasks_off = HEADER.size
+    events_off = tasks_off + len(tasks)
+    lessons_off = events_off + len(events)
+    strtab_off = lessons_off + len(lessons)
+    blob_off = strtab_off + len(offsets)
+    header = HEADER.pack(MAGIC, VERSION, 0, len(data['tasks']), len(data['events']),
+                         len(data['lessons']), len(strings.values),
+                         tasks_off, events_off, lessons_off, strtab_off, blob_off)
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        for chunk in (header, tasks, events, lessons, offsets, blob):
+            f.write(chunk)
+    if before_replace is not None:
+        before_replace()
+    os.replace(tmp_path, path)
+
+
+class RecordSequence:
+    """Secuencia de registros de un tipo que se decodifican al accederlos."""
+    def __init__(self, snapshot, kind: str, record: struct.Struct, offset: int, count: int, decode):
+        self.snapshot = snapshot
+        self.kind = kind
+        self._record = record
+        self._offset = offset
+        self._count = count
+        self._decode = decode
+
+    def __len__(self):
+        return self._count
+
+    def raw(self, index: int) -> tuple:
+        """Campos crudos (enteros) del registro, sin construir el item."""
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        return self._record.unpack_from(self.snapshot.buffer, self._offset + index * self._record.size)
+
+    def iter_raw(self):
+        """Recorre los campos crudos de todos los registros."""
+        end = self._offset + self._count * self._record.size
+        return self._record.iter_unpack(memoryview(self.snapshot.buffer)[self._offset:end])
+
+    def __getitem__(self, index: int):
+        return self._decode(self.raw(index))
+
+    def __iter__(self):
+        decode = self._decode
+        for fields in self.iter_raw():
+            yield decode(fields)
+
+
+class Snapshot:
+    """Snapshot abierto con `mmap`; los strings y registros se decodifican bajo demanda."""
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self.buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Archivo vacío: mmap no admite longitud cero
+            self._file.close()
+            raise SnapshotError(f"Snapshot vacío: {path}")
+        if len(self.buffer) < HEADER.size:
+            self.close()
+            raise SnapshotError(f"Snapshot truncado: {path}")
+        (magic, version, _, n_tasks, n_events, n_lessons, n_strings,
+         tasks_off, events_off, lessons_off, strtab_off, blob_off) = HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise SnapshotError(f"Formato de snapshot no soportado: {path}")
+        self._n_strings = n_strings
+        self._strtab_off = strtab_off
+        self._blob_off = blob_off
+        self._strings = {}
+        self.tasks = RecordSequence(self, 'tasks', TASK, tasks_off, n_tasks, self.decode_task)
+        self.events = RecordSequence(self, 'events', EVENT, events_off, n_events, self.decode_event)
+        self.lessons = RecordSequence(self, 'lessons', LESSON, lessons_off, n_lessons, self.decode_lesson)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if getattr(self, 'buffer', None) is not None:
+            self.buffer.close()
+            self.buffer = None
+        self._file.close()
+
+    def string(self, index: int):
+        """Decodifica (y recuerda) el string `index` de la tabla."""
+        if index == NO_STRING:
+            return None
+        value = self._strings.get(index)
+        if value is None:
+            pos = self._strtab_off + index * OFFSET.size
+            start, end = struct.unpack_from('<II', self.buffer, pos)
+            value = self.buffer[self._blob_off + start:self._blob_off + end].decode('utf-8')
+            self._strings[index] = value
+        return value
+
+    # --- Decodificadores por tipo ---
+    @staticmethod
+    def _restore_times(item, start, end, duration, item_id, version):
+        item.start_time = TIMES[start] if start != NO_MINUTE else None
+        item.end_time = TIMES[end] if end != NO_MINUTE else None
+        item.duration = duration
+        item.item_id = item_id
+        item.version = version
+        return item
+
+    def decode_task(self, fields) -> Task:
+        title, due, status, start, end, duration, estimated, completed, item_id, version = fields
+        task = Task(self.string(title), date.fromordinal(due), STATUSES[status],
+                    estimated_minutes=estimated if estimated != NO_NUMBER else None)
+        if completed != NO_DATE:
+            task.completed_date = date.fromordinal(completed)
+        return self._restore_times(task, start, end, duration, item_id, version)
+
+    def decode_event(self, fields) -> Event:
+        title, description, due, time_str, start, end, duration, is_fixed, item_id, version = fields
+        event = Event(self.string(title), self.string(description),
+                      date.fromordinal(due).isoformat(), self.string(time_str))
+        event.is_fixed = bool(is_fixed)
+        return self._restore_times(event, start, end, duration, item_id, version)
+
+    def decode_lesson(self, fields) -> Lesson:
+        (title, notes, due, subject, status, efactor, repetitions, next_review, interval,
+         start, end, duration, estimated, notes_file, completed, item_id, version) = fields
+        lesson = Lesson(self.string(title), self.string(notes), date.fromordinal(due).isoformat(),
+                        self.string(subject), interval=interval, repetitions=repetitions,
+                        efactor=efactor, next_review_date=date.fromordinal(next_review),
+                        status=STATUSES[status],
+                        estimated_minutes=estimated if estimated != NO_NUMBER else None,
+                        notes_file=self.string(notes_file))
+        if completed != NO_DATE:
+            lesson.completed_date = date.fromordinal(completed)
+        return self._restore_times(lesson, start, end, duration, item_id, version)
+
+
+def load_snapshot(path: str) -> dict:
+    """Lee un snapshot completo y retorna las listas de items de `self.data`."""
+    with Snapshot(path) as snapshot:
+        return {
+            "tasks": list(snapshot.tasks),
+            "events": list(snapshot.events),
+            "lessons": list(snapshot.lessons)
+        }
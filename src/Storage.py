@@ -0,0 +1,99 @@
+# Storage.py
+"""
+Codificaciones del archivo de datos JSON.
+
+    json          JSON con sangría (el formato histórico de `base_local.json`)
+    json-compact  JSON sin sangría y con los acentos sin escapar (`ensure_ascii=False`)
+    gzip          json-compact comprimido con gzip
+    zstd          json-compact comprimido con Zstandard (requiere `zstandard`)
+
+Al leer, la codificación se detecta por los primeros bytes del archivo, así que
+un mismo `DataManager` abre cualquiera de ellas sin configuración. El texto JSON
+compacto se (de)serializa con `Codec.dumps`/`Codec.loads` (orjson si está).
+"""
+
+import gzip
+import json
+import os
+
+import Codec
+
+try:
+    import zstandard
+except ImportError:  # Dependencia opcional
+    zstandard = None
+
+ENCODINGS = ("json", "json-compact", "gzip", "zstd")
+
+GZIP_MAGIC = b'\x1f\x8b'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+class StorageError(ValueError):
+    """Codificación desconocida o no disponible en este entorno."""
+
+
+def available_encodings() -> list:
+    """Codificaciones que se pueden usar con las dependencias instaladas."""
+    return [e for e in ENCODINGS if e != "zstd" or zstandard is not None]
+
+
+def check_encoding(encoding: str):
+    if encoding not in ENCODINGS:
+        raise StorageError(f"Codificación desconocida: {encoding} (opciones: {', '.join(ENCODINGS)})")
+    if encoding == "zstd" and zstandard is None:
+        raise StorageError("La codificación 'zstd' requiere el paquete 'zstandard'")
+
+
+def encode(payload, encoding: str = "json") -> bytes:
+    """Serializa `payload` con la codificación indicada."""
+    check_encoding(encoding)
+    if encoding == "json":
+        return json.dumps(payload, indent=4).encode("utf-8")
+    raw = Codec.dumps(payload)
+    if encoding == "gzip":
+        # mtime=0: el mismo contenido produce siempre los mismos bytes
+        return gzip.compress(raw, compresslevel=GZIP_LEVEL, mtime=0)
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+    return raw
+
+
+def detect_encoding(data: bytes) -> str:
+    """Deduce la codificación de un archivo por sus primeros bytes."""
+    if data.startswith(GZIP_MAGIC):
+        return "gzip"
+    if data.startswith(ZSTD_MAGIC):
+        return "zstd"
+    # JSON en texto: con sangría si después de la primera llave viene un salto de línea
+    head = data[:64].lstrip()
+    return "json" if head[1:2] in (b'\n', b'\r') else "json-compact"
+
+
+def decode(data: bytes):
+    """Deserializa el contenido de un archivo en cualquiera de las codificaciones."""
+    encoding = detect_encoding(data)
+    if encoding == "gzip":
+        data = gzip.decompress(data)
+    elif encoding == "zstd":
+        if zstandard is None:
+            raise StorageError("El archivo está comprimido con zstd y falta el paquete 'zstandard'")
+        data = zstandard.ZstdDecompressor().decompress(data, max_output_size=1 << 31)
+    return Codec.loads(data)
+
+
+def read_file(path: str):
+    """Lee y deserializa `path` detectando su codificación."""
+    with open(path, "rb") as f:
+        return decode(f.read())
+
+
+def write_file(path: str, payload, encoding: str = "json"):
+    """Escribe `payload` en `path` de forma atómica con la codificación indicada."""
+    data = encode(payload, encoding)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
@@ -14,6 +14,7 @@ class Task(PrioritizedItem):
         if estimated_minutes:
             self.duration = int(estimated_minutes)
         self.estimated_minutes = int(estimated_minutes) if estimated_minutes else None
+        self.completed_date = None  # Fecha en que se marcó como completada
 
     def __str__(self):
         return f"Tarea: {self.title} | Estado: {self.status.value} | Fecha Límite: {self.due_date}"
@@ -40,7 +41,8 @@ class Task(PrioritizedItem):
             'start_time': self.start_time.strftime('%H:%M') if self.start_time else None,
             'end_time': self.end_time.strftime('%H:%M') if self.end_time else None,
             'duration': self.duration,
-            'estimated_minutes': self.estimated_minutes
+            'estimated_minutes': self.estimated_minutes,
+            'completed_date': str(self.completed_date) if self.completed_date else None
         }
 
     @staticmethod
@@ -63,6 +65,8 @@ class Task(PrioritizedItem):
                 task.end_time = time(h, m)
             if data.get('duration'):
                 task.duration = int(data['duration'])
+            if data.get('completed_date'):
+                task.completed_date = date.fromisoformat(data['completed_date'])
                 
             return task
         except (ValueError, KeyError) as e:
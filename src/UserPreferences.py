@@ -1,5 +1,98 @@
 # UserPreferences.py
 
+import re
+from typing import FrozenSet, NamedTuple, Optional, Tuple
+
+_HHMM = re.compile(r'^\s*(\d{1,2}):(\d{2})\s*$')
+DAY_MINUTES = 24 * 60
+
+
+class PreferencesError(ValueError):
+    """Una preferencia tiene un valor inválido (p. ej. la hora "24:30")."""
+
+
+def parse_minutes(value, field: str, end: bool = False) -> int:
+    """
+    Minutos desde la medianoche de "HH:MM" (00:00 a 23:59). Si `end` es True
+    también se acepta "24:00", el fin del día.
+    """
+    match = _HHMM.match(value) if isinstance(value, str) else None
+    if match is None:
+        raise PreferencesError(f"{field}: se esperaba una hora HH:MM y se recibió {value!r}")
+    hours, minutes = int(match.group(1)), int(match.group(2))
+    total = hours * 60 + minutes
+    if minutes >= 60 or total > DAY_MINUTES or (total == DAY_MINUTES and not end):
+        raise PreferencesError(f"{field}: {value!r} no es una hora válida")
+    return total
+
+
+def parse_range(start, end, field: str) -> Tuple[int, int]:
+    """Intervalo `(inicio, fin)` en minutos; el fin debe ser posterior al inicio."""
+    interval = parse_minutes(start, f"{field} (inicio)"), parse_minutes(end, f"{field} (fin)", end=True)
+    if interval[1] <= interval[0]:
+        raise PreferencesError(f"{field}: el fin ({end}) debe ser posterior al inicio ({start})")
+    return interval
+
+
+def _number(value, field: str, minimum: int = 0) -> int:
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value != int(value):
+        raise PreferencesError(f"{field}: se esperaba un número entero y se recibió {value!r}")
+    if value < minimum:
+        raise PreferencesError(f"{field}: debe ser al menos {minimum}")
+    return int(value)
+
+
+def _overlaps(start1: int, end1: int, start2: int, end2: int) -> bool:
+    return start1 < end2 and start2 < end1
+
+
+class CompiledPreferences(NamedTuple):
+    """
+    Preferencias validadas con las horas en minutos desde la medianoche.
+
+    Es inmutable y hashable: el DataManager la usa como clave de sus planes
+    memoizados, y las consultas de disponibilidad son comparaciones de enteros.
+    """
+    work_hours: Tuple[int, int]
+    time_blocks: Tuple[Tuple[str, int, int], ...]       # (nombre, inicio, fin)
+    break_duration: int
+    break_frequency: int
+    split_enabled: bool
+    min_chunk: int
+    minimize_late: bool
+    optimize: bool
+    optimize_budget_ms: int
+    plan_horizon_days: int
+    plan_budget_ms: int
+    reminders_enabled: bool
+    reminder_lead: int
+    meals: Tuple[Tuple[int, int], ...]
+    high_focus_times: Tuple[Tuple[int, int], ...]
+    preferred_task_times: Tuple[Tuple[str, str], ...]   # (prioridad, bloque)
+    non_working_days: FrozenSet[int]
+
+    def block(self, name: str) -> Optional[Tuple[int, int]]:
+        """`(inicio, fin)` del bloque `name`, o None si no existe."""
+        for block_name, start, end in self.time_blocks:
+            if block_name == name:
+                return start, end
+        return None
+
+    def preferred_block(self, level: str) -> Optional[Tuple[int, int]]:
+        """Bloque preferido para 'high_priority', 'medium_priority' o 'low_priority'."""
+        return self.block(dict(self.preferred_task_times).get(level, ''))
+
+    def is_working_time(self, minute: int) -> bool:
+        return self.work_hours[0] <= minute <= self.work_hours[1]
+
+    def is_available(self, start: int, duration: int) -> bool:
+        """Si `[start, start + duration)` cae en la jornada y no pisa ninguna comida."""
+        end = start + duration
+        if not (self.is_working_time(start) and self.is_working_time(end)):
+            return False
+        return not any(_overlaps(start, end, meal_start, meal_end) for meal_start, meal_end in self.meals)
+
+
 class UserPreferences:
     def __init__(self):
         # Tamaño de fuente
@@ -24,6 +117,31 @@ class UserPreferences:
             'frequency': 120  # cada 120 minutos
         }
         
+        # División de tareas largas en partes (ver Planner.configure)
+        self.task_splitting = {
+            'enabled': False,
+            'min_chunk': 30  # minutos
+        }
+
+        # Orden del plan: con minimize_late se minimiza la cantidad de tareas atrasadas;
+        # con optimize se mejora el plan por búsqueda local durante optimize_budget_ms.
+        # horizon_days: días hacia adelante en los que se buscan huecos; time_budget_ms:
+        # tiempo máximo de cálculo de cada plan (0 = sin límite). Ver Planner
+        self.scheduling = {
+            'minimize_late': False,
+            'optimize': False,
+            'optimize_budget_ms': 50,
+            'horizon_days': 365,
+            'time_budget_ms': 5000
+        }
+
+        # Recordatorios: aviso lead_minutes antes de cada inicio planificado de hoy
+        # y de cada fecha límite (ver Reminders.py)
+        self.reminders = {
+            'enabled': True,
+            'lead_minutes': 10
+        }
+
         # Comidas
         self.meal_times = {
             'lunch': {'time': '12:00', 'duration': 60},
@@ -43,6 +161,9 @@ class UserPreferences:
         # Días no laborables (0 = Lunes, 6 = Domingo)
         self.non_working_days = [5, 6]  # Por defecto, fin de semana
 
+        # Forma validada en minutos enteros (ver `compile`)
+        self.compiled = self.compile()
+
     def to_dict(self):
         """Convierte las preferencias a un diccionario para guardar"""
         return {
@@ -50,6 +171,9 @@ class UserPreferences:
             'work_hours': self.work_hours,
             'time_blocks': self.time_blocks,
             'breaks': self.breaks,
+            'task_splitting': self.task_splitting,
+            'scheduling': self.scheduling,
+            'reminders': self.reminders,
             'meal_times': self.meal_times,
             'productivity_preferences': self.productivity_preferences,
             'non_working_days': self.non_working_days
@@ -63,46 +187,72 @@ class UserPreferences:
         prefs.work_hours = data.get('work_hours', prefs.work_hours)
         prefs.time_blocks = data.get('time_blocks', prefs.time_blocks)
         prefs.breaks = data.get('breaks', prefs.breaks)
+        prefs.task_splitting = data.get('task_splitting', prefs.task_splitting)
+        prefs.scheduling = data.get('scheduling', prefs.scheduling)
+        prefs.reminders = data.get('reminders', prefs.reminders)
         prefs.meal_times = data.get('meal_times', prefs.meal_times)
         prefs.productivity_preferences = data.get('productivity_preferences', 
                                                 prefs.productivity_preferences)
         prefs.non_working_days = data.get('non_working_days', prefs.non_working_days)
+        prefs.compile()
         return prefs
 
+    def compile(self) -> CompiledPreferences:
+        """
+        Valida las preferencias y las convierte a minutos enteros.
+
+        Se llama al cargarlas y al guardarlas; el resultado queda en `compiled`.
+        Lanza PreferencesError si algún valor es inválido.
+        """
+        try:
+            blocks = tuple((name, *parse_range(block['start'], block['end'], f"Bloque '{name}'"))
+                           for name, block in self.time_blocks.items())
+            meals = tuple(sorted(
+                (start, start + _number(meal['duration'], f"Comida '{name}' (duración)", 1))
+                for name, meal in self.meal_times.items()
+                for start in [parse_minutes(meal['time'], f"Comida '{name}'")]))
+            focus = []
+            for entry in self.productivity_preferences.get('high_focus_times', []):
+                if isinstance(entry, dict):
+                    focus.append(parse_range(entry.get('start'), entry.get('end'), "Horas de concentración"))
+                elif isinstance(entry, str) and '-' in entry:
+                    focus.append(parse_range(*entry.split('-', 1), "Horas de concentración"))
+                else:
+                    raise PreferencesError(f"Horas de concentración: formato inválido {entry!r}")
+            preferred = self.productivity_preferences.get('preferred_task_times', {})
+            days = frozenset(_number(day, "Días no laborables") for day in self.non_working_days)
+            if any(day > 6 for day in days):
+                raise PreferencesError("Días no laborables: deben estar entre 0 (lunes) y 6 (domingo)")
+            compiled = CompiledPreferences(
+                work_hours=parse_range(self.work_hours['start'], self.work_hours['end'], "Horario de trabajo"),
+                time_blocks=blocks,
+                break_duration=_number(self.breaks.get('duration', 15), "Pausas (duración)"),
+                break_frequency=_number(self.breaks.get('frequency', 120), "Pausas (frecuencia)", 1),
+                split_enabled=bool(self.task_splitting.get('enabled', False)),
+                min_chunk=_number(self.task_splitting.get('min_chunk', 30), "Parte mínima", 1),
+                minimize_late=bool(self.scheduling.get('minimize_late', False)),
+                optimize=bool(self.scheduling.get('optimize', False)),
+                optimize_budget_ms=_number(self.scheduling.get('optimize_budget_ms', 50), "Tiempo de optimización"),
+                plan_horizon_days=_number(self.scheduling.get('horizon_days', 365), "Horizonte de planificación", 1),
+                plan_budget_ms=_number(self.scheduling.get('time_budget_ms', 5000), "Tiempo máximo de planificación"),
+                reminders_enabled=bool(self.reminders.get('enabled', True)),
+                reminder_lead=_number(self.reminders.get('lead_minutes', 10), "Anticipación de recordatorios"),
+                meals=meals,
+                high_focus_times=tuple(sorted(focus)),
+                preferred_task_times=tuple(sorted((level, str(name)) for level, name in preferred.items())),
+                non_working_days=days)
+        except (KeyError, TypeError, AttributeError) as e:
+            raise PreferencesError(f"Preferencias incompletas o mal formadas: {e!r}")
+        self.compiled = compiled
+        return compiled
+
     def is_working_time(self, time_str):
         """Verifica si una hora está dentro del horario de trabajo"""
-        return (self.work_hours['start'] <= time_str <= self.work_hours['end'])
+        return self.compiled.is_working_time(parse_minutes(time_str, "Hora", end=True))
 
     def get_available_block(self, start_time, duration):
         """
         Verifica si un bloque de tiempo está disponible
         considerando horarios de comida y descansos
         """
-        end_time = self._add_minutes_to_time(start_time, duration)
-        
-        # Verificar si está en horario de trabajo
-        if not self.is_working_time(start_time) or not self.is_working_time(end_time):
-            return False
-            
-        # Verificar si interfiere con horarios de comida
-        for meal in self.meal_times.values():
-            meal_start = meal['time']
-            meal_end = self._add_minutes_to_time(meal_start, meal['duration'])
-            if self._times_overlap(start_time, end_time, meal_start, meal_end):
-                return False
-                
-        return True
-
-    @staticmethod
-    def _add_minutes_to_time(time_str, minutes):
-        """Añade minutos a una hora en formato string 'HH:MM'"""
-        hours, mins = map(int, time_str.split(':'))
-        total_mins = hours * 60 + mins + minutes
-        new_hours = total_mins // 60
-        new_mins = total_mins % 60
-        return f"{new_hours:02d}:{new_mins:02d}"
-
-    @staticmethod
-    def _times_overlap(start1, end1, start2, end2):
-        """Verifica si dos rangos de tiempo se solapan"""
-        return start1 < end2 and start2 < end1
\ No newline at end of file
+        return self.compiled.is_available(parse_minutes(start_time, "Hora"), duration)
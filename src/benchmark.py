@@ -0,0 +1,395 @@
+# benchmark.py
+"""
+Benchmarks reproducibles del planificador.
+
+Genera semestres sintéticos, fija el reloj con `FixedClock` y mide el costo
+de planificar y de las operaciones más usadas del DataManager. Uso:
+
+    python src/benchmark.py planner --weeks 16 --tasks-per-week 25 --repeat 30
+    python src/benchmark.py suite --sizes 1000,10000 --output resultados.json
+    python src/benchmark.py suite --baseline baseline.json   # detectar regresiones
+    python src/benchmark.py storage --size 100000             # comparar codificaciones
+    python src/benchmark.py codec --size 100000               # to_dict/from_dict vs Codec
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import sys
+import tempfile
+import time as timer
+import tracemalloc
+from datetime import date, datetime, timedelta
+
+import Codec
+import Storage
+from Clock import FixedClock
+from DataManager import DataManager
+from Event import Event
+from Lesson import Lesson
+from Task import Task
+
+SEMESTER_START = date(2025, 8, 4)  # Lunes
+SUBJECTS = ["Cálculo Diferencial", "Química", "Física Mecánica", "Programación",
+            "Álgebra Lineal", "Humanidades", "Inglés", "Microeconomía"]
+TASK_TITLES = ["Taller de {}", "Quiz de {}", "Ensayo de {}", "Parcial de {}",
+               "Investigación para {}", "Lectura de {}"]
+
+
+def generate_dataset(n_tasks: int, n_events: int, n_lessons: int, days: int = 112,
+                     start: date = SEMESTER_START, seed: int = 42) -> dict:
+    """
+    Genera un conjunto de datos sintético con el formato de `base_local.json`.
+
+    Las fechas se reparten uniformemente en `days` días a partir de `start`; los
+    eventos caen en horarios de clase típicos (07:00–20:00).
+    """
+    rng = random.Random(seed)
+    tasks = []
+    for i in range(n_tasks):
+        subject = rng.choice(SUBJECTS)
+        tasks.append({
+            "title": rng.choice(TASK_TITLES).format(subject) + f" #{i}",
+            "due_date": (start + timedelta(days=rng.randrange(days))).isoformat(),
+            "status": "Completado" if rng.random() < 0.2 else "Pendiente",
+            "start_time": None,
+            "end_time": None,
+            "duration": 60,
+            "estimated_minutes": rng.choice([None, 30, 45, 60, 90, 120])
+        })
+    events = []
+    for i in range(n_events):
+        subject = rng.choice(SUBJECTS)
+        hour = rng.randrange(7, 20)
+        events.append({
+            "title": f"{subject.upper()} ({i})",
+            "description": "Clase semanal",
+            "due_date": (start + timedelta(days=rng.randrange(days))).isoformat(),
+            "time": f"{hour:02d}:00",
+            "start_time": f"{hour:02d}:00",
+            "end_time": f"{hour + 2:02d}:00",
+            "duration": 120,
+            "is_fixed": True
+        })
+    lessons = []
+    for i in range(n_lessons):
+        created = start + timedelta(days=rng.randrange(days))
+        lessons.append({
+            "title": f"Lección {i} de {rng.choice(SUBJECTS)}",
+            "notes": "Repasar ejercicios y definiciones",
+            "due_date": created.isoformat(),
+            "subject": rng.choice(SUBJECTS),
+            "status": "Completado" if rng.random() < 0.1 else "Pendiente",
+            "efactor": 2.5,
+            "repetitions": 0,
+            "next_review_date": (created + timedelta(days=1)).isoformat(),
+            "interval": 0,
+            "start_time": None,
+            "end_time": None,
+            "duration": 60,
+            "estimated_minutes": rng.choice([None, 25, 50]),
+            "notes_file": None
+        })
+    return {"tasks": tasks, "events": events, "lessons": lessons}
+
+
+def write_dataset(dataset: dict, directory: str, name: str = "base_local.json") -> str:
+    """Escribe el conjunto de datos en `directory` y retorna la ruta."""
+    path = os.path.join(directory, name)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(dataset, f, indent=4)
+    return path
+
+
+def percentile(samples, pct: float) -> float:
+    """Percentil por rango más cercano de una lista de muestras."""
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered), math.ceil(pct / 100 * len(ordered))) - 1)
+    return ordered[rank]
+
+
+def bench_planner(weeks: int, tasks_per_week: int, events_per_week: int, lessons_per_week: int,
+                  repeat: int, now: datetime, seed: int = 42) -> dict:
+    """Planifica el semestre completo `repeat` veces y mide la latencia de cada plan."""
+    days = weeks * 7
+    dataset = generate_dataset(tasks_per_week * weeks, events_per_week * weeks,
+                               lessons_per_week * weeks, days=days, start=now.date(), seed=seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        dm = DataManager(file_path=write_dataset(dataset, tmp), clock=FixedClock(now))
+        latencies = []
+        placed = 0
+        for _ in range(repeat):
+            dm.planner.reset()  # Medir el plan completo, no la reparación incremental
+            start = timer.perf_counter()
+            items = dm.get_all_prioritized_items()
+            dm.suggest_time_slots(items)
+            latencies.append(timer.perf_counter() - start)
+            placed += dm.planner.last_placed
+    total = sum(latencies)
+    return {
+        "items": len(items),
+        "repeat": repeat,
+        "plans_per_s": repeat / total if total else 0.0,
+        "placements_per_s": placed / total if total else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def measure(operation, setup=None, repeat: int = 3) -> dict:
+    """
+    Mide una operación: mejor tiempo de `repeat` ejecuciones y pico de memoria.
+
+    `setup()` se ejecuta antes de cada medición (fuera del cronómetro) y su
+    resultado se pasa a `operation`. El pico de memoria se toma en una ejecución
+    aparte con `tracemalloc`, para no contaminar los tiempos.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        arg = setup() if setup else None
+        start = timer.perf_counter()
+        operation(arg)
+        best = min(best, timer.perf_counter() - start)
+
+    arg = setup() if setup else None
+    tracemalloc.start()
+    try:
+        operation(arg)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": best, "peak_kb": peak / 1024}
+
+
+def split_size(size: int) -> tuple:
+    """Reparte `size` items en tareas, eventos y lecciones (60/20/20)."""
+    n_events = size // 5
+    n_lessons = size // 5
+    return size - n_events - n_lessons, n_events, n_lessons
+
+
+def bench_suite(sizes, now: datetime, repeat: int = 3, seed: int = 42) -> dict:
+    """Mide los caminos críticos del DataManager para cada tamaño de datos."""
+    results = {}
+    for size in sizes:
+        n_tasks, n_events, n_lessons = split_size(size)
+        dataset = generate_dataset(n_tasks, n_events, n_lessons, start=now.date(), seed=seed)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_dataset(dataset, tmp)
+            clock = FixedClock(now)
+            dm = DataManager(file_path=path, clock=clock)
+            ops = {}
+
+            ops["loadData"] = measure(lambda _: dm.loadData(), repeat=repeat)
+            ops["saveData"] = measure(lambda _: dm.saveData(), repeat=repeat)
+            ops["get_all_prioritized_items"] = measure(
+                lambda _: dm.get_all_prioritized_items(), repeat=repeat)
+
+            def fresh_plan():
+                dm.planner.reset()
+                return dm.get_all_prioritized_items()
+            ops["suggest_time_slots"] = measure(dm.suggest_time_slots, setup=fresh_plan, repeat=repeat)
+
+            def cold_cache():
+                dm.plan_cache.clear()
+                dm.planner.reset()
+            ops["get_items_by_day"] = measure(lambda _: dm.get_items_by_day(), setup=cold_cache, repeat=repeat)
+
+            def empty_manager():
+                target = os.path.join(tmp, "import_target.json")
+                if os.path.exists(target):
+                    os.remove(target)
+                return DataManager(file_path=target, clock=clock)
+            ops["import_from_json"] = measure(lambda target: target.import_from_json(dataset),
+                                              setup=empty_manager, repeat=repeat)
+
+            lessons = dm.data["lessons"]
+            today = clock.today()
+
+            def review_all(_):
+                for i, lesson in enumerate(lessons):
+                    lesson.review_lesson(i % 6, today=today)
+            ops["Lesson.review_lesson"] = measure(review_all, repeat=repeat)
+        results[str(size)] = ops
+    return results
+
+
+def bench_storage(size: int, now: datetime, repeat: int = 3, seed: int = 42) -> dict:
+    """Compara tamaño en disco y tiempos de guardado/carga de cada codificación."""
+    n_tasks, n_events, n_lessons = split_size(size)
+    dataset = generate_dataset(n_tasks, n_events, n_lessons, start=now.date(), seed=seed)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for encoding in Storage.available_encodings():
+            # Un archivo (y su cerrojo y huella de disco) por codificación: si se
+            # compartiera el DataManager, cada guardado vería el archivo "cambiado"
+            path = os.path.join(tmp, f"base_local.{encoding}")
+            Storage.write_file(path, dataset, encoding)
+            dm = DataManager(file_path=path, clock=FixedClock(now), encoding=encoding,
+                             archive_after_days=None)
+            save = measure(lambda _: dm.saveData(), repeat=repeat)
+            load = measure(lambda _: dm.loadData(), repeat=repeat)
+            results[encoding] = {
+                "bytes": os.path.getsize(dm.file_path),
+                "save_seconds": save["seconds"],
+                "load_seconds": load["seconds"],
+                "load_peak_kb": load["peak_kb"]
+            }
+    return results
+
+
+def bench_codec(size: int, now: datetime, repeat: int = 3, seed: int = 42) -> dict:
+    """Compara `to_dict`/`from_dict` por item + json contra la conversión en bloque de Codec."""
+    n_tasks, n_events, n_lessons = split_size(size)
+    dataset = generate_dataset(n_tasks, n_events, n_lessons, start=now.date(), seed=seed)
+    data = Codec.decode_data(dataset)
+    text = Codec.dumps(dataset)
+    classes = {"tasks": Task, "events": Event, "lessons": Lesson}
+
+    def per_item_encode(_):
+        payload = {key: [item.to_dict() for item in data[key]] for key in classes}
+        return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+    def per_item_decode(_):
+        raw = json.loads(text)
+        return {key: [cls.from_dict(d) for d in raw[key]] for key, cls in classes.items()}
+
+    return {
+        "per_item": {
+            "encode": measure(per_item_encode, repeat=repeat),
+            "decode": measure(per_item_decode, repeat=repeat)
+        },
+        "codec": {
+            "encode": measure(lambda _: Codec.dumps(Codec.encode_data(data)), repeat=repeat),
+            "decode": measure(lambda _: Codec.decode_data(Codec.loads(text)), repeat=repeat)
+        }
+    }
+
+
+def compare_with_baseline(results: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Compara los tiempos contra una línea base.
+
+    Retorna las regresiones: operaciones cuyo tiempo supera al de la línea base
+    en más de `tolerance` (fracción, p. ej. 0.25 = 25 %).
+    """
+    regressions = []
+    base_results = baseline.get("results", {})
+    for size, ops in results.items():
+        for name, metrics in ops.items():
+            base = base_results.get(size, {}).get(name)
+            if not base or not base.get("seconds"):
+                continue
+            ratio = metrics["seconds"] / base["seconds"]
+            if ratio > 1 + tolerance:
+                regressions.append({"size": size, "operation": name, "ratio": ratio,
+                                    "seconds": metrics["seconds"], "baseline_seconds": base["seconds"]})
+    return regressions
+
+
+def write_report(results: dict, path: str):
+    """Guarda los resultados en JSON junto con los datos del entorno."""
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created": datetime.now().isoformat(timespec="seconds")
+        },
+        "results": results
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=4)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks del planificador académico")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    planner = sub.add_parser("planner", help="Planifica semestres sintéticos y reporta latencias")
+    planner.add_argument("--weeks", type=int, default=16)
+    planner.add_argument("--tasks-per-week", type=int, default=25)
+    planner.add_argument("--events-per-week", type=int, default=15)
+    planner.add_argument("--lessons-per-week", type=int, default=10)
+    planner.add_argument("--repeat", type=int, default=30)
+    planner.add_argument("--now", default=f"{SEMESTER_START.isoformat()}T07:00",
+                         help="Instante fijo usado como 'ahora' (ISO 8601)")
+    planner.add_argument("--seed", type=int, default=42)
+
+    suite = sub.add_parser("suite", help="Mide los caminos críticos del DataManager")
+    suite.add_argument("--sizes", default="1000,10000,100000",
+                       help="Tamaños separados por coma (p. ej. 1000,10000,100000,1000000)")
+    suite.add_argument("--repeat", type=int, default=3)
+    suite.add_argument("--now", default=f"{SEMESTER_START.isoformat()}T07:00")
+    suite.add_argument("--seed", type=int, default=42)
+    suite.add_argument("--output", default="benchmark_results.json",
+                       help="Archivo JSON donde se guardan los resultados")
+    suite.add_argument("--baseline", help="Resultados previos contra los que comparar")
+    suite.add_argument("--tolerance", type=float, default=0.25,
+                       help="Aumento de tiempo tolerado antes de reportar regresión")
+
+    storage = sub.add_parser("storage", help="Compara las codificaciones del archivo de datos")
+    storage.add_argument("--size", type=int, default=100000)
+    storage.add_argument("--repeat", type=int, default=3)
+    storage.add_argument("--now", default=f"{SEMESTER_START.isoformat()}T07:00")
+    storage.add_argument("--seed", type=int, default=42)
+
+    codec = sub.add_parser("codec", help="Compara la serialización por item con la de Codec")
+    codec.add_argument("--size", type=int, default=100000)
+    codec.add_argument("--repeat", type=int, default=3)
+    codec.add_argument("--now", default=f"{SEMESTER_START.isoformat()}T07:00")
+    codec.add_argument("--seed", type=int, default=42)
+
+    args = parser.parse_args(argv)
+    if args.command == "planner":
+        result = bench_planner(args.weeks, args.tasks_per_week, args.events_per_week,
+                               args.lessons_per_week, args.repeat,
+                               datetime.fromisoformat(args.now), seed=args.seed)
+        print(f"Items planificados: {result['items']} ({result['repeat']} repeticiones)")
+        print(f"Planes/s: {result['plans_per_s']:.2f} | Colocaciones/s: {result['placements_per_s']:.0f}")
+        print(f"p50: {result['p50_ms']:.2f} ms | p99: {result['p99_ms']:.2f} ms")
+    elif args.command == "suite":
+        sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+        results = bench_suite(sizes, datetime.fromisoformat(args.now), repeat=args.repeat, seed=args.seed)
+        for size, ops in results.items():
+            print(f"--- {size} items ---")
+            for name, metrics in ops.items():
+                print(f"{name:<28} {metrics['seconds'] * 1000:>10.2f} ms {metrics['peak_kb']:>12.0f} KB")
+        write_report(results, args.output)
+        print(f"Resultados guardados en {args.output}")
+        if args.baseline:
+            with open(args.baseline, "r", encoding="utf-8") as f:
+                baseline = json.load(f)
+            regressions = compare_with_baseline(results, baseline, args.tolerance)
+            for r in regressions:
+                print(f"REGRESIÓN {r['operation']} ({r['size']} items): "
+                      f"{r['seconds'] * 1000:.2f} ms vs {r['baseline_seconds'] * 1000:.2f} ms (x{r['ratio']:.2f})")
+            if regressions:
+                return 1
+            print("Sin regresiones respecto a la línea base.")
+    elif args.command == "storage":
+        results = bench_storage(args.size, datetime.fromisoformat(args.now), repeat=args.repeat,
+                                seed=args.seed)
+        base = results["json"]["bytes"]
+        print(f"{'Codificación':<14}{'Tamaño KB':>12}{'Relativo':>10}{'Guardar ms':>12}{'Cargar ms':>12}")
+        for encoding, m in results.items():
+            print(f"{encoding:<14}{m['bytes'] / 1024:>12.0f}{m['bytes'] / base:>10.2f}"
+                  f"{m['save_seconds'] * 1000:>12.1f}{m['load_seconds'] * 1000:>12.1f}")
+    elif args.command == "codec":
+        results = bench_codec(args.size, datetime.fromisoformat(args.now), repeat=args.repeat,
+                              seed=args.seed)
+        print(f"{args.size} registros (JSON: {Codec.JSON_BACKEND})")
+        for op in ("encode", "decode"):
+            before = results["per_item"][op]["seconds"]
+            after = results["codec"][op]["seconds"]
+            print(f"{op:<8} por item: {before * 1000:>9.1f} ms | Codec: {after * 1000:>9.1f} ms "
+                  f"| x{before / after:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+# cli.py
+"""
+Línea de comandos del planificador (sin interfaz gráfica).
+
+    python src/cli.py rendimiento --repeticiones 20
+    python src/cli.py historial --tipo Tarea --desde 2025-08-01
+    python src/cli.py conflictos --desde 2025-09-01 --hasta 2025-12-31
+    python src/cli.py recordatorios --esperar
+    python src/cli.py servir --puerto 8765
+"""
+
+import argparse
+import sys
+from datetime import date
+
+import Instrumentation
+from DataManager import DataManager, path_file
+
+
+def refresh_cycle(dm: DataManager):
+    """Reproduce lo que hace la GUI al refrescar todas las vistas."""
+    dm.get_unschedulable()
+    dm.get_today_plan()
+    dm.get_items_by_day()
+    dm.get_all_tasks()
+    dm.get_all_events()
+    dm.get_all_lessons()
+
+
+def cmd_rendimiento(args) -> int:
+    """Ejecuta ciclos de refresco con instrumentación y muestra los spans."""
+    Instrumentation.enable()
+    if args.perfil:
+        Instrumentation.start_profiler()
+    dm = DataManager(file_path=args.archivo)
+    for _ in range(args.repeticiones):
+        refresh_cycle(dm)
+        if args.sin_cache:
+            dm.plan_cache.clear()
+            dm.planner.reset()
+    print(Instrumentation.format_stats())
+    print(f"\nCaché de planes: {dm.plan_cache_stats()}")
+    if args.perfil:
+        print()
+        print(Instrumentation.stop_profiler(args.perfil))
+        print(f"Perfil completo guardado en {args.perfil}")
+    return 0
+
+
+def cmd_historial(args) -> int:
+    """Lista los items completados que ya pasaron al archivo."""
+    dm = DataManager(file_path=args.archivo)
+    if args.archivar is not None:
+        moved = dm.archive_completed(args.archivar)
+        print(f"Archivados ahora: {moved}")
+    records = dm.query_archive(item_type=args.tipo, date_from=args.desde, date_to=args.hasta,
+                               text=args.texto)
+    for record in records[:args.limite]:
+        item = record["item"]
+        print(f"{record['completed_date']}  {item.get_type():<8} {item.title}")
+    stats = dm.archive_stats()
+    print(f"\n{len(records)} resultado(s). Archivo: {stats['tasks']} tareas, "
+          f"{stats['lessons']} lecciones, {stats['bytes']} bytes")
+    return 0
+
+
+def cmd_conflictos(args) -> int:
+    """Lista los eventos que se solapan, agrupados por día y franja."""
+    dm = DataManager(file_path=args.archivo)
+    conflicts = dm.get_conflicts(date_from=args.desde, date_to=args.hasta)
+    for conflict in conflicts[:args.limite]:
+        start, end = conflict['start'].strftime('%H:%M'), conflict['end'].strftime('%H:%M')
+        print(f"{conflict['date']}  {start}-{end}")
+        for event in conflict['items']:
+            print(f"    {event.time}  {event.duration:>4} min  {event.title}")
+    print(f"\n{len(conflicts)} choque(s) de horario")
+    return 0
+
+
+def cmd_recordatorios(args) -> int:
+    """Lista los próximos recordatorios o queda esperando para avisarlos."""
+    from Reminders import ReminderScheduler, describe
+
+    dm = DataManager(file_path=args.archivo)
+
+    def notify(reminder):
+        print(f"[{dm.clock.now():%H:%M}] {describe(reminder)}", flush=True)
+
+    reminders = ReminderScheduler(dm, notify)
+    if not args.esperar:
+        reminders.refresh()
+        for reminder in reminders.upcoming():
+            print(f"{reminder['notify_at']:%Y-%m-%d %H:%M}  {describe(reminder)}")
+        print(f"\n{len(reminders)} recordatorio(s) pendiente(s)")
+        return 0
+    print("Esperando recordatorios (Ctrl+C para salir)...", flush=True)
+    try:
+        reminders.run()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def cmd_servir(args) -> int:
+    """Expone el DataManager como API HTTP/JSON local."""
+    from ApiServer import serve
+    serve(DataManager(file_path=args.archivo), host=args.host, port=args.puerto,
+          verbose=args.verbose)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Planificador académico (línea de comandos)")
+    parser.add_argument("--archivo", default=path_file, help="Archivo de datos JSON")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rendimiento = sub.add_parser("rendimiento", help="Muestra estadísticas de los spans de tiempo")
+    rendimiento.add_argument("--repeticiones", type=int, default=10,
+                             help="Ciclos de refresco a medir")
+    rendimiento.add_argument("--sin-cache", action="store_true",
+                             help="Vaciar la caché de planes entre ciclos")
+    rendimiento.add_argument("--perfil", metavar="ARCHIVO",
+                             help="Activar cProfile y guardar el perfil en ARCHIVO")
+    rendimiento.set_defaults(func=cmd_rendimiento)
+
+    historial = sub.add_parser("historial", help="Consulta el archivo de items completados")
+    historial.add_argument("--tipo", choices=["Tarea", "Lección"], help="Filtrar por tipo")
+    historial.add_argument("--desde", type=date.fromisoformat, help="Completados desde (YYYY-MM-DD)")
+    historial.add_argument("--hasta", type=date.fromisoformat, help="Completados hasta (YYYY-MM-DD)")
+    historial.add_argument("--texto", help="Buscar en el título")
+    historial.add_argument("--limite", type=int, default=50, help="Máximo de filas a mostrar")
+    historial.add_argument("--archivar", type=int, metavar="DIAS",
+                           help="Archivar antes los completados hace más de DIAS días")
+    historial.set_defaults(func=cmd_historial)
+
+    conflictos = sub.add_parser("conflictos", help="Lista los eventos que se solapan")
+    conflictos.add_argument("--desde", type=date.fromisoformat, help="Desde la fecha (YYYY-MM-DD)")
+    conflictos.add_argument("--hasta", type=date.fromisoformat, help="Hasta la fecha (YYYY-MM-DD)")
+    conflictos.add_argument("--limite", type=int, default=50, help="Máximo de choques a mostrar")
+    conflictos.set_defaults(func=cmd_conflictos)
+
+    recordatorios = sub.add_parser("recordatorios", help="Muestra o espera los recordatorios")
+    recordatorios.add_argument("--esperar", action="store_true",
+                               help="Quedar en primer plano y avisar cada recordatorio a su hora")
+    recordatorios.set_defaults(func=cmd_recordatorios)
+
+    servir = sub.add_parser("servir", help="Inicia la API HTTP/JSON local")
+    servir.add_argument("--host", default="127.0.0.1", help="Dirección (por defecto solo local)")
+    servir.add_argument("--puerto", type=int, default=8765)
+    servir.add_argument("--verbose", action="store_true", help="Registrar cada petición")
+    servir.set_defaults(func=cmd_servir)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
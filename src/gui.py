@@ -1,5 +1,6 @@
 # gui.py
 
+from datetime import timedelta
 import tkinter as tk
 from tkinter import ttk, messagebox
 import customtkinter as ctk
@@ -8,6 +9,12 @@ from dialogs import AddTaskDialog, AddEventDialog, AddLessonDialog, ReviewScoreD
 from TimeRangeDialog import TimeRangeDialog
 from ImportDialog import ImportDialog
 from PreferencesDialog import PreferencesDialog
+from Status import Status
+from Reminders import ReminderScheduler, describe
+import Instrumentation
+from Instrumentation import span
+
+SYNC_INTERVAL_MS = 5000  # Cada cuánto se buscan cambios guardados por otro proceso
 
 class App(ctk.CTk):
     """
@@ -23,10 +30,24 @@ class App(ctk.CTk):
         ctk.set_default_color_theme("blue")  # Opciones: "blue", "green", "dark-blue"
         
         self.dm = DataManager()
+        # Un único temporizador de Tk armado para el próximo recordatorio
+        self.reminders = ReminderScheduler(self.dm, self._show_reminder,
+                                           after=self.after, after_cancel=self.after_cancel)
         
         self._setup_treeview_style()
         self.setup_ui()
+        self.after(SYNC_INTERVAL_MS, self._poll_external_changes)
+
+    def _poll_external_changes(self):
+        """Trae los cambios de otros procesos (p. ej. un script o la API) y refresca."""
+        if self.dm.sync():
+            self.refresh_all_views()
+        self.after(SYNC_INTERVAL_MS, self._poll_external_changes)
 
+    def _show_reminder(self, reminder):
+        """Muestra un recordatorio que llegó a su momento de aviso."""
+        self.bell()
+        messagebox.showinfo("Recordatorio", describe(reminder), parent=self)
 
     def _setup_treeview_style(self):
         """Aplica un estilo al ttk.Treeview y DateEntry para que coincida con el tema."""
@@ -115,12 +136,14 @@ class App(ctk.CTk):
         self.tab_view.add("Tareas")
         self.tab_view.add("Eventos")
         self.tab_view.add("Lecciones")
+        self.tab_view.add("Rendimiento")
         
         # Crear todas las pestañas
         self.create_your_day_tab(self.tab_view.tab("Planificador"))
         self.create_task_tab(self.tab_view.tab("Tareas"))
         self.create_event_tab(self.tab_view.tab("Eventos"))
         self.create_lesson_tab(self.tab_view.tab("Lecciones"))
+        self.create_performance_tab(self.tab_view.tab("Rendimiento"))
         
         # Establecer "Tu Día" como pestaña por defecto
         self.tab_view.set("Planificador")
@@ -173,6 +196,20 @@ class App(ctk.CTk):
             width=100
         )
         refresh_button.pack(side="left", padx=10)
+
+        # Ordenar el plan para que la menor cantidad de tareas quede fuera de plazo
+        self.minimize_late_var = ctk.BooleanVar(
+            value=self.dm.user_preferences.scheduling.get('minimize_late', False))
+        ctk.CTkSwitch(
+            button_frame,
+            text="Minimizar atrasos",
+            variable=self.minimize_late_var,
+            command=self.toggle_minimize_late
+        ).pack(side="left", padx=10)
+
+        # Resumen de plazos (se actualiza al poblar la tabla)
+        self.feasibility_label = ctk.CTkLabel(button_frame, text="")
+        self.feasibility_label.pack(side="left", padx=10)
         
         # Poblar el contenido inicial
         self.populate_your_day_tree()
@@ -185,13 +222,16 @@ class App(ctk.CTk):
                     self.your_day_tree.selection_remove(iid)
         self.your_day_tree.bind("<<TreeviewSelect>>", on_select)
         
+    @span("App.populate_your_day_tree")
     def populate_your_day_tree(self):
         """Pobla la tabla de 'Tu Día' con todos los elementos organizados."""
         # Limpiar la tabla
         for item in self.your_day_tree.get_children():
             self.your_day_tree.delete(item)
         
-        # Obtener plan exclusivo para HOY
+        # Esta vista informa lo que no tiene horario y los plazos, que requieren el plan
+        # completo: se calcula primero y el plan de HOY se filtra de él
+        unschedulable = self.dm.get_unschedulable()
         today_items = self.dm.get_today_plan()
         
         # Diccionario para títulos más atractivos y colores
@@ -202,13 +242,17 @@ class App(ctk.CTk):
             "Más adelante": {"icon": "⏰", "color": "#888888"}
         }
         
-        # Título general del día
+        # Título general del día (con la fracción ocupada de la jornada)
+        today = self.dm.clock.today()
+        occupancy = self.dm.get_today_utilization()
+        summary = f"({len(today_items)} elementos"
+        summary += f", {occupancy:.0%} ocupado)" if occupancy is not None else ")"
         header = self.your_day_tree.insert("", "end", values=(
-            "🗓️", "  Tu día planificado", f"({len(today_items)} elementos)", "", ""
+            "🗓️", "  Tu día planificado", summary, "", ""
         ), tags=("section_header",))
         self.your_day_tree.set(header, "tipo", "🗓️")
         self.your_day_tree.set(header, "titulo", "  TU DÍA PLANIFICADO")
-        self.your_day_tree.set(header, "detalles", f"({len(today_items)} elementos)")
+        self.your_day_tree.set(header, "detalles", summary)
 
         for item in today_items:
                     # Preparar detalles según el tipo
@@ -222,7 +266,12 @@ class App(ctk.CTk):
                     
                     # Preparar horario
                     horario = ""
-                    if item.start_time and item.end_time:
+                    chunks = item.chunks
+                    if chunks:
+                        # Item dividido: las partes de hoy
+                        horario = ", ".join(f"{s.strftime('%H:%M')}-{e.strftime('%H:%M')}"
+                                            for d, s, e in chunks if d == today)
+                    elif item.start_time and item.end_time:
                         horario = f"{item.start_time.strftime('%H:%M')}-{item.end_time.strftime('%H:%M')}"
                     
                     # Insertar fila en la tabla
@@ -234,6 +283,72 @@ class App(ctk.CTk):
                         item.get_priority_text()
                     ), tags=("section_item",))
 
+        # Lo que el planificador no pudo colocar (más largo que la jornada, fuera del horizonte...)
+        if unschedulable:
+            self.your_day_tree.insert("", "end", values=(
+                "⚠️", "  SIN HORARIO", f"({len(unschedulable)} elementos)", "", ""
+            ), tags=("section_header",))
+            for item, reason in unschedulable:
+                self.your_day_tree.insert("", "end", values=(
+                    f"  {item.get_type()}",
+                    f"    {item.title}",
+                    reason,
+                    "",
+                    item.get_priority_text()
+                ), tags=("section_item",))
+
+        # Plazos que no se cumplen con la capacidad libre de los próximos días
+        feasibility = self.dm.get_feasibility()
+        if feasibility['late']:
+            self.your_day_tree.insert("", "end", values=(
+                "⏳", "  FUERA DE PLAZO", f"({len(feasibility['late'])} elementos)", "", ""
+            ), tags=("section_header",))
+            for entry in feasibility['late']:
+                item = entry['item']
+                if entry['finish_date'] is not None:
+                    details = f"Vence {entry['due_date']}, termina {entry['finish_date']} (+{entry['days_late']} días)"
+                else:
+                    details = f"Vence {entry['due_date']}, faltan {entry['minutes_short']} min"
+                self.your_day_tree.insert("", "end", values=(
+                    f"  {item.get_type()}",
+                    f"    {item.title}",
+                    details,
+                    "",
+                    item.get_priority_text()
+                ), tags=("section_item",))
+
+        # Eventos que se solapan entre sí (horario importado, clases a la misma hora...)
+        conflicts = self.dm.get_conflicts(date_from=today, date_to=today + timedelta(days=14))
+        if conflicts:
+            self.your_day_tree.insert("", "end", values=(
+                "⛔", "  CHOQUES DE HORARIO", f"({len(conflicts)} en los próximos 14 días)", "", ""
+            ), tags=("section_header",))
+            for conflict in conflicts:
+                horario = f"{conflict['start'].strftime('%H:%M')}-{conflict['end'].strftime('%H:%M')}"
+                for event in conflict['items']:
+                    self.your_day_tree.insert("", "end", values=(
+                        f"  {event.get_type()}",
+                        f"    {event.title}",
+                        f"{conflict['date']} a las {event.time} ({event.duration} min)",
+                        horario,
+                        event.get_priority_text()
+                    ), tags=("section_item",))
+        if hasattr(self, 'feasibility_label'):
+            if feasibility['feasible']:
+                self.feasibility_label.configure(text="✅ Todo llega a tiempo")
+            else:
+                self.feasibility_label.configure(
+                    text=f"⚠️ {len(feasibility['late'])} fuera de plazo (máx. {feasibility['max_days_late']} días)")
+
+        # El plan pudo cambiar: rearmar los recordatorios de hoy
+        self.reminders.refresh()
+
+    def toggle_minimize_late(self):
+        """Activa o desactiva el orden que minimiza la cantidad de atrasos."""
+        self.dm.user_preferences.scheduling['minimize_late'] = self.minimize_late_var.get()
+        self.dm.savePreferences()
+        self.refresh_your_day_tab()
+
     def create_task_tab(self, tab):
         # --- (Sin cambios en esta sección) ---
         tree_frame = ctk.CTkFrame(tab)
@@ -266,6 +381,16 @@ class App(ctk.CTk):
         # Botón para eliminar tarea
         delete_button = ctk.CTkButton(button_frame, text="Eliminar Tarea", command=self.delete_task, fg_color="#D32F2F", hover_color="#B71C1C")
         delete_button.pack(side="left", padx=10)
+
+        # Filtro por estado (resuelto con los índices del DataManager)
+        self.task_status_filter = ctk.CTkOptionMenu(
+            button_frame,
+            values=["Todos"] + [status.value for status in Status],
+            command=lambda _: self.populate_tasks_tree(),
+            width=140
+        )
+        self.task_status_filter.pack(side="right", padx=10)
+        ctk.CTkLabel(button_frame, text="Estado:").pack(side="right")
         
         self.populate_tasks_tree()
 
@@ -282,9 +407,7 @@ class App(ctk.CTk):
         
         if result:
             start_time, end_time, duration = result
-            item.set_duration(duration)
-            item.set_time_range(start_time, end_time)
-            self.dm.saveData()  # Guardar cambios
+            self.dm.set_item_time_range(item, start_time, end_time, duration)  # Guardar cambios
             self.refresh_your_day_tab()  # Actualizar la vista
 
     def show_import_dialog(self):
@@ -329,13 +452,17 @@ class App(ctk.CTk):
         # Actualizar todas las vistas para aplicar los nuevos estilos
         self.refresh_all_views()
 
+    @span("App.populate_tasks_tree")
     def populate_tasks_tree(self):
         """Actualiza la vista de tareas con priorización."""
         for item in self.tasks_tree.get_children():
             self.tasks_tree.delete(item)
-        for task in self.dm.get_all_tasks():
+        selected_status = self.task_status_filter.get()
+        status = None if selected_status == "Todos" else Status(selected_status)
+        for task in self.dm.query(item_type="Tarea", status=status):
             priority_text = task.get_priority_text()
-            self.tasks_tree.insert("", "end", values=(
+            # El iid de cada fila es el id del item (las vistas pueden estar filtradas)
+            self.tasks_tree.insert("", "end", iid=str(task.item_id), values=(
                 task.title,
                 task.status.value,
                 task.due_date,
@@ -357,8 +484,7 @@ class App(ctk.CTk):
         if not selected_item:
             messagebox.showwarning("Selección inválida", "Seleccione una tarea para completar.")
             return
-        item_index = self.tasks_tree.index(selected_item)
-        if self.dm.mark_task_completed(item_index):
+        if self.dm.mark_task_completed(int(selected_item)):
             self.populate_tasks_tree()
             self.refresh_your_day_tab()
 
@@ -369,8 +495,7 @@ class App(ctk.CTk):
             messagebox.showwarning("Selección inválida", "Por favor, seleccione una tarea para eliminar.")
             return
         if messagebox.askyesno("Confirmar", "¿Está seguro que desea eliminar la tarea seleccionada?"):
-            item_index = self.tasks_tree.index(selected_item)
-            if self.dm.deleteTask(item_index):
+            if self.dm.deleteTask(int(selected_item)):
                 self.populate_tasks_tree()
                 self.refresh_your_day_tab()
             else:
@@ -395,12 +520,13 @@ class App(ctk.CTk):
         delete_button.pack(side="left", padx=10)
         self.populate_events_tree()
 
+    @span("App.populate_events_tree")
     def populate_events_tree(self):
         # --- (Sin cambios en esta sección) ---
         for item in self.events_tree.get_children():
             self.events_tree.delete(item)
         for event in self.dm.get_all_events():
-            self.events_tree.insert("", "end", values=(event.title, event.description, event.due_date, event.time))
+            self.events_tree.insert("", "end", iid=str(event.item_id), values=(event.title, event.description, event.due_date, event.time))
 
     def add_event(self):
         # --- (Sin cambios en esta sección) ---
@@ -417,8 +543,7 @@ class App(ctk.CTk):
             messagebox.showwarning("Selección inválida", "Por favor, seleccione un evento para eliminar.")
             return
         if messagebox.askyesno("Confirmar", "¿Está seguro que desea eliminar el evento seleccionado?"):
-            item_index = self.events_tree.index(selected_item)
-            if self.dm.deleteEvent(item_index):
+            if self.dm.deleteEvent(int(selected_item)):
                 self.populate_events_tree()
 
     def create_lesson_tab(self, tab):
@@ -463,22 +588,42 @@ class App(ctk.CTk):
         
         delete_button = ctk.CTkButton(button_frame, text="Eliminar Lección", command=self.delete_lesson, fg_color="#D32F2F", hover_color="#B71C1C")
         delete_button.pack(side="left", padx=10)
+
+        # Filtro por asignatura (resuelto con los índices del DataManager)
+        self.lesson_subject_filter = ctk.CTkOptionMenu(
+            button_frame,
+            values=["Todas"],
+            command=lambda _: self.populate_lessons_tree(),
+            width=160
+        )
+        self.lesson_subject_filter.pack(side="right", padx=10)
+        ctk.CTkLabel(button_frame, text="Asignatura:").pack(side="right")
         
         self.populate_lessons_tree()
 
+    @span("App.populate_lessons_tree")
     def populate_lessons_tree(self):
         """Limpia y rellena la tabla de lecciones con datos actualizados."""
         # Limpiar la tabla antes de rellenarla
         for item in self.lessons_tree.get_children():
             self.lessons_tree.delete(item)
+
+        # Actualizar las asignaturas disponibles en el filtro
+        subjects = self.dm.get_subjects()
+        selected_subject = self.lesson_subject_filter.get()
+        if selected_subject not in subjects:
+            selected_subject = "Todas"
+            self.lesson_subject_filter.set(selected_subject)
+        self.lesson_subject_filter.configure(values=["Todas"] + subjects)
+        subject = None if selected_subject == "Todas" else selected_subject
             
         # --- 2. MUESTRA LOS NUEVOS DATOS: REPETICIONES Y EFACTOR ---
-        for lesson in self.dm.get_all_lessons():
+        for lesson in self.dm.query(item_type="Lección", subject=subject):
             # Formateamos el efactor para mostrar solo 2 decimales
             formatted_efactor = f"{lesson.efactor:.2f}"
             
             # Insertamos la fila con todos los datos
-            self.lessons_tree.insert("", "end", values=(
+            self.lessons_tree.insert("", "end", iid=str(lesson.item_id), values=(
                 lesson.title, 
                 lesson.subject, 
                 lesson.due_date, 
@@ -504,8 +649,7 @@ class App(ctk.CTk):
             return
             
         if messagebox.askyesno("Confirmar", "¿Está seguro que desea eliminar la lección seleccionada?"):
-            item_index = self.lessons_tree.index(selected_item)
-            if self.dm.deleteLesson(item_index):
+            if self.dm.deleteLesson(int(selected_item)):
                 self.populate_lessons_tree()
 
     def review_lesson(self):
@@ -521,10 +665,8 @@ class App(ctk.CTk):
 
         # Si el usuario proporcionó una calificación
         if score is not None: # Se comprueba con 'is not None' por si el score fuera 0
-            item_index = self.lessons_tree.index(selected_item)
-            
             # Llama al DataManager para que aplique el algoritmo SM-2
-            if self.dm.reviewLesson(score, item_index):
+            if self.dm.reviewLesson(score, int(selected_item)):
                 self.populate_lessons_tree() # Refresca la tabla con los nuevos datos
                 messagebox.showinfo("¡Éxito!", "Se ha programado el próximo repaso.")
             else:
@@ -535,7 +677,79 @@ class App(ctk.CTk):
         if not selected_item:
             messagebox.showwarning("Selección inválida", "Seleccione una lección para completar.")
             return
-        item_index = self.lessons_tree.index(selected_item)
-        if self.dm.mark_lesson_completed(item_index):
+        if self.dm.mark_lesson_completed(int(selected_item)):
             self.populate_lessons_tree()
-            self.refresh_your_day_tab()
\ No newline at end of file
+            self.refresh_your_day_tab()
+
+    # --- Rendimiento ---
+    def create_performance_tab(self, tab):
+        """Crea la pestaña de diagnóstico con las estadísticas de los spans."""
+        tree_frame = ctk.CTkFrame(tab)
+        tree_frame.pack(fill="both", expand=True, padx=5, pady=5)
+        tree_columns = ("span", "llamadas", "total", "media", "p99", "maximo")
+        self.performance_tree = ttk.Treeview(tree_frame, columns=tree_columns, show="headings")
+        self.performance_tree.heading("span", text="Span")
+        self.performance_tree.heading("llamadas", text="Llamadas")
+        self.performance_tree.heading("total", text="Total (ms)")
+        self.performance_tree.heading("media", text="Media (ms)")
+        self.performance_tree.heading("p99", text="p99 (ms)")
+        self.performance_tree.heading("maximo", text="Máx (ms)")
+        self.performance_tree.column("span", width=320)
+        for column in tree_columns[1:]:
+            self.performance_tree.column(column, anchor=tk.CENTER, width=110)
+        self.performance_tree.pack(fill="both", expand=True)
+
+        button_frame = ctk.CTkFrame(tab, fg_color="transparent")
+        button_frame.pack(pady=10, fill="x")
+
+        self.instrumentation_switch = ctk.CTkSwitch(
+            button_frame, text="Medir tiempos", command=self.toggle_instrumentation)
+        if Instrumentation.is_enabled():
+            self.instrumentation_switch.select()
+        self.instrumentation_switch.pack(side="left", padx=10)
+
+        self.profiler_switch = ctk.CTkSwitch(
+            button_frame, text="Perfilador (cProfile)", command=self.toggle_profiler)
+        if Instrumentation.profiler_active():
+            self.profiler_switch.select()
+        self.profiler_switch.pack(side="left", padx=10)
+
+        refresh_button = ctk.CTkButton(button_frame, text="Actualizar", command=self.populate_performance_tree, width=100)
+        refresh_button.pack(side="left", padx=10)
+        reset_button = ctk.CTkButton(button_frame, text="Reiniciar", command=self.reset_performance_stats,
+                                     fg_color="#757575", hover_color="#616161", width=100)
+        reset_button.pack(side="left", padx=10)
+
+        self.populate_performance_tree()
+
+    def populate_performance_tree(self):
+        """Muestra las estadísticas acumuladas de cada span."""
+        for item in self.performance_tree.get_children():
+            self.performance_tree.delete(item)
+        for stats in Instrumentation.stats():
+            self.performance_tree.insert("", "end", values=(
+                stats["name"],
+                stats["count"],
+                f"{stats['total_ms']:.2f}",
+                f"{stats['mean_ms']:.3f}",
+                f"{stats['p99_ms']:.3f}",
+                f"{stats['max_ms']:.3f}"
+            ))
+
+    def toggle_instrumentation(self):
+        if self.instrumentation_switch.get():
+            Instrumentation.enable()
+        else:
+            Instrumentation.disable()
+
+    def toggle_profiler(self):
+        if self.profiler_switch.get():
+            Instrumentation.start_profiler()
+        else:
+            output_path = "planificador.prof"
+            Instrumentation.stop_profiler(output_path)
+            messagebox.showinfo("Perfilador", f"Perfil guardado en {output_path}")
+
+    def reset_performance_stats(self):
+        Instrumentation.reset()
+        self.populate_performance_tree()